@@ -2,15 +2,18 @@
 Complete api.py with auth endpoints included directly
 """
 
-from fastapi import FastAPI, HTTPException, Depends, WebSocket
+from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
+from bson import ObjectId
+import asyncio
 import logging
+import math
 import uuid
 import os
 
 # Database
-from src.database import Database, connect_to_mongo, close_mongo_connection
+from src.database import Database, connect_to_mongo, close_mongo_connection, pool_metrics
 
 # Auth functions
 from src.auth import (
@@ -19,19 +22,60 @@ from src.auth import (
     verify_google_token,
     get_or_create_google_user,
     authenticate_user,
-    get_user_by_email,
-    get_password_hash,
+    user_exists,
+    auth_cache_stats,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
 # Models
-from src.models import User
+from src.models import (
+    CurrentUser,
+    SearchRequest,
+    SearchResult,
+    SearchHistory,
+    MeResponse,
+    GameStatsResponse,
+    ScoreSubmissionResponse,
+    LeaderboardResponse,
+    RankResponse
+)
+
+# Flight search
+from src.flight_cache import flight_cache
+from src.flight_scraper import AsyncFlightScraper
+from src.data_processor import process_flights
+from src.utils import validate_date_format
+from src.search_jobs import search_jobs, JobQueueFull
+from src import price_history
+from src.http_client import close_http_clients
+from src.rate_limiter import aviationstack_limiter, aviationstack_quota
+
+# Game stats
+from src.game_stats import GAME_TYPES, MAX_GAME_SCORE, PUBLIC_STATS_FIELDS, apply_score, public_game_stats, stats_projection
+from src.google_tokens import google_keys
+from src.password_hasher import password_hasher, PasswordHasherBusy
+from src.score_buffer import score_buffer, SCORE_WRITE_BEHIND
+from src.leaderboard import leaderboards
+from src.json_codec import send_json
+from src.indexes import apply_index_manifest, verify_query_plans, MONGO_VERIFY_QUERY_PLANS
 
 # Game imports
 from games.gesture_websocket import handle_gesture_game_websocket
+from games.tick_scheduler import gesture_ticker
+from games.obstacle_field import obstacle_field, GAME_ENGINE
+from games.instrumentation import game_metrics, GAME_TRACE_ADMINS, TooManyTraces
+from games.gesture_game import active_gesture_games
+from games.voice_game import active_games
 
 logger = logging.getLogger(__name__)
 
+SEARCH_HISTORY_TTL_DAYS = int(os.getenv("SEARCH_HISTORY_TTL_DAYS", "30"))
+MAX_SEARCH_DAYS = int(os.getenv("MAX_SEARCH_DAYS", "60"))
+
+# /games/stats reads only the public fields (+ total_score, which the
+# write-behind overlay needs to recompute the average)
+STATS_PROJECTION = stats_projection(PUBLIC_STATS_FIELDS + ("total_score",))
+
 
 # ===== CREATE APP =====
 app = FastAPI(
@@ -57,14 +101,43 @@ async def startup_event():
     """Connect to MongoDB on startup"""
     try:
         await connect_to_mongo()
+        await apply_index_manifest()
+        await aviationstack_quota.refresh()
+        await leaderboards.load()
         logger.info("✅ Startup complete - MongoDB connected")
     except Exception as e:
         logger.warning(f"⚠️ MongoDB startup skipped: {e}")
+        return
+    
+    if MONGO_VERIFY_QUERY_PLANS:
+        # Deliberately outside the try: a COLLSCAN on a hot path aborts startup
+        await verify_query_plans()
+
+
+@app.on_event("startup")
+async def start_search_workers():
+    """Spawn the background search job workers, score flusher and key refresher"""
+    search_jobs.start()
+    google_keys.start()
+    if SCORE_WRITE_BEHIND:
+        score_buffer.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close MongoDB connection on shutdown"""
+    """Close MongoDB connection and HTTP pools on shutdown"""
+    await search_jobs.shutdown()
+    await gesture_ticker.stop()
+    if SCORE_WRITE_BEHIND:
+        # Buffered scores must reach MongoDB before the client closes
+        await score_buffer.stop()
+    await google_keys.stop()
+    await close_http_clients()
+    password_hasher.shutdown()
+    try:
+        await aviationstack_quota.flush()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not persist quota ledger: {e}")
     await close_mongo_connection()
     logger.info("👋 SkyRacer API shutdown")
 
@@ -72,8 +145,12 @@ async def shutdown_event():
 # ===== HELPER TO GET DB =====
 def get_db():
     """Get database instance"""
-    database_name = os.getenv("DATABASE_NAME", "skyracer")
-    return Database.client[database_name]
+    return Database.get_database()
+
+
+def get_collection(name: str):
+    """Cached collection handle"""
+    return Database.get_collection(name)
 
 
 # ===== ROOT ENDPOINT =====
@@ -87,8 +164,38 @@ async def root():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process cache and service counters"""
+    return {
+        "flight_cache": flight_cache.stats(),
+        "aviationstack_rate_limit": aviationstack_limiter.stats(),
+        "aviationstack_quota": aviationstack_quota.stats(),
+        "search_jobs": search_jobs.stats(),
+        "score_buffer": score_buffer.stats() if SCORE_WRITE_BEHIND else {"enabled": False},
+        "leaderboards": leaderboards.stats(),
+        "auth_cache": auth_cache_stats(),
+        "password_hasher": password_hasher.stats(),
+        "google_jwks": google_keys.stats(),
+        "mongo_pool": pool_metrics.stats(),
+        "gesture_ticker": gesture_ticker.stats(),
+        "games": game_metrics.stats(),
+        "obstacle_field": obstacle_field.stats() if GAME_ENGINE == "vector" else {"enabled": False}
+    }
+
+
 # ===== AUTH ENDPOINTS =====
 
+def password_hasher_busy() -> HTTPException:
+    """503 for logins refused because the bcrypt executor is saturated"""
+    logger.warning(f"⚠️ Password hasher saturated: {password_hasher.pending} jobs pending")
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins in progress, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @app.post("/auth/register")
 async def register(user_data: dict):
     """Register new user"""
@@ -98,16 +205,16 @@ async def register(user_data: dict):
         full_name = user_data.get("full_name", "")
         
         # Check if user exists
-        existing_user = await get_user_by_email(email)
-        if existing_user:
+        if await user_exists(email):
             raise HTTPException(status_code=400, detail="Email already registered")
         
         # Create user
         users_collection = Database.get_collection("users")
+        hashed_password = await password_hasher.hash(password)
         new_user = {
             "email": email,
             "full_name": full_name,
-            "hashed_password": get_password_hash(password),
+            "hashed_password": hashed_password,
             "google_id": None,
             "profile_picture": None,
             "is_active": True,
@@ -132,6 +239,8 @@ async def register(user_data: dict):
         }
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
     except Exception as e:
         logger.error(f"Registration error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -167,6 +276,8 @@ async def login(credentials: dict):
         }
     except HTTPException:
         raise
+    except PasswordHasherBusy:
+        raise password_hasher_busy()
     except Exception as e:
         logger.error(f"Login error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -209,8 +320,8 @@ async def google_login(token_data: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/auth/me")
-async def get_me(current_user: User = Depends(get_current_user)):
+@app.get("/auth/me", response_model=MeResponse)
+async def get_me(current_user: CurrentUser = Depends(get_current_user)):
     """Get current user info"""
     return {
         "email": current_user.email,
@@ -223,10 +334,10 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 # ===== GAME ENDPOINTS =====
 
-@app.post("/games/score")
+@app.post("/games/score", response_model=ScoreSubmissionResponse)
 async def submit_game_score(
     score_data: dict,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Submit game score"""
     try:
@@ -234,139 +345,388 @@ async def submit_game_score(
         score = score_data.get("score", 0)
         email = current_user.email  # FIX: Use .email not ["email"]
         
-        logger.info(f"📊 Score submission: {email} - {game_type}: {score}")
+        if game_type not in GAME_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unknown game type: {game_type}")
+        # bool is an int subclass, and NaN passes both range checks below
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not math.isfinite(score) or score < 0:
+            raise HTTPException(status_code=400, detail="Score must be a non-negative number")
+        if score > MAX_GAME_SCORE:
+            raise HTTPException(status_code=400, detail=f"Score must be at most {MAX_GAME_SCORE}")
         
-        db = get_db()
-        existing_stats = await db.game_stats.find_one({"email": email})
+        logger.info(f"📊 Score submission: {email} - {game_type}: {score}")
         
-        if not existing_stats:
-            existing_stats = {
-                "email": email,
-                "voice": {
-                    "high_score": 0,
-                    "total_games": 0,
-                    "total_score": 0,
-                    "average_score": 0,
-                    "last_played": None
-                },
-                "gesture": {
-                    "high_score": 0,
-                    "total_games": 0,
-                    "total_score": 0,
-                    "average_score": 0,
-                    "last_played": None
-                },
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+        if SCORE_WRITE_BEHIND:
+            # Answered from the in-memory view; the write is batched
+            result = await score_buffer.submit(email, game_type, score)
+        else:
+            # One atomic round trip: counters, max and average are computed
+            # server-side, so concurrent submissions can't lose games
+            updated_game_stats = await apply_score(get_collection("game_stats"), email, game_type, score)
+            result = {
+                "is_high_score": score > updated_game_stats.get("previous_high_score", 0),
+                "previous_high_score": (updated_game_stats.get("previous_high_score", 0)
+                                        if updated_game_stats["total_games"] > 1 else None),
+                "high_score": updated_game_stats["high_score"],
+                "total_games": updated_game_stats["total_games"],
+                "average_score": updated_game_stats["average_score"]
             }
         
-        game_stats = existing_stats.get(game_type, {
-            "high_score": 0,
-            "total_games": 0,
-            "total_score": 0,
-            "average_score": 0,
-            "last_played": None
-        })
-        
-        is_high_score = score > game_stats.get("high_score", 0)
-        new_total_games = game_stats.get("total_games", 0) + 1
-        new_total_score = game_stats.get("total_score", 0) + score
-        new_average = round(new_total_score / new_total_games, 2)
-        
-        updated_game_stats = {
-            "high_score": max(score, game_stats.get("high_score", 0)),
-            "total_games": new_total_games,
-            "total_score": new_total_score,
-            "average_score": new_average,
-            "last_played": datetime.utcnow()
-        }
+        previous_high_score = result.pop("previous_high_score")
+        leaderboards.record(game_type, email, previous_high_score, result["high_score"])
         
-        existing_stats[game_type] = updated_game_stats
-        existing_stats["updated_at"] = datetime.utcnow()
+        if result["is_high_score"]:
+            logger.info(f"🏆 NEW HIGH SCORE! {email}: {score} ({game_type})")
         
-        logger.info(f"💾 Updating stats in database for {email}")
-        logger.info(f"   New high score: {updated_game_stats['high_score']}")
-        logger.info(f"   Total games: {updated_game_stats['total_games']}")
+        return {"success": True, **result}
         
-        result = await db.game_stats.update_one(
-            {"email": email},
-            {"$set": existing_stats},
-            upsert=True
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting score: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/games/stats", response_model=GameStatsResponse)
+async def get_game_stats(current_user: CurrentUser = Depends(get_current_user)):
+    """Get user's game statistics"""
+    try:
+        email = current_user.email
         
-        logger.info(f"✅ Database update result: matched={result.matched_count}, modified={result.modified_count}")
+        stats = await get_collection("game_stats").find_one({"email": email}, STATS_PROJECTION) or {}
         
-        if is_high_score:
-            logger.info(f"🏆 NEW HIGH SCORE! {email}: {score} ({game_type})")
+        game_stats = {}
+        for game_type in GAME_TYPES:
+            stats_for_type = stats.get(game_type)
+            if SCORE_WRITE_BEHIND:
+                # Include games still waiting in the write-behind buffer
+                stats_for_type = score_buffer.overlay(email, game_type, stats_for_type or {})
+            game_stats[game_type] = public_game_stats(stats_for_type)
         
-        return {
-            "success": True,
-            "is_high_score": is_high_score,
-            "high_score": updated_game_stats["high_score"],
-            "total_games": updated_game_stats["total_games"],
-            "average_score": updated_game_stats["average_score"]
+        return {"stats": game_stats}
+        
+    except Exception as e:
+        logger.error(f"Error fetching stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/leaderboard/{game_type}", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    game_type: str,
+    limit: int = 10,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Top players for a game type"""
+    if game_type not in GAME_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown game type: {game_type}")
+    limit = max(1, min(limit, 100))
+    
+    try:
+        leaders = await leaderboards.top(game_type, limit)
+        players = await leaderboards.players(game_type)
+        
+        profiles = {
+            doc["email"]: doc
+            async for doc in get_collection("users").find(
+                {"email": {"$in": [email for email, _ in leaders]}},
+                {"_id": 0, "email": 1, "full_name": 1, "profile_picture": 1}
+            )
         }
         
+        entries = []
+        for position, (email, high_score) in enumerate(leaders, start=1):
+            # Ties share the rank of the first player on that score
+            rank = entries[-1]["rank"] if entries and entries[-1]["high_score"] == high_score else position
+            profile = profiles.get(email, {})
+            entries.append({
+                "rank": rank,
+                "name": profile.get("full_name") or "Player",
+                "profile_picture": profile.get("profile_picture"),
+                "high_score": high_score,
+                "is_you": email == current_user.email
+            })
+        
+        return {"game_type": game_type, "players": players, "leaders": entries}
+        
     except Exception as e:
-        logger.error(f"Error submitting score: {e}")
+        logger.error(f"Error fetching leaderboard: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/games/stats")
-async def get_game_stats(current_user: User = Depends(get_current_user)):
-    """Get user's game statistics"""
+@app.get("/leaderboard/{game_type}/me", response_model=RankResponse)
+async def get_my_rank(game_type: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Current user's rank for a game type"""
+    if game_type not in GAME_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown game type: {game_type}")
+    
     try:
         email = current_user.email
-        db = get_db()
-        
-        stats = await db.game_stats.find_one({"email": email})
-        
-        if not stats:
-            return {
-                "stats": {
-                    "voice": {
-                        "high_score": 0,
-                        "total_games": 0,
-                        "average_score": 0,
-                        "last_played": None
-                    },
-                    "gesture": {
-                        "high_score": 0,
-                        "total_games": 0,
-                        "average_score": 0,
-                        "last_played": None
-                    }
-                }
-            }
+        doc = await get_collection("game_stats").find_one(
+            {"email": email},
+            {"_id": 0, f"{game_type}.high_score": 1, f"{game_type}.total_games": 1}
+        )
+        stats = (doc or {}).get(game_type) or {}
+        if SCORE_WRITE_BEHIND:
+            stats = score_buffer.overlay(email, game_type, stats)
         
-        stats.pop("_id", None)
+        if not stats.get("total_games"):
+            return {"game_type": game_type, "rank": None, "players": None, "high_score": 0}
         
+        high_score = stats.get("high_score", 0)
+        rank, players = await leaderboards.rank_of(game_type, high_score)
         return {
-            "stats": {
-                "voice": stats.get("voice", {
-                    "high_score": 0,
-                    "total_games": 0,
-                    "average_score": 0,
-                    "last_played": None
-                }),
-                "gesture": stats.get("gesture", {
-                    "high_score": 0,
-                    "total_games": 0,
-                    "average_score": 0,
-                    "last_played": None
-                })
-            }
+            "game_type": game_type,
+            "rank": rank,
+            "players": players,
+            "high_score": high_score,
+            "top_percent": round(rank / players * 100, 2) if players else None
         }
         
     except Exception as e:
-        logger.error(f"Error fetching stats: {e}")
+        logger.error(f"Error fetching rank: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ===== FLIGHT SEARCH =====
+
+def serialize_search(doc: dict) -> dict:
+    """Mongo search_results document -> JSON-friendly dict with string id"""
+    doc = dict(doc)
+    doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+def parse_search_id(search_id: str) -> ObjectId:
+    if not ObjectId.is_valid(search_id):
+        raise HTTPException(status_code=404, detail="Search not found")
+    return ObjectId(search_id)
+
+
+def validate_search_range(search: SearchRequest) -> int:
+    """Check the requested dates and return the number of days in the range"""
+    if not (validate_date_format(search.start_date) and validate_date_format(search.end_date)):
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    
+    days = (datetime.strptime(search.end_date, "%Y-%m-%d")
+            - datetime.strptime(search.start_date, "%Y-%m-%d")).days + 1
+    if days < 1:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if days > MAX_SEARCH_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_SEARCH_DAYS} days")
+    return days
+
+
+@app.post("/search")
+async def search_flights(
+    search: SearchRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Search a date range, analyze prices and store the result"""
+    validate_search_range(search)
+    
+    try:
+        origin = search.origin.upper()
+        destination = search.destination.upper()
+        
+        scraper = AsyncFlightScraper(record_prices=True)
+        flights = await scraper.find_best_deals(origin, destination, search.start_date, search.end_date)
+        # Stats over a long range is CPU work: keep it off the event loop
+        analysis = await asyncio.to_thread(process_flights, flights)
+        
+        result = SearchResult(
+            user_id=current_user.email,
+            origin=origin,
+            destination=destination,
+            start_date=search.start_date,
+            end_date=search.end_date,
+            flights=[flight.to_flight_data() for flight in flights],
+            analysis=analysis
+        )
+        
+        doc = result.model_dump(by_alias=True, exclude_none=True)
+        inserted = await get_collection("search_results").insert_one(doc)
+        
+        history = SearchHistory(
+            search_id=str(inserted.inserted_id),
+            user_id=current_user.email,
+            origin=origin,
+            destination=destination,
+            start_date=search.start_date,
+            end_date=search.end_date,
+            total_flights=analysis["total_flights"],
+            min_price=analysis["min_price"],
+            expires_at=datetime.utcnow() + timedelta(days=SEARCH_HISTORY_TTL_DAYS)
+        )
+        await get_collection("search_history").insert_one(history.model_dump(by_alias=True, exclude_none=True))
+        
+        return serialize_search(doc)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Search error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/search/jobs")
+async def submit_search_job(
+    search: SearchRequest,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Queue a long date-range search and return its job id immediately"""
+    days = validate_search_range(search)
+    
+    try:
+        job, deduplicated = search_jobs.submit(
+            current_user.email, search.origin, search.destination, search.start_date, search.end_date, days
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Search queue is full: {e}")
+    
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "deduplicated": deduplicated,
+        "websocket_url": f"/ws/search/{job.id}"
+    }
+
+
+@app.get("/search/jobs/{job_id}")
+async def get_search_job(job_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Progress and (once finished) analysis of a search job"""
+    job = search_jobs.get(job_id, current_user.email)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.summary()
+
+
+@app.delete("/search/jobs/{job_id}")
+async def cancel_search_job(job_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Unsubscribe from a search job; it is cancelled when its last subscriber leaves"""
+    job = search_jobs.get(job_id, current_user.email)
+    if job is None or not search_jobs.unsubscribe(job_id, current_user.email):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "status": job.status}
+
+
+@app.websocket("/ws/search/{job_id}")
+async def search_job_websocket(websocket: WebSocket, job_id: str, token: str = ""):
+    """Stream a job's per-day results as they arrive (?token=<access token>)"""
+    await websocket.accept()
+    try:
+        current_user = await get_current_user(token)
+    except HTTPException:
+        await send_json(websocket, {"type": "error", "detail": "Could not validate credentials"})
+        await websocket.close(code=4401)
+        return
+    
+    job = search_jobs.get(job_id, current_user.email)
+    if job is None:
+        await send_json(websocket, {"type": "error", "detail": "Job not found"})
+        await websocket.close(code=4404)
+        return
+    
+    try:
+        async for event in job.stream():
+            await send_json(websocket, event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Search stream disconnected: {job_id}")
+
+
+@app.get("/search/history")
+async def get_search_history(current_user: CurrentUser = Depends(get_current_user)):
+    """Recent searches (expired entries are removed by the TTL index)"""
+    cursor = get_collection("search_history").find({"user_id": current_user.email}).sort("created_at", -1).limit(50)
+    history = []
+    async for doc in cursor:
+        history.append(serialize_search(doc))
+    return {"history": history}
+
+
+@app.get("/search/{search_id}")
+async def get_search(search_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Fetch one stored search result"""
+    doc = await get_collection("search_results").find_one({"_id": parse_search_id(search_id), "user_id": current_user.email})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return serialize_search(doc)
+
+
+@app.get("/saved")
+async def get_saved_searches(current_user: CurrentUser = Depends(get_current_user)):
+    """List the user's saved searches"""
+    cursor = get_collection("search_results").find(
+        {"user_id": current_user.email, "is_saved": True}
+    ).sort("created_at", -1)
+    saved = []
+    async for doc in cursor:
+        saved.append(serialize_search(doc))
+    return {"saved": saved}
+
+
+@app.post("/saved/{search_id}")
+async def save_search(search_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Mark a search result as saved"""
+    result = await get_collection("search_results").update_one(
+        {"_id": parse_search_id(search_id), "user_id": current_user.email},
+        {"$set": {"is_saved": True}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return {"success": True, "id": search_id}
+
+
+@app.delete("/saved/{search_id}")
+async def unsave_search(search_id: str, current_user: CurrentUser = Depends(get_current_user)):
+    """Remove a search from the saved list"""
+    result = await get_collection("search_results").update_one(
+        {"_id": parse_search_id(search_id), "user_id": current_user.email},
+        {"$set": {"is_saved": False}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return {"success": True, "id": search_id}
+
+
+# ===== PRICE HISTORY =====
+
+@app.get("/prices/{origin}/{destination}/cheapest-days")
+async def get_cheapest_days(
+    origin: str,
+    destination: str,
+    start_date: str,
+    end_date: str,
+    limit: int = 5
+):
+    """Cheapest known flight dates for a route, from stored observations"""
+    if not (validate_date_format(start_date) and validate_date_format(end_date)):
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    days = await price_history.cheapest_days(origin, destination, start_date, end_date, min(max(limit, 1), 31))
+    return {"route": price_history.route_key(origin, destination), "cheapest_days": days}
+
+
+@app.get("/prices/{origin}/{destination}/daily")
+async def get_daily_prices(origin: str, destination: str, start_date: str, end_date: str):
+    """Daily min/avg/max for a route across a date range"""
+    if not (validate_date_format(start_date) and validate_date_format(end_date)):
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    days = await price_history.daily_prices(origin, destination, start_date, end_date)
+    return {"route": price_history.route_key(origin, destination), "days": days}
+
+
+@app.get("/prices/{origin}/{destination}/trend")
+async def get_price_trend(origin: str, destination: str, flight_date: str):
+    """How the fare for one flight date changed across observation days"""
+    if not validate_date_format(flight_date):
+        raise HTTPException(status_code=400, detail="Dates must be YYYY-MM-DD")
+    trend = await price_history.price_trend(origin, destination, flight_date)
+    return {"route": price_history.route_key(origin, destination), "flight_date": flight_date, "trend": trend}
+
+
 # ===== GESTURE GAME =====
 
 @app.post("/games/gesture/session")
-async def create_gesture_game_session(current_user: User = Depends(get_current_user)):
+async def create_gesture_game_session(current_user: CurrentUser = Depends(get_current_user)):
     """Create gesture game session"""
     session_id = str(uuid.uuid4())
     logger.info(f"✋ Gesture session: {session_id}")
@@ -384,4 +744,49 @@ async def gesture_game_websocket(websocket: WebSocket, session_id: str):
         await handle_gesture_game_websocket(websocket, session_id)
     except Exception as e:
         logger.error(f"Gesture WebSocket error: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+# ===== GAME SESSION TRACING =====
+
+def set_game_trace(session_id: str, trace):
+    """Attach (or detach, with None) a trace to a live game session"""
+    for games in (active_gesture_games, active_games):
+        game = games.get(session_id)
+        if game is not None:
+            game.trace = trace
+
+
+async def get_trace_admin(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """Only the emails in GAME_TRACE_ADMINS may trace sessions"""
+    if current_user.email.lower() not in GAME_TRACE_ADMINS:
+        raise HTTPException(status_code=403, detail="Not allowed to trace game sessions")
+    return current_user
+
+
+@app.post("/games/trace/{session_id}")
+async def start_game_trace(session_id: str, current_user: CurrentUser = Depends(get_trace_admin)):
+    """Start recording a game session's events (also for sessions not connected yet)"""
+    try:
+        trace = game_metrics.start_trace(session_id)
+    except TooManyTraces as e:
+        raise HTTPException(status_code=503, detail=f"Trace limit reached: {e}")
+    set_game_trace(session_id, trace)
+    return {"session_id": session_id, "tracing": True, "events": len(trace.events)}
+
+
+@app.get("/games/trace/{session_id}")
+async def get_game_trace(session_id: str, current_user: CurrentUser = Depends(get_trace_admin)):
+    """Events recorded so far for a traced session"""
+    trace = game_metrics.traces.get(session_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Session is not being traced")
+    return {"session_id": session_id, "events": trace.dump()}
+
+
+@app.delete("/games/trace/{session_id}")
+async def stop_game_trace(session_id: str, current_user: CurrentUser = Depends(get_trace_admin)):
+    """Stop tracing a session and return what was recorded"""
+    trace = game_metrics.stop_trace(session_id)
+    set_game_trace(session_id, None)
+    return {"session_id": session_id, "tracing": False, "events": trace.dump() if trace else []}
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""
+Local benchmarks for the SkyRacer backend
+Run from backend/: python -m benchmarks.<name>
+"""
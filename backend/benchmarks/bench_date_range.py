@@ -0,0 +1,77 @@
+"""
+Sequential vs concurrent date-range search against the local stub
+Usage (from backend/): python -m benchmarks.bench_date_range --days 30 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks.stub_aviationstack import start_stub_server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING)
+    server, url = start_stub_server(latency=args.latency)
+    os.environ['AVIATIONSTACK_BASE_URL'] = url
+    os.environ.setdefault('AVIATIONSTACK_API_KEY', 'stub')
+    
+    # Import after the env is set so the scraper picks up the stub URL
+    from src import flight_scraper
+    from src.flight_cache import FlightResponseCache
+    from src.http_client import close_http_clients
+    from src.rate_limiter import TokenBucket, QuotaLedger
+    
+    def unthrottled():
+        # The stub has no quota, so keep the limiter out of the measurement
+        return {
+            'cache': FlightResponseCache(),
+            'limiter': TokenBucket(rate=1e6, capacity=10 ** 6),
+            'quota': QuotaLedger('stub', 10 ** 9)
+        }
+    
+    flight_scraper.AVIATIONSTACK_BASE_URL = url
+    
+    start_date = '2025-12-01'
+    end_date = (flight_scraper.datetime.strptime(start_date, '%Y-%m-%d')
+                + flight_scraper.timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    
+    # Separate cold caches so neither run is served from the other's results
+    sync_scraper = flight_scraper.FlightScraper(**unthrottled())
+    t0 = time.perf_counter()
+    sync_flights = sync_scraper.find_best_deals('DEL', 'BOM', start_date, end_date)
+    sync_elapsed = time.perf_counter() - t0
+    
+    async def run_async():
+        scraper = flight_scraper.AsyncFlightScraper(
+            max_concurrency=args.concurrency,
+            **unthrottled()
+        )
+        try:
+            return await scraper.find_best_deals('DEL', 'BOM', start_date, end_date)
+        finally:
+            await close_http_clients()
+    
+    t0 = time.perf_counter()
+    async_flights = asyncio.run(run_async())
+    async_elapsed = time.perf_counter() - t0
+    
+    server.shutdown()
+    
+    assert [f['date'] for f in sync_flights] == [f['date'] for f in async_flights]
+    print(f"📅 {args.days} days @ {args.latency * 1000:.0f} ms upstream latency")
+    print(f"  sequential : {sync_elapsed:7.2f}s ({len(sync_flights)} flights)")
+    print(f"  concurrent : {async_elapsed:7.2f}s ({len(async_flights)} flights, concurrency={args.concurrency})")
+    print(f"  speedup    : {sync_elapsed / async_elapsed:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
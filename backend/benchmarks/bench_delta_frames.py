@@ -0,0 +1,129 @@
+"""
+Full game_state frames vs delta frames: bytes per second and encode CPU
+
+Plays a headless gesture game for a simulated minute at 30 fps (random
+gestures, collisions off, obstacles spawned on a fixed tick schedule)
+and encodes every frame both ways with src.json_codec. A client-side
+replay of the delta stream is checked against the full state each tick.
+
+Usage (from backend/): python -m benchmarks.bench_delta_frames --seconds 60
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from games.gesture_game import GestureGameEngine
+from games.state_delta import DeltaEncoder
+from src.json_codec import dumps
+
+FPS = 30
+
+
+class DeltaClient:
+    """What a browser would do with the delta stream"""
+
+    def __init__(self):
+        self.state = None
+        self.seq = None
+
+    def apply(self, frame: dict):
+        assert self.seq is None or frame["seq"] == self.seq + 1, "sequence gap"
+        self.seq = frame["seq"]
+        if frame["type"] == "game_state":
+            self.state = frame["state"]
+            self.state["obstacles"] = {o["id"]: o for o in self.state["obstacles"]}
+            return
+        state = self.state
+        for obstacle in frame.get("spawn", ()):
+            state["obstacles"][obstacle["id"]] = obstacle
+        for oid in frame.get("despawn", ()):
+            del state["obstacles"][oid]
+        for move in frame.get("moves", ()):
+            obstacle = state["obstacles"][move[0]]
+            obstacle["x"] = move[1]
+            if len(move) > 2:
+                obstacle["y"] = move[2]
+        if "airplane" in frame:
+            state["airplane"].update(frame["airplane"])
+        for key in ("score", "gameOver", "gameSpeed"):
+            if key in frame:
+                state[key] = frame[key]
+
+    def matches(self, full: dict) -> bool:
+        mine = self.state
+        if list(mine["obstacles"]) != [o["id"] for o in full["obstacles"]]:
+            return False
+        for obstacle in full["obstacles"]:
+            if abs(mine["obstacles"][obstacle["id"]]["x"] - obstacle["x"]) > 0.005:
+                return False
+        return all(mine[k] == full[k] for k in ("airplane", "score", "gameOver", "gameSpeed"))
+
+
+def play(seconds: float, spawn_every: int, seed: int = 3):
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = GestureGameEngine()
+    game.start_game()
+    game.start_time -= 10  # past the spawn grace period
+    game.last_obstacle_time = float("inf")  # spawns are driven below
+    game.check_collision = lambda a, b: False
+
+    encoder = DeltaEncoder()
+    client = DeltaClient()
+    full_bytes = delta_bytes = 0
+    full_cpu = delta_cpu = 0.0
+    obstacles = 0
+    gesture = "none"
+
+    ticks = int(seconds * FPS)
+    for tick in range(ticks):
+        if tick % spawn_every == 0:
+            game.spawn_obstacle()
+        if rng.random() < 3 / FPS:
+            gesture = rng.choice(("up", "down", "left", "right"))
+            game.process_gesture_command(gesture)
+        game.update()
+        obstacles += len(game.obstacles)
+
+        t0 = time.perf_counter()
+        full = dumps({"type": "game_state", "state": game.get_game_state(), "gesture": gesture})
+        t1 = time.perf_counter()
+        delta = dumps(encoder.encode(game, gesture))
+        t2 = time.perf_counter()
+        full_cpu += t1 - t0
+        delta_cpu += t2 - t1
+        full_bytes += len(full)
+        delta_bytes += len(delta)
+
+        client.apply(json.loads(delta))
+        assert client.matches(json.loads(full)["state"]), f"replay diverged at tick {tick}"
+
+    return {
+        "obstacles": obstacles / ticks,
+        "full_bps": full_bytes / seconds,
+        "delta_bps": delta_bytes / seconds,
+        "full_us": full_cpu / ticks * 1e6,
+        "delta_us": delta_cpu / ticks * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=60)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"📡 one session, {args.seconds:.0f}s at {FPS} fps")
+    for label, spawn_every in (("normal (spawn every 2s)", 60), ("dense (spawn every 0.25s)", 8)):
+        r = play(args.seconds, spawn_every)
+        print(f"  {label}: ~{r['obstacles']:.0f} obstacles on screen")
+        print(f"    full   {r['full_bps'] / 1024:7.1f} KiB/s  {r['full_us']:6.1f} µs/frame")
+        print(f"    delta  {r['delta_bps'] / 1024:7.1f} KiB/s  {r['delta_us']:6.1f} µs/frame  "
+              f"({r['full_bps'] / r['delta_bps']:.1f}x fewer bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory and CPU of Flight records vs the previous per-flight dicts
+Usage (from backend/): python -m benchmarks.bench_flight_record --flights 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.stub_aviationstack import build_payload
+from src.data_processor import process_flights
+from src.flight_record import from_aviationstack
+
+
+def legacy_parse(entries, date):
+    """The previous _parse_flights: formatted strings in an eight-key dict"""
+    flights = []
+    for flight in entries:
+        dep_dt = datetime.fromisoformat(flight['departure']['scheduled'].replace('Z', '+00:00'))
+        arr_dt = datetime.fromisoformat(flight['arrival']['scheduled'].replace('Z', '+00:00'))
+        duration = arr_dt - dep_dt
+        flights.append({
+            'airline': flight['airline'].get('name', 'Unknown'),
+            'flight_number': flight['flight'].get('iata', 'N/A'),
+            'departure': dep_dt.strftime('%H:%M'),
+            'arrival': arr_dt.strftime('%H:%M'),
+            'price': f"${150 + (len(flights) % 80) * 25}",
+            'duration': f"{duration.seconds // 3600}h {(duration.seconds % 3600) // 60}m",
+            'status': flight.get('flight_status', 'scheduled'),
+            'date': date
+        })
+    return flights
+
+
+def record_parse(entries, date):
+    return [
+        from_aviationstack(flight, (150 + (i % 80) * 25) * 100, date)
+        for i, flight in enumerate(entries)
+    ]
+
+
+def measure(build, entries, date):
+    # Time without tracemalloc (it slows allocation down a lot), then
+    # rebuild under tracing to count retained bytes
+    t0 = time.perf_counter()
+    flights = build(entries, date)
+    elapsed = time.perf_counter() - t0
+    del flights
+    
+    tracemalloc.start()
+    flights = build(entries, date)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    t0 = time.perf_counter()
+    stats = process_flights(flights)
+    stats_elapsed = time.perf_counter() - t0
+    return flights, current, elapsed, stats_elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--flights', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    date = '2025-12-25'
+    # Unique-ish payload entries so string interning doesn't flatter either side
+    entries = build_payload('DEL', 'BOM', date, 24)['data'] * (args.flights // 24 + 1)
+    entries = entries[:args.flights]
+    
+    dicts, dict_mem, dict_build, dict_stats, a = measure(legacy_parse, entries, date)
+    records, rec_mem, rec_build, rec_stats, b = measure(record_parse, entries, date)
+    assert a['min_price'] == b['min_price'] and a['max_price'] == b['max_price']
+    assert records[7].to_dict() == dicts[7]
+    
+    t0 = time.perf_counter()
+    edge = [flight.to_dict() for flight in records[:50]]
+    edge_elapsed = time.perf_counter() - t0
+    
+    n = args.flights
+    print(f"✈️ {n:,} flights")
+    print(f"  {'':18} {'memory':>12} {'build':>10} {'process_flights':>16}")
+    print(f"  {'dicts':18} {dict_mem / 1e6:9.1f} MB {dict_build * 1000:7.1f} ms {dict_stats * 1000:13.1f} ms")
+    print(f"  {'Flight records':18} {rec_mem / 1e6:9.1f} MB {rec_build * 1000:7.1f} ms {rec_stats * 1000:13.1f} ms")
+    print(f"  memory saved: {(1 - rec_mem / dict_mem) * 100:.0f}%  ({dict_mem / n:.0f} → {rec_mem / n:.0f} bytes/flight)")
+    print(f"  serializing 50 flights at the API edge: {edge_elapsed * 1e6:.0f} µs ({len(edge)} dicts)")
+
+
+if __name__ == '__main__':
+    main()
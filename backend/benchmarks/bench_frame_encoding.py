@@ -0,0 +1,99 @@
+"""
+game_state frame size and encode/decode cost: JSON vs msgpack vs struct
+
+Encodes the same full frame each way at 10, 50 and 200 obstacles. Encode
+includes building the frame from the engine, as the session does; decode
+is the Python equivalent of what the client does with each format. The
+struct round trip is checked against the JSON frame (float32 tolerance).
+
+Usage (from backend/): python -m benchmarks.bench_frame_encoding --iterations 5000
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+from games.frame_codec import msgpack, pack_game_state, pack_msgpack, unpack_game_state
+from games.gesture_game import GestureGameEngine
+from src.json_codec import dumps, orjson
+
+
+def game_with(obstacles: int) -> GestureGameEngine:
+    random.seed(obstacles)
+    game = GestureGameEngine()
+    game.start_game()
+    game.start_time -= 10  # past the spawn grace period
+    for _ in range(obstacles):
+        game.spawn_obstacle()
+    for i, obstacle in enumerate(game.obstacles):
+        obstacle.x = random.uniform(-40, game.canvas_width) + i * 0.001
+    game.score = 1230
+    return game
+
+
+def full_frame(game) -> dict:
+    return {"type": "game_state", "state": game.get_game_state(), "gesture": "up"}
+
+
+def per_call_us(fn, iterations) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def check_struct(game):
+    expected = json.loads(dumps(full_frame(game)))
+    decoded = unpack_game_state(pack_game_state(game, "up"))
+    assert decoded["gesture"] == expected["gesture"]
+    for key in ("score", "gameOver", "gameStarted", "gameSpeed"):
+        assert decoded["state"][key] == expected["state"][key], key
+    for mine, theirs in zip(decoded["state"]["obstacles"], expected["state"]["obstacles"]):
+        for key in ("id", "y", "width", "height", "type"):
+            assert mine[key] == theirs[key], key
+        assert abs(mine["x"] - theirs["x"]) < 1e-3 and abs(mine["speed"] - theirs["speed"]) < 1e-3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    n = args.iterations
+    logging.disable(logging.WARNING)
+
+    json_loads = orjson.loads if orjson is not None else json.loads
+    print(f"🧱 full game_state frames, {n:,} iterations each")
+    print(f"  {'obstacles':>9} {'encoding':>8} {'bytes':>7} {'encode µs':>10} {'decode µs':>10}")
+    for obstacles in (10, 50, 200):
+        game = game_with(obstacles)
+        check_struct(game)
+
+        as_json = dumps(full_frame(game)).encode()
+        as_struct = pack_game_state(game, "up")
+        rows = [(
+            "json", len(as_json),
+            per_call_us(lambda: dumps(full_frame(game)), n),
+            per_call_us(lambda: json_loads(as_json), n)
+        )]
+        if msgpack is not None:
+            as_msgpack = pack_msgpack(full_frame(game))
+            rows.append((
+                "msgpack", len(as_msgpack),
+                per_call_us(lambda: pack_msgpack(full_frame(game)), n),
+                per_call_us(lambda: msgpack.unpackb(as_msgpack), n)
+            ))
+        rows.append((
+            "struct", len(as_struct),
+            per_call_us(lambda: pack_game_state(game, "up"), n),
+            per_call_us(lambda: unpack_game_state(as_struct), n)
+        ))
+        for name, size, encode_us, decode_us in rows:
+            print(f"  {obstacles:9d} {name:>8} {size:7d} {encode_us:10.1f} {decode_us:10.1f}"
+                  f"  ({len(as_json) / size:.1f}x smaller than JSON)" if name != "json" else
+                  f"  {obstacles:9d} {name:>8} {size:7d} {encode_us:10.1f} {decode_us:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Per-request latency: fresh connection per call vs pooled keep-alive client
+Usage (from backend/): python -m benchmarks.bench_http_pool --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+import requests
+
+from benchmarks.stub_aviationstack import start_stub_server
+from src.http_client import get_sync_session, get_async_client, close_http_clients
+
+PARAMS = {'dep_iata': 'DEL', 'arr_iata': 'BOM', 'flight_date': '2025-12-25'}
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p95 = samples[int(len(samples) * 0.95) - 1] * 1000
+    print(f"  {label:<28} p50 {p50:7.3f} ms   p95 {p95:7.3f} ms")
+    return p50
+
+
+def time_calls(call, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+async def time_async_calls(call, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    
+    server, url = start_stub_server(latency=0)
+    n = args.requests
+    
+    print(f"🔌 {n} sequential requests against {url}")
+    
+    fresh = report('requests.get (no pool)', time_calls(
+        lambda: requests.get(url, params=PARAMS, timeout=10).json(), n))
+    session = get_sync_session()
+    pooled = report('pooled requests.Session', time_calls(
+        lambda: session.get(url, params=PARAMS, timeout=10).json(), n))
+    
+    async def run_async():
+        async def fresh_call():
+            async with httpx.AsyncClient() as client:
+                (await client.get(url, params=PARAMS)).json()
+        
+        client = get_async_client()
+        
+        async def pooled_call():
+            (await client.get(url, params=PARAMS)).json()
+        
+        a_fresh = report('httpx (client per call)', await time_async_calls(fresh_call, n))
+        a_pooled = report('pooled httpx.AsyncClient', await time_async_calls(pooled_call, n))
+        await close_http_clients()
+        return a_fresh, a_pooled
+    
+    a_fresh, a_pooled = asyncio.run(run_async())
+    server.shutdown()
+    
+    print(f"  sync p50 reduction : {(1 - pooled / fresh) * 100:5.1f}%")
+    print(f"  async p50 reduction: {(1 - a_pooled / a_fresh) * 100:5.1f}%")
+    print("  (loopback has no TLS; the saving against api.aviationstack.com is larger)")
+
+
+if __name__ == '__main__':
+    main()
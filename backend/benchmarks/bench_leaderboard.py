@@ -0,0 +1,165 @@
+"""
+Leaderboard lookups: precomputed Fenwick ranks vs sorting all players
+
+In-memory stand-in (default):
+    python -m benchmarks.bench_leaderboard --users 1000000
+
+Against a local MongoDB (seeds and drops a throwaway database):
+    MONGODB_URI=mongodb://localhost:27017 python -m benchmarks.bench_leaderboard --users 1000000 --mongo
+"""
+
+import argparse
+import asyncio
+import heapq
+import os
+import random
+import time
+from collections import Counter
+
+from src.leaderboard import GameLeaderboard
+
+GAME_TYPE = "gesture"
+
+
+def synthetic_scores(users: int, seed: int = 7):
+    """Long-tailed high scores, like real arcade results"""
+    rng = random.Random(seed)
+    return {f"player{i}@bench.dev": int(rng.expovariate(1 / 400)) for i in range(users)}
+
+
+def build_board(scores) -> GameLeaderboard:
+    """What GameLeaderboard.load() does, minus the database round trips"""
+    board = GameLeaderboard(GAME_TYPE)
+    board.counts.load(Counter(scores.values()))
+    for email, score in heapq.nlargest(board.top_size, scores.items(), key=lambda item: (item[1], item[0])):
+        board._update_top(email, score)
+    board.loaded = True
+    return board
+
+
+def naive_top(scores, limit):
+    return sorted(scores.items(), key=lambda item: -item[1])[:limit]
+
+
+def naive_rank(scores, score):
+    return 1 + sum(1 for value in scores.values() if value > score)
+
+
+def per_op(fn, iterations):
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - t0) / iterations
+
+
+def run_in_memory(users: int):
+    scores = synthetic_scores(users)
+    emails = list(scores)
+    rng = random.Random(11)
+    probes = [scores[rng.choice(emails)] for _ in range(100_000)]
+
+    t0 = time.perf_counter()
+    board = build_board(scores)
+    build = time.perf_counter() - t0
+
+    assert [s for _, s in board.top(10)] == [s for _, s in naive_top(scores, 10)]
+    for score in probes[:3]:
+        assert board.rank_of(score) == naive_rank(scores, score)
+
+    naive_rank_s = per_op(lambda i: naive_rank(scores, probes[i]), 3)
+    naive_top_s = per_op(lambda i: naive_top(scores, 10), 3)
+    rank_s = per_op(lambda i: board.rank_of(probes[i]), len(probes))
+    top_s = per_op(lambda i: board.top(10), 100_000)
+
+    def submit(i):
+        email = emails[i % len(emails)]
+        old = scores[email]
+        new = old + rng.randrange(1, 50)
+        scores[email] = new
+        board.record(email, old, new)
+    record_s = per_op(submit, 100_000)
+
+    print(f"🏅 {users:,} synthetic players ({GAME_TYPE})")
+    print(f"  build from score counts       {build * 1000:9.1f} ms  ({board.counts.max_score + 1:,} score slots)")
+    print(f"  my rank   naive scan          {naive_rank_s * 1e6:12.1f} µs")
+    print(f"  my rank   Fenwick             {rank_s * 1e6:12.2f} µs  ({naive_rank_s / rank_s:,.0f}x)")
+    print(f"  top 10    naive sort          {naive_top_s * 1e6:12.1f} µs")
+    print(f"  top 10    podium list         {top_s * 1e6:12.2f} µs  ({naive_top_s / top_s:,.0f}x)")
+    print(f"  submission (improved score)   {record_s * 1e6:12.2f} µs")
+
+
+async def run_mongo(users: int):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo import DESCENDING
+
+    from src.database import Database
+    from src.indexes import apply_index_manifest
+    from src.leaderboard import Leaderboards
+
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    os.environ["DATABASE_NAME"] = "skyracer_bench"
+    Database.client = client
+    collection = client["skyracer_bench"]["game_stats"]
+    try:
+        await collection.drop()
+        scores = synthetic_scores(users)
+        batch = []
+        for email, score in scores.items():
+            batch.append({"email": email, GAME_TYPE: {"high_score": score, "total_games": 1}})
+            if len(batch) == 10_000:
+                await collection.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            await collection.insert_many(batch, ordered=False)
+
+        boards = Leaderboards()
+        await apply_index_manifest()
+        field = f"{GAME_TYPE}.high_score"
+        played = {f"{GAME_TYPE}.total_games": {"$gt": 0}}
+        probe = scores["player42@bench.dev"]
+
+        t0 = time.perf_counter()
+        docs = await collection.find(played, {"_id": 0, "email": 1, field: 1}).to_list(None)
+        docs.sort(key=lambda doc: -doc[GAME_TYPE]["high_score"])
+        naive = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        await collection.count_documents({**played, field: {"$gt": probe}})
+        indexed_rank = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        await collection.find(played).sort(field, DESCENDING).limit(10).to_list(10)
+        indexed_top = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        await boards[GAME_TYPE].load()
+        load = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        rank, _ = await boards.rank_of(GAME_TYPE, probe)
+        memory_rank = time.perf_counter() - t0
+
+        print(f"🍃 MongoDB, {users:,} players")
+        print(f"  fetch + sort everything       {naive * 1000:9.1f} ms")
+        print(f"  indexed count (rank)          {indexed_rank * 1000:9.1f} ms")
+        print(f"  indexed top 10                {indexed_top * 1000:9.1f} ms")
+        print(f"  leaderboard load (startup)    {load * 1000:9.1f} ms")
+        print(f"  in-memory rank                {memory_rank * 1e6:9.1f} µs  (rank {rank:,})")
+    finally:
+        await client.drop_database("skyracer_bench")
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--mongo", action="store_true", help="also run against MONGODB_URI")
+    args = parser.parse_args()
+
+    run_in_memory(args.users)
+    if args.mongo:
+        asyncio.run(run_mongo(args.users))
+
+
+if __name__ == "__main__":
+    main()
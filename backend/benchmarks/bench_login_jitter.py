@@ -0,0 +1,120 @@
+"""
+Gesture-game frame jitter while logins run in parallel
+
+Runs a few gesture game loops (update + JSON encode every 33 ms, like
+gesture_websocket.game_update_loop) and fires bursts of password checks
+next to them, once with bcrypt inline on the event loop (the old
+authenticate_user) and once through the bounded password hasher.
+
+Usage (from backend/): python -m benchmarks.bench_login_jitter --logins 40 --games 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from games.gesture_game import GestureGameEngine
+from src.password_hasher import PasswordHasher, PasswordHasherBusy, _hash, _verify
+
+FRAME_SECONDS = 0.033
+
+
+async def game_loop(stop: asyncio.Event, lateness: list):
+    game = GestureGameEngine()
+    game.start_game()
+    expected = time.perf_counter() + FRAME_SECONDS
+    while not stop.is_set():
+        await asyncio.sleep(FRAME_SECONDS)
+        now = time.perf_counter()
+        lateness.append(max(0.0, now - expected))
+        expected = now + FRAME_SECONDS
+        if game.game_over:
+            game.start_game()
+        game.update()
+        json.dumps({"type": "game_state", "state": game.get_game_state()})
+
+
+async def inline_login(password, hashed, hasher):
+    await asyncio.sleep(0)  # the old handler: bcrypt right on the loop
+    return _verify(password, hashed)
+
+
+async def executor_login(password, hashed, hasher):
+    return await hasher.verify(password, hashed)
+
+
+async def run(login, hashed, logins, games, concurrency, hasher):
+    stop = asyncio.Event()
+    lateness = []
+    loops = [asyncio.create_task(game_loop(stop, lateness)) for _ in range(games)]
+    await asyncio.sleep(0.3)  # warm up
+
+    rejected = 0
+    done = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal rejected, done
+        async with semaphore:
+            try:
+                assert await login("correct horse", hashed, hasher)
+                done += 1
+            except PasswordHasherBusy:
+                rejected += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    if not logins:
+        await asyncio.sleep(2)
+    elapsed = time.perf_counter() - t0
+
+    stop.set()
+    await asyncio.gather(*loops)
+    lateness.sort()
+    return {
+        "logins_per_s": done / elapsed,
+        "rejected": rejected,
+        "p50_ms": statistics.median(lateness) * 1000,
+        "p99_ms": lateness[int(len(lateness) * 0.99)] * 1000,
+        "max_ms": lateness[-1] * 1000,
+        "frames": len(lateness)
+    }
+
+
+def report(name, r):
+    print(f"  {name:<22} frame lateness p50 {r['p50_ms']:6.1f} ms  p99 {r['p99_ms']:7.1f} ms  "
+          f"max {r['max_ms']:7.1f} ms  | {r['logins_per_s']:5.1f} logins/s  503s {r['rejected']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--games", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=40, help="simultaneous login requests")
+    parser.add_argument("--max-pending", type=int, default=32)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    hashed = _hash("correct horse")
+    print(f"🔐 {args.logins} logins next to {args.games} gesture games (33 ms frames)")
+
+    baseline = await run(inline_login, hashed, 0, args.games, 1, None)
+    report("no logins", baseline)
+
+    report("bcrypt on event loop", await run(inline_login, hashed, args.logins, args.games, args.concurrency, None))
+
+    for kind in ("thread", "process"):
+        hasher = PasswordHasher(kind=kind, max_pending=args.max_pending)
+        await hasher.verify("warm up", hashed)
+        try:
+            r = await run(executor_login, hashed, args.logins, args.games, args.concurrency, hasher)
+        finally:
+            hasher.shutdown()
+        report(f"{kind} executor", r)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
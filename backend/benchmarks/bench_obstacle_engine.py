@@ -0,0 +1,72 @@
+"""
+Headless game ticks per second on one core: dataclass vs vectorized engine
+
+Each game is pre-filled with obstacles spread across the screen (so some
+leave and are culled during the run), spawning is switched off and the
+airplane is parked off-canvas so no game ends early. The object engines
+are updated one by one; the vectorized ones are stepped as one batch,
+which is what the tick scheduler does.
+
+Usage (from backend/): python -m benchmarks.bench_obstacle_engine --ticks 100
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from games.gesture_game import GestureGameEngine, Obstacle, VectorizedGestureEngine
+from games.obstacle_field import ObstacleField, step_games
+
+
+def prepare(game: GestureGameEngine, obstacles: int, rng: random.Random):
+    game.start_game()
+    game.last_obstacle_time = float("inf")
+    game.airplane.y = -1000
+    for i in range(obstacles):
+        game.obstacles.append(Obstacle(
+            x=rng.uniform(0, game.canvas_width), y=rng.randint(60, 400),
+            width=50, height=40, speed=3.5, type="bird", id=i
+        ))
+    if isinstance(game, VectorizedGestureEngine):
+        # Move the staged obstacles into the field
+        for obstacle in game.obstacles:
+            game.field.spawn(game.slot, obstacle.x, obstacle.y, obstacle.width,
+                             obstacle.height, obstacle.speed, obstacle.type, obstacle.id)
+        game.obstacles.clear()
+
+
+def ticks_per_second(engine, sessions: int, obstacles: int, ticks: int) -> float:
+    rng = random.Random(7)
+    field = ObstacleField()
+    games = []
+    for _ in range(sessions):
+        game = engine(field=field) if engine is VectorizedGestureEngine else engine()
+        prepare(game, obstacles, rng)
+        games.append(game)
+
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        step_games(games)
+    elapsed = time.perf_counter() - t0
+    assert not any(game.game_over for game in games)
+    return sessions * ticks / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"🎮 game ticks/s on one core ({args.ticks} ticks per run)")
+    print(f"  {'sessions':>8} {'obstacles':>9} {'object':>12} {'vector':>12}")
+    for sessions in (1, 100, 1000, 5000):
+        for obstacles in (8, 50):
+            obj = ticks_per_second(GestureGameEngine, sessions, obstacles, args.ticks)
+            vec = ticks_per_second(VectorizedGestureEngine, sessions, obstacles, args.ticks)
+            print(f"  {sessions:8d} {obstacles:9d} {obj:12,.0f} {vec:12,.0f}  ({vec / obj:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+BSON decode + pydantic validation cost: full documents vs projected reads
+
+Simulates what the driver and the request handler do with the reply of
+the two hottest lookups: the user behind every authenticated request and
+the /games/stats document. No MongoDB needed; the server-side projection
+is modelled by encoding only the projected fields.
+
+Usage (from backend/): python -m benchmarks.bench_read_models --iterations 50000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import bson
+from bson import ObjectId
+
+from src.auth import CURRENT_USER_PROJECTION
+from src.game_stats import GAME_TYPES, PUBLIC_STATS_FIELDS, empty_game_stats, public_game_stats, stats_projection
+from src.models import CurrentUser, User
+
+
+def user_document() -> dict:
+    return {
+        "_id": ObjectId(),
+        "email": "player@example.com",
+        "full_name": "Sky Racer",
+        "hashed_password": "$2b$12$" + "x" * 53,
+        "google_id": "109876543210987654321",
+        "profile_picture": "https://lh3.googleusercontent.com/a/" + "p" * 80,
+        "is_active": True,
+        "created_at": datetime.utcnow()
+    }
+
+
+def game_stats_document() -> dict:
+    doc = {"_id": ObjectId(), "email": "player@example.com",
+           "created_at": datetime.utcnow(), "updated_at": datetime.utcnow()}
+    for game_type in GAME_TYPES:
+        stats = empty_game_stats()
+        stats.update(high_score=420, total_games=37, total_score=9001,
+                     average_score=243.27, previous_high_score=410, last_played=datetime.utcnow())
+        doc[game_type] = stats
+    return doc
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """Inclusion projection with dotted paths, as the server would apply it"""
+    out = {}
+    for path, include in projection.items():
+        if not include:
+            continue
+        head, _, tail = path.partition(".")
+        if head not in doc:
+            continue
+        if tail:
+            out.setdefault(head, {})[tail] = doc[head][tail]
+        else:
+            out[head] = doc[head]
+    if projection.get("_id", 1) and "_id" in doc:
+        out["_id"] = doc["_id"]
+    return out
+
+
+def timed(fn, iterations) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    user = user_document()
+    full_user = bson.encode(user)
+    projected_user = bson.encode(project(user, CURRENT_USER_PROJECTION))
+
+    def old_user():
+        return User(**bson.decode(full_user))
+
+    def new_user():
+        return CurrentUser(**bson.decode(projected_user))
+
+    assert "hashed_password" not in new_user().model_dump()
+
+    stats = game_stats_document()
+    full_stats = bson.encode(stats)
+    # Same projection as api.STATS_PROJECTION
+    projected_stats = bson.encode(project(stats, stats_projection(PUBLIC_STATS_FIELDS + ("total_score",))))
+
+    def old_stats():
+        doc = bson.decode(full_stats)
+        doc.pop("_id", None)
+        return {"voice": doc.get("voice"), "gesture": doc.get("gesture")}
+
+    def new_stats():
+        doc = bson.decode(projected_stats)
+        return {game_type: public_game_stats(doc.get(game_type)) for game_type in GAME_TYPES}
+
+    assert set(new_stats()["voice"]) == {"high_score", "total_games", "average_score", "last_played"}
+
+    rows = [
+        ("user: full doc + User", len(full_user), timed(old_user, n)),
+        ("user: projected + CurrentUser", len(projected_user), timed(new_user, n)),
+        ("stats: full doc", len(full_stats), timed(old_stats, n)),
+        ("stats: projected + public fields", len(projected_stats), timed(new_stats, n)),
+    ]
+    print(f"📦 BSON decode + validation, {n:,} iterations each")
+    for name, size, seconds in rows:
+        print(f"  {name:<34} {size:5d} bytes  {seconds * 1e6:7.2f} µs")
+    print(f"  user lookup: {rows[0][2] / rows[1][2]:.2f}x faster, {len(full_user) - len(projected_user)} bytes less per request")
+
+
+if __name__ == "__main__":
+    main()
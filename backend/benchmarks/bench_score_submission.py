@@ -0,0 +1,91 @@
+"""
+Concurrent score submissions: read-modify-write vs atomic pipeline update
+
+Needs a MongoDB to talk to (a throwaway database is created and dropped):
+    MONGODB_URI=mongodb://localhost:27017 python -m benchmarks.bench_score_submission --concurrency 500
+
+Fires N simultaneous submissions for the same user with each strategy and
+checks how many games were recorded; the old path loses updates under
+contention, the atomic one must record all N. That guarantee is asserted
+in tests/test_score_concurrency.py; this script measures it against a
+real server.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from src.game_stats import apply_score, empty_game_stats
+
+EMAIL = "bench@skyracer.dev"
+
+
+async def legacy_submit(collection, email, game_type, score):
+    """The previous /games/score body: find_one, rebuild in Python, $set it back"""
+    existing = await collection.find_one({"email": email})
+    if not existing:
+        existing = {"email": email, "voice": empty_game_stats(), "gesture": empty_game_stats()}
+    stats = existing.get(game_type, empty_game_stats())
+    total_games = stats["total_games"] + 1
+    total_score = stats["total_score"] + score
+    existing[game_type] = {
+        "high_score": max(score, stats["high_score"]),
+        "total_games": total_games,
+        "total_score": total_score,
+        "average_score": round(total_score / total_games, 2),
+        "last_played": datetime.utcnow()
+    }
+    existing["updated_at"] = datetime.utcnow()
+    await collection.update_one({"email": email}, {"$set": existing}, upsert=True)
+
+
+async def run(strategy, collection, n):
+    await collection.delete_many({})
+    await collection.create_index("email", unique=True)
+    latencies = []
+    collisions = []
+    
+    async def one(i):
+        t0 = time.perf_counter()
+        try:
+            await strategy(collection, EMAIL, "gesture", 10 + i % 50)
+        except DuplicateKeyError:
+            collisions.append(i)  # concurrent first upserts race on the unique index
+        latencies.append(time.perf_counter() - t0)
+    
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    
+    doc = await collection.find_one({"email": EMAIL})
+    recorded = doc["gesture"]["total_games"] if doc else 0
+    return recorded, len(collisions), elapsed, statistics.median(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+    
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    db = client["skyracer_bench"]
+    try:
+        print(f"🎮 {args.concurrency} simultaneous submissions for one user")
+        for name, strategy in (("read-modify-write", legacy_submit), ("atomic pipeline", apply_score)):
+            recorded, collisions, elapsed, p50 = await run(strategy, db.game_stats, args.concurrency)
+            lost = args.concurrency - recorded
+            print(f"  {name:<18} recorded {recorded:5d}  lost {lost:5d}  upsert collisions {collisions:4d}  "
+                  f"wall {elapsed * 1000:7.1f} ms  p50 {p50 * 1000:6.2f} ms")
+    finally:
+        await client.drop_database("skyracer_bench")
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
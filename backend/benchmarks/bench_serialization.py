@@ -0,0 +1,93 @@
+"""
+Response and frame encoding throughput
+
+/games/stats: the old untyped path (jsonable_encoder + JSONResponse)
+against the typed response model, which FastAPI validates and dumps to
+JSON bytes in pydantic-core. game_state frames: Starlette's send_json
+encoding (stdlib json) against src.json_codec (orjson).
+
+Usage (from backend/): python -m benchmarks.bench_serialization --iterations 20000
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from games.gesture_game import GestureGameEngine
+from src.json_codec import dumps, orjson
+from src.models import GameStatsResponse
+
+
+def stats_payload() -> dict:
+    stats = {
+        "high_score": 420,
+        "total_games": 37,
+        "average_score": 243.27,
+        "last_played": datetime.utcnow()
+    }
+    return {"stats": {"voice": dict(stats), "gesture": dict(stats)}}
+
+
+def game_state_frame(obstacles: int) -> dict:
+    game = GestureGameEngine()
+    game.start_game()
+    game.start_time -= 10  # past the spawn grace period
+    for _ in range(obstacles):
+        game.spawn_obstacle()
+    return {"type": "game_state", "state": game.get_game_state(), "gesture": "up"}
+
+
+def starlette_send_json(payload) -> str:
+    """What WebSocket.send_json does before send_text"""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def rate(fn, payload, iterations) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return iterations / (time.perf_counter() - t0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+    n = args.iterations
+    logging.disable(logging.INFO)
+
+    payload = stats_payload()
+    adapter = TypeAdapter(GameStatsResponse)
+
+    def untyped(content):
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def typed(content):
+        # serialize_response(dump_json=True): validate, then dump to bytes
+        return adapter.dump_json(adapter.validate_python(content))
+
+    assert json.loads(untyped(payload)) == json.loads(typed(payload))
+
+    old, new = rate(untyped, payload, n), rate(typed, payload, n)
+    print(f"📤 /games/stats response body ({len(typed(payload))} bytes)")
+    print(f"  jsonable_encoder + JSONResponse  {old:10,.0f} /s")
+    print(f"  response model (pydantic-core)   {new:10,.0f} /s  ({new / old:.1f}x)")
+
+    encoder = "orjson" if orjson is not None else "stdlib json (orjson not installed)"
+    print(f"🎮 game_state frames, json_codec uses {encoder}")
+    for count in (0, 10, 50):
+        frame = game_state_frame(count)
+        assert json.loads(dumps(frame)) == json.loads(starlette_send_json(frame))
+        old, new = rate(starlette_send_json, frame, n), rate(dumps, frame, n)
+        print(f"  {count:3d} obstacles ({len(dumps(frame)):5d} bytes)  send_json {old:10,.0f} /s  "
+              f"json_codec {new:10,.0f} /s  ({new / old:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
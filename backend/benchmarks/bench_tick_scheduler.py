@@ -0,0 +1,97 @@
+"""
+Per-session game loops vs the shared tick scheduler
+
+Runs N gesture games for a few seconds both ways, with a send that
+encodes the frame and yields (no network), and reports the achieved
+frame rate per session and the process CPU time per frame.
+
+Usage (from backend/): python -m benchmarks.bench_tick_scheduler --sessions 2000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from games.gesture_game import GestureGameEngine
+from games.tick_scheduler import TickedSession, TickScheduler
+from src.json_codec import dumps
+
+
+def new_game() -> GestureGameEngine:
+    game = GestureGameEngine()
+    game.start_game()
+    # Keep games running for the whole measurement
+    game.check_collision = lambda a, b: False
+    return game
+
+
+class BenchSession(TickedSession):
+    __slots__ = ("frames",)
+
+    def __init__(self, session_id, game):
+        super().__init__(session_id, game)
+        self.frames = 0
+
+    async def send_state(self):
+        dumps({"type": "game_state", "state": self.game.get_game_state(), "gesture": "none"})
+        self.frames += 1
+        await asyncio.sleep(0)
+
+
+async def per_session_loops(sessions: int, seconds: float) -> int:
+    """The old handler: one task and one 33 ms sleep per connection"""
+    frames = 0
+
+    async def loop(game):
+        nonlocal frames
+        while True:
+            game.update()
+            dumps({"type": "game_state", "state": game.get_game_state(), "gesture": "none"})
+            frames += 1
+            await asyncio.sleep(0.033)
+
+    tasks = [asyncio.create_task(loop(new_game())) for _ in range(sessions)]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return frames
+
+
+async def shared_scheduler(sessions: int, seconds: float):
+    scheduler = TickScheduler(30)
+    players = [BenchSession(str(i), new_game()) for i in range(sessions)]
+    for player in players:
+        scheduler.add(player)
+    await asyncio.sleep(seconds)
+    await scheduler.stop()
+    return sum(p.frames for p in players), scheduler.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"🎮 {args.sessions} sessions for {args.seconds:.0f}s at 30 fps target")
+
+    cpu = time.process_time()
+    frames = asyncio.run(per_session_loops(args.sessions, args.seconds))
+    cpu = time.process_time() - cpu
+    print(f"  per-session tasks  {frames / args.sessions / args.seconds:5.1f} fps/session  "
+          f"{cpu / frames * 1e6:6.1f} µs CPU/frame")
+
+    cpu = time.process_time()
+    frames, stats = asyncio.run(shared_scheduler(args.sessions, args.seconds))
+    cpu = time.process_time() - cpu
+    print(f"  shared scheduler   {frames / args.sessions / args.seconds:5.1f} fps/session  "
+          f"{cpu / frames * 1e6:6.1f} µs CPU/frame  "
+          f"(tick avg {stats['avg_tick_ms']} ms, max {stats['max_tick_ms']} ms, "
+          f"skipped {stats['skipped_ticks']}, coalesced {stats['coalesced_frames']})")
+
+
+if __name__ == "__main__":
+    main()
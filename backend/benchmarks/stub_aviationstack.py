@@ -0,0 +1,89 @@
+"""
+Local stand-in for the Aviationstack /v1/flights endpoint
+Lets the scraper be benchmarked without network access or API quota.
+
+Run standalone:  python -m benchmarks.stub_aviationstack --port 8765 --latency 0.2
+Then point the scraper at it:  AVIATIONSTACK_BASE_URL=http://127.0.0.1:8765/v1/flights
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+AIRLINES = ['IndiGo', 'Air India', 'SpiceJet', 'Vistara', 'Akasa Air']
+
+
+def build_payload(dep_iata, arr_iata, flight_date, count):
+    """Aviationstack-shaped response with `count` scheduled flights"""
+    data = []
+    for i in range(count):
+        dep_hour = (5 + i) % 24
+        airline = AIRLINES[i % len(AIRLINES)]
+        data.append({
+            'flight_date': flight_date,
+            'flight_status': 'scheduled',
+            'departure': {
+                'iata': dep_iata,
+                'scheduled': f'{flight_date}T{dep_hour:02d}:15:00+00:00'
+            },
+            'arrival': {
+                'iata': arr_iata,
+                'scheduled': f'{flight_date}T{(dep_hour + 2) % 24:02d}:35:00+00:00'
+            },
+            'airline': {'name': airline},
+            'flight': {'iata': f'{airline[:2].upper()}{200 + i}'}
+        })
+    return {'pagination': {'limit': 50, 'count': count, 'total': count}, 'data': data}
+
+
+def make_handler(latency, flights_per_day):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # allow keep-alive
+        
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            time.sleep(latency)
+            body = json.dumps(build_payload(
+                query.get('dep_iata', ['DEL'])[0],
+                query.get('arr_iata', ['BOM'])[0],
+                query.get('flight_date', ['2025-12-25'])[0],
+                flights_per_day
+            )).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return StubHandler
+
+
+def start_stub_server(port=0, latency=0.2, flights_per_day=10):
+    """Start the stub in a daemon thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(latency, flights_per_day))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, bound_port = server.server_address
+    return server, f'http://{host}:{bound_port}/v1/flights'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stub Aviationstack server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds per request')
+    parser.add_argument('--flights', type=int, default=10, help='flights per day')
+    args = parser.parse_args()
+    
+    server, url = start_stub_server(args.port, args.latency, args.flights)
+    print(f'🛬 Stub Aviationstack listening on {url}')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,109 @@
+"""
+Binary encodings for gesture game frames
+
+The client picks an encoding per connection in its start message,
+{"type": "start", "encoding": "struct" | "msgpack" | "json"}; the
+game_started reply echoes the one in use (JSON when the request is
+unknown or msgpack is not installed). Only game_state/game_delta frames
+are binary, sent as WebSocket binary messages; control messages stay
+JSON text.
+
+"msgpack" packs the same frame dicts as JSON, so it combines with delta
+frames. "struct" is a fixed little-endian layout for full game_state
+frames (delta frames are not used with it):
+
+    header  <BBBBIffHHHH  24 bytes
+        kind (1 = game_state), flags (1 gameOver, 2 gameStarted),
+        gesture (GESTURES index), gameSpeed * 10, score,
+        airplane x, y (float32), width, height, speed, obstacle count
+    obstacle  <IfhHHfB  19 bytes each
+        id, x (float32), y, width, height, speed (float32),
+        type (OBSTACLE_TYPES index, 255 = unknown)
+"""
+
+import struct
+from typing import List
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ENCODINGS = ("json", "struct", "msgpack") if msgpack is not None else ("json", "struct")
+
+GESTURES = ("none", "up", "down", "left", "right")
+OBSTACLE_TYPES = ("bird", "cloud", "thunder", "ufo")
+
+FRAME_GAME_STATE = 1
+FLAG_GAME_OVER = 1
+FLAG_GAME_STARTED = 2
+UNKNOWN_TYPE = 255
+
+HEADER = struct.Struct("<BBBBIffHHHH")
+OBSTACLE = struct.Struct("<IfhHHfB")
+
+_GESTURE_CODES = {name: i for i, name in enumerate(GESTURES)}
+_TYPE_CODES = {name: i for i, name in enumerate(OBSTACLE_TYPES)}
+
+
+def negotiate(requested) -> str:
+    """The encoding to use for a start message's "encoding" value"""
+    return requested if requested in ENCODINGS else "json"
+
+
+def pack_game_state(game, gesture: str) -> bytes:
+    """A full game_state frame in the struct layout, read straight off the engine"""
+    airplane = game.airplane
+    rows = game.obstacle_rows()
+    flags = (FLAG_GAME_OVER if game.game_over else 0) | (FLAG_GAME_STARTED if game.game_started else 0)
+    parts = [HEADER.pack(
+        FRAME_GAME_STATE,
+        flags,
+        _GESTURE_CODES.get(gesture, 0),
+        int(round(game.game_speed * 10)),
+        game.score,
+        airplane.x,
+        airplane.y,
+        airplane.width,
+        airplane.height,
+        airplane.speed,
+        len(rows)
+    )]
+    pack = OBSTACLE.pack
+    codes = _TYPE_CODES
+    for oid, x, y, width, height, speed, type_name in rows:
+        parts.append(pack(oid, x, y, width, height, speed, codes.get(type_name, UNKNOWN_TYPE)))
+    return b"".join(parts)
+
+
+def unpack_game_state(data: bytes) -> dict:
+    """Inverse of pack_game_state, in the JSON frame's shape (float32 precision)"""
+    (kind, flags, gesture, speed_tenths, score, x, y, width, height, speed,
+     count) = HEADER.unpack_from(data)
+    if kind != FRAME_GAME_STATE:
+        raise ValueError(f"Not a game_state frame: kind {kind}")
+    obstacles: List[dict] = []
+    for oid, ox, oy, ow, oh, ospeed, type_code in OBSTACLE.iter_unpack(data[HEADER.size:]):
+        obstacles.append({
+            "x": ox, "y": oy, "width": ow, "height": oh, "speed": ospeed,
+            "type": OBSTACLE_TYPES[type_code] if type_code < len(OBSTACLE_TYPES) else "unknown",
+            "id": oid
+        })
+    if len(obstacles) != count:
+        raise ValueError(f"Truncated frame: {len(obstacles)} of {count} obstacles")
+    return {
+        "type": "game_state",
+        "state": {
+            "airplane": {"x": x, "y": y, "width": width, "height": height, "speed": speed},
+            "obstacles": obstacles,
+            "score": score,
+            "gameOver": bool(flags & FLAG_GAME_OVER),
+            "gameStarted": bool(flags & FLAG_GAME_STARTED),
+            "gameSpeed": speed_tenths / 10
+        },
+        "gesture": GESTURES[gesture] if gesture < len(GESTURES) else "none"
+    }
+
+
+def pack_msgpack(frame: dict) -> bytes:
+    return msgpack.packb(frame)
@@ -7,6 +7,7 @@ import asyncio
 import json
 import logging
 from fastapi import WebSocket
+from src.json_codec import send_json
 
 from games.voice_game import get_game, delete_game
 
@@ -34,7 +35,7 @@ async def handle_voice_game_websocket(websocket: WebSocket, session_id: str):
                 game.start_game()
                 state = game.get_game_state()
                 
-                await websocket.send_json({
+                await send_json(websocket, {
                     "type": "game_started",
                     "state": state
                 })
@@ -48,14 +49,14 @@ async def handle_voice_game_websocket(websocket: WebSocket, session_id: str):
             elif msg_type == "update":
                 game.update()
                 
-                await websocket.send_json({
+                await send_json(websocket, {
                     "type": "game_state",
                     "state": game.get_game_state()
                 })
                 
             elif msg_type == "restart":
                 game.start_game()
-                await websocket.send_json({
+                await send_json(websocket, {
                     "type": "game_restarted",
                     "state": game.get_game_state()
                 })
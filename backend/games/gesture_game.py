@@ -9,6 +9,9 @@ from typing import Dict, List, Tuple
 from dataclasses import dataclass, asdict
 import logging
 
+from games.instrumentation import game_metrics
+from games.obstacle_field import GAME_ENGINE, VectorizedObstacles
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,24 +25,16 @@ class Airplane:
     speed: int = 25  # Increased for very visible movement
     
     def move_up(self, canvas_height: int):
-        old_y = self.y
         self.y = max(30, self.y - self.speed)
-        logger.info(f"🔼 MOVE_UP called: {old_y} → {self.y} (delta: {self.y - old_y})")
     
     def move_down(self, canvas_height: int):
-        old_y = self.y
         self.y = min(canvas_height - self.height - 30, self.y + self.speed)
-        logger.info(f"🔽 MOVE_DOWN called: {old_y} → {self.y} (delta: {self.y - old_y})")
     
     def move_left(self, canvas_width: int):
-        old_x = self.x
         self.x = max(20, self.x - self.speed)
-        logger.info(f"◀️ MOVE_LEFT called: {old_x} → {self.x} (delta: {self.x - old_x})")
     
     def move_right(self, canvas_width: int):
-        old_x = self.x
         self.x = min(canvas_width - self.width - 20, self.x + self.speed)
-        logger.info(f"▶️ MOVE_RIGHT called: {old_x} → {self.x} (delta: {self.x - old_x})")
     
     def get_bounds(self) -> Tuple[float, float, float, float]:
         return (self.x, self.y, self.x + self.width, self.y + self.height)
@@ -82,6 +77,7 @@ class GestureGameEngine:
         self.game_speed = 1.0
         self.start_time = None
         self.obstacle_id_counter = 0
+        self.trace = None  # GameTrace while this session is traced
         
     def start_game(self):
         """Initialize/restart the game"""
@@ -95,41 +91,39 @@ class GestureGameEngine:
         self.game_speed = 1.0
         self.start_time = time.time()
         self.obstacle_id_counter = 0
-        logger.info("🎮 Gesture game started!")
+        game_metrics.count("games_started")
+        if self.trace:
+            self.trace.event("start")
     
     def process_gesture_command(self, command: str):
         """Process gesture command and move airplane"""
-        logger.info(f"🎮 PROCESS_GESTURE called: command={command}, started={self.game_started}, over={self.game_over}")
-        
         if not self.game_started or self.game_over:
-            logger.warning(f"⚠️ Cannot process - started={self.game_started}, over={self.game_over}")
+            game_metrics.count("gestures_ignored")
             return
         
         command = command.lower().strip()
-        logger.info(f"✈️ Processing command: {command} | Current pos: ({self.airplane.x}, {self.airplane.y})")
         
         if command == "up":
-            old_y = self.airplane.y
             self.airplane.move_up(self.canvas_height)
-            logger.info(f"✈️ UP: {old_y} → {self.airplane.y}")
         
         elif command == "down":
-            old_y = self.airplane.y
             self.airplane.move_down(self.canvas_height)
-            logger.info(f"✈️ DOWN: {old_y} → {self.airplane.y}")
         
         elif command == "left":
-            old_x = self.airplane.x
             self.airplane.move_left(self.canvas_width)
-            logger.info(f"✈️ LEFT: {old_x} → {self.airplane.x}")
         
         elif command == "right":
-            old_x = self.airplane.x
             self.airplane.move_right(self.canvas_width)
-            logger.info(f"✈️ RIGHT: {old_x} → {self.airplane.x}")
         
         else:
-            logger.warning(f"❌ Unknown command: {command}")
+            game_metrics.count("unknown_commands")
+            if self.trace:
+                self.trace.event("unknown_command", command)
+            return
+        
+        game_metrics.count("gestures")
+        if self.trace:
+            self.trace.event("move", command, self.airplane.x, self.airplane.y)
     
     def spawn_obstacle(self):
         """Spawn a new obstacle from the right side"""
@@ -164,21 +158,16 @@ class GestureGameEngine:
         self.obstacle_id_counter += 1
         self.obstacles.append(obstacle)
         
-        logger.info(f"🌩️ Spawned {obstacle.type} at x={obstacle.x}, y={y}")
+        game_metrics.count("obstacles_spawned")
+        if self.trace:
+            self.trace.event("spawn", obstacle.id, obstacle.type, obstacle.x, y)
     
     def check_collision(self, obj1_bounds: Tuple, obj2_bounds: Tuple) -> bool:
         """Check if two rectangular objects collide"""
         x1_1, y1_1, x2_1, y2_1 = obj1_bounds
         x1_2, y1_2, x2_2, y2_2 = obj2_bounds
         
-        collided = not (x2_1 < x1_2 or x2_2 < x1_1 or y2_1 < y1_2 or y2_2 < y1_1)
-        
-        if collided:
-            logger.info(f"💥 COLLISION DETECTED:")
-            logger.info(f"   Airplane: ({x1_1:.1f}, {y1_1:.1f}) to ({x2_1:.1f}, {y2_1:.1f})")
-            logger.info(f"   Obstacle: ({x1_2:.1f}, {y1_2:.1f}) to ({x2_2:.1f}, {y2_2:.1f})")
-        
-        return collided
+        return not (x2_1 < x1_2 or x2_2 < x1_1 or y2_1 < y1_2 or y2_2 < y1_1)
     
     def update(self):
         """Update game state (called every frame ~30 FPS)"""
@@ -209,22 +198,26 @@ class GestureGameEngine:
             
             if self.check_collision(airplane_collision_bounds, obstacle.get_bounds()):
                 self.game_over = True
-                logger.warning(f"💥 COLLISION with {obstacle.type}!")
-                logger.warning(f"   Airplane bounds: {airplane_bounds}")
-                logger.warning(f"   Obstacle bounds: {obstacle.get_bounds()}")
-                logger.warning(f"   Final Score: {self.score}")
+                game_metrics.game_over(self, obstacle.type)
                 return
             
             # Remove obstacles that went off screen and award points
             if obstacle.is_off_screen():
                 self.obstacles.remove(obstacle)
-                self.score += 10
-                
-                # Increase difficulty every 100 points
-                if self.score % 100 == 0 and self.score > 0:
-                    self.game_speed = min(2.0, self.game_speed + 0.1)
-                    self.obstacle_spawn_interval = max(1.0, self.obstacle_spawn_interval - 0.1)
-                    logger.info(f"🚀 Difficulty increased! Speed: {self.game_speed:.1f}x")
+                self._obstacle_cleared()
+    
+    def _obstacle_cleared(self):
+        """Award points for an obstacle that left the screen"""
+        self.score += 10
+        game_metrics.count("obstacles_cleared")
+        
+        # Increase difficulty every 100 points
+        if self.score % 100 == 0 and self.score > 0:
+            self.game_speed = min(2.0, self.game_speed + 0.1)
+            self.obstacle_spawn_interval = max(1.0, self.obstacle_spawn_interval - 0.1)
+            game_metrics.count("difficulty_increases")
+            if self.trace:
+                self.trace.event("difficulty", self.score, self.game_speed)
     
     def get_game_state(self) -> Dict:
         """Return current game state for frontend"""
@@ -236,6 +229,18 @@ class GestureGameEngine:
             "gameStarted": self.game_started,
             "gameSpeed": round(self.game_speed, 1)
         }
+    
+    def obstacle_count(self) -> int:
+        return len(self.obstacles)
+    
+    def obstacle_rows(self) -> List[Tuple]:
+        """(id, x, y, width, height, speed, type) per obstacle, without asdict"""
+        return [(o.id, o.x, o.y, o.width, o.height, o.speed, o.type) for o in self.obstacles]
+
+
+class VectorizedGestureEngine(VectorizedObstacles, GestureGameEngine):
+    """Gesture game with obstacles in the shared ObstacleField"""
+    collision_padding = 15
 
 
 # Game session manager
@@ -245,12 +250,17 @@ active_gesture_games: Dict[str, GestureGameEngine] = {}
 def get_gesture_game(session_id: str) -> GestureGameEngine:
     """Get or create a gesture game session"""
     if session_id not in active_gesture_games:
-        active_gesture_games[session_id] = GestureGameEngine()
+        engine = VectorizedGestureEngine if GAME_ENGINE == "vector" else GestureGameEngine
+        game = active_gesture_games[session_id] = engine()
+        game.trace = game_metrics.traces.get(session_id)
     return active_gesture_games[session_id]
 
 
 def delete_gesture_game(session_id: str):
     """Remove a gesture game session"""
     if session_id in active_gesture_games:
-        del active_gesture_games[session_id]
-        logger.info(f"🗑️ Gesture game session {session_id} deleted")
\ No newline at end of file
+        game = active_gesture_games.pop(session_id)
+        if isinstance(game, VectorizedObstacles):
+            game.release()
+        logger.info(f"🗑️ Gesture game session {session_id} deleted")
+    game_metrics.stop_trace(session_id)
\ No newline at end of file
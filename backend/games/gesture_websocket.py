@@ -8,39 +8,55 @@ NO OpenCV. NO MediaPipe. NO frame processing.
 Backend is now fully deployable on Render free tier.
 """
 
-import asyncio
 import json
 import logging
 
 from fastapi import WebSocket, WebSocketDisconnect
+from src.json_codec import send_json
 from games.gesture_game import get_gesture_game, delete_gesture_game
+from games.frame_codec import negotiate, pack_game_state, pack_msgpack
+from games.state_delta import DeltaEncoder
+from games.tick_scheduler import TickedSession, gesture_ticker
 
 logger = logging.getLogger(__name__)
 
 
+class GestureSession(TickedSession):
+    """One connected player; ticked by the shared gesture_ticker"""
+
+    __slots__ = ("websocket", "last_gesture", "delta", "encoding")
+
+    def __init__(self, session_id: str, game, websocket: WebSocket):
+        super().__init__(session_id, game)
+        self.websocket = websocket
+        self.last_gesture = "none"
+        self.delta = None  # DeltaEncoder when the client asked for delta frames
+        self.encoding = "json"
+
+    async def send_state(self):
+        if self.encoding == "struct":
+            await self.websocket.send_bytes(pack_game_state(self.game, self.last_gesture))
+            return
+        if self.delta is not None:
+            frame = self.delta.encode(self.game, self.last_gesture)
+        else:
+            frame = {
+                "type":    "game_state",
+                "state":   self.game.get_game_state(),
+                "gesture": self.last_gesture,
+            }
+        if self.encoding == "msgpack":
+            await self.websocket.send_bytes(pack_msgpack(frame))
+        else:
+            await send_json(self.websocket, frame)
+
+
 async def handle_gesture_game_websocket(websocket: WebSocket, session_id: str):
     await websocket.accept()
     logger.info("Gesture WS connected: {}".format(session_id))
 
-    game           = get_gesture_game(session_id)
-    last_gesture   = "none"
-    game_loop_task = None
-
-    async def game_update_loop():
-        nonlocal last_gesture
-        while True:
-            try:
-                if game.game_started and not game.game_over:
-                    game.update()
-                    await websocket.send_json({
-                        "type":    "game_state",
-                        "state":   game.get_game_state(),
-                        "gesture": last_gesture,
-                    })
-                await asyncio.sleep(0.033)   # ~30 fps
-            except Exception as e:
-                logger.error("Game loop error: {}".format(e))
-                break
+    game    = get_gesture_game(session_id)
+    session = GestureSession(session_id, game, websocket)
 
     try:
         while True:
@@ -51,13 +67,17 @@ async def handle_gesture_game_websocket(websocket: WebSocket, session_id: str):
             # ── start game ────────────────────────────────────────────────
             if mtype == "start":
                 game.start_game()
-                await websocket.send_json({
-                    "type":  "game_started",
-                    "state": game.get_game_state(),
+                session.encoding = negotiate(message.get("encoding", "json"))
+                # The struct layout only carries full frames
+                wants_delta = message.get("delta") and session.encoding != "struct"
+                session.delta = DeltaEncoder() if wants_delta else None
+                await send_json(websocket, {
+                    "type":     "game_started",
+                    "state":    game.get_game_state(),
+                    "encoding": session.encoding,
+                    "delta":    session.delta is not None,
                 })
-                if game_loop_task:
-                    game_loop_task.cancel()
-                game_loop_task = asyncio.create_task(game_update_loop())
+                gesture_ticker.add(session)
                 logger.info("Game started for session: {}".format(session_id))
 
             # ── gesture from browser (only thing sent now) ─────────────
@@ -66,30 +86,33 @@ async def handle_gesture_game_websocket(websocket: WebSocket, session_id: str):
                 if direction in ("up", "down", "left", "right"):
                     if game.game_started and not game.game_over:
                         game.process_gesture_command(direction)
-                        last_gesture = direction
-                        logger.info("Gesture: {}".format(direction))
+                        session.last_gesture = direction
 
             # ── restart ───────────────────────────────────────────────────
             elif mtype == "restart":
                 game.start_game()
-                last_gesture = "none"
-                await websocket.send_json({
+                session.last_gesture = "none"
+                if session.delta is not None:
+                    session.delta.reset()
+                await send_json(websocket, {
                     "type":  "game_restarted",
                     "state": game.get_game_state(),
                 })
-                if game_loop_task:
-                    game_loop_task.cancel()
-                game_loop_task = asyncio.create_task(game_update_loop())
+                gesture_ticker.add(session)
+
+            # ── delta client lost track: send a keyframe next ─────────────
+            elif mtype == "resync":
+                if session.delta is not None:
+                    session.delta.reset()
 
             else:
-                logger.debug("Unknown message type: {}".format(mtype))
+                logger.debug("Unknown message type: %s", mtype)
 
     except WebSocketDisconnect:
         logger.info("WS disconnected: {}".format(session_id))
     except Exception as e:
         logger.error("WS error: {}".format(e))
     finally:
-        if game_loop_task:
-            game_loop_task.cancel()
+        gesture_ticker.remove(session_id)
         delete_gesture_game(session_id)
         logger.info("Session cleaned up: {}".format(session_id))
\ No newline at end of file
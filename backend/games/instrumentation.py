@@ -0,0 +1,132 @@
+"""
+Game event counters, histograms and per-session traces
+
+The game hot paths (gestures, spawns, collisions) used to log every
+event with an f-string, at 30 frames per second per session. They now
+bump counters and, for per-frame values, feed histograms on one tick
+in GAME_METRICS_SAMPLE_TICKS. All of it is exposed under /metrics.
+
+For debugging a single session, tracing can be switched on at runtime
+(/games/trace/{session_id}, for the emails in GAME_TRACE_ADMINS). The
+engines check `self.trace` before recording anything, and a trace keeps
+raw argument tuples in a ring buffer: nothing is formatted unless the
+trace is read or the log line is actually emitted. At most
+GAME_TRACE_MAX_SESSIONS traces exist at once; a session's trace is
+dropped when the session is deleted.
+"""
+
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+GAME_METRICS_SAMPLE_TICKS = max(1, int(os.getenv("GAME_METRICS_SAMPLE_TICKS", "30")))
+GAME_TRACE_MAX_EVENTS = int(os.getenv("GAME_TRACE_MAX_EVENTS", "2000"))
+GAME_TRACE_MAX_SESSIONS = int(os.getenv("GAME_TRACE_MAX_SESSIONS", "20"))
+GAME_TRACE_ADMINS = {
+    email.strip().lower() for email in os.getenv("GAME_TRACE_ADMINS", "").split(",") if email.strip()
+}
+
+
+class TooManyTraces(Exception):
+    """GAME_TRACE_MAX_SESSIONS sessions are already being traced"""
+
+
+class Histogram:
+    """Counts per upper bound, plus an overflow bucket"""
+
+    __slots__ = ("bounds", "buckets", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def stats(self) -> dict:
+        histogram = {f"<={bound}": count for bound, count in zip(self.bounds, self.buckets)}
+        histogram[f">{self.bounds[-1]}"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "histogram": histogram
+        }
+
+
+class GameTrace:
+    """Recent events of one session; formatted only when read"""
+
+    __slots__ = ("session_id", "events")
+
+    def __init__(self, session_id: str, max_events: int = GAME_TRACE_MAX_EVENTS):
+        self.session_id = session_id
+        self.events = deque(maxlen=max_events)
+
+    def event(self, name: str, *args):
+        self.events.append((time.time(), name, args))
+        logger.info("🔎 [%s] %s %s", self.session_id, name, args)
+
+    def dump(self) -> list:
+        return [{"at": at, "event": name, "args": list(args)} for at, name, args in self.events]
+
+
+class GameMetrics:
+    def __init__(self, max_traces: int = GAME_TRACE_MAX_SESSIONS):
+        self.max_traces = max_traces
+        self.counters: Dict[str, int] = {}
+        self.histograms = {
+            "final_score": Histogram((0, 50, 100, 200, 500, 1000, 2000)),
+            "tick_ms": Histogram((1, 2, 5, 10, 20, 33, 50, 100)),
+            "obstacles_on_screen": Histogram((0, 2, 4, 8, 16, 32, 64)),
+        }
+        self.traces: Dict[str, GameTrace] = {}
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float):
+        self.histograms[name].observe(value)
+
+    def game_over(self, game, cause: str):
+        self.count("games_over")
+        self.histograms["final_score"].observe(game.score)
+        if game.trace:
+            game.trace.event("game_over", cause, game.score, game.airplane.get_bounds())
+
+    # ----- runtime tracing -----
+
+    def start_trace(self, session_id: str) -> GameTrace:
+        trace = self.traces.get(session_id)
+        if trace is None:
+            if len(self.traces) >= self.max_traces:
+                raise TooManyTraces(f"{len(self.traces)} sessions already traced")
+            trace = self.traces[session_id] = GameTrace(session_id)
+            logger.info(f"🔎 Tracing game session {session_id}")
+        return trace
+
+    def stop_trace(self, session_id: str) -> Optional[GameTrace]:
+        return self.traces.pop(session_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "histograms": {name: h.stats() for name, h in self.histograms.items()},
+            "sample_ticks": GAME_METRICS_SAMPLE_TICKS,
+            "traced_sessions": len(self.traces)
+        }
+
+
+game_metrics = GameMetrics()
@@ -0,0 +1,321 @@
+"""
+Struct-of-arrays obstacle storage, stepped for many games at once
+
+The object engines keep a list of Obstacle dataclasses per game and walk
+it every frame: copy the list, build bounds tuples, list.remove() what
+left the screen. Here the obstacles of every game live in one set of
+NumPy columns (x, y, width, height, speed, type, id, owning game), and
+step_games() advances a whole batch of games with one vectorized pass
+each for movement, AABB collision and culling. Only games where
+something happened (a collision, an obstacle scored) are touched from
+Python afterwards.
+
+GAME_ENGINE=vector makes get_game()/get_gesture_game() hand out the
+vectorized engines; the default "object" keeps the dataclass engines.
+"""
+
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from games.instrumentation import game_metrics
+
+GAME_ENGINE = os.getenv("GAME_ENGINE", "object").lower()
+
+_INITIAL_ROWS = 256
+_INITIAL_SLOTS = 64
+
+# Bounds that intersect nothing: rows of games outside the batch point here
+_NO_PLANE = (np.inf, np.inf, -np.inf, -np.inf)
+
+
+class ObstacleField:
+    """Obstacles of many games as parallel arrays; each game owns a slot"""
+
+    def __init__(self, rows: int = _INITIAL_ROWS, slots: int = _INITIAL_SLOTS):
+        self.count = 0
+        self.x = np.zeros(rows, dtype=np.float64)
+        self.speed = np.zeros(rows, dtype=np.float64)
+        self.y = np.zeros(rows, dtype=np.int32)
+        self.width = np.zeros(rows, dtype=np.int32)
+        self.height = np.zeros(rows, dtype=np.int32)
+        self.type_id = np.zeros(rows, dtype=np.int16)
+        self.obstacle_id = np.zeros(rows, dtype=np.int64)
+        self.slot = np.zeros(rows, dtype=np.int32)
+
+        self.type_names: List[str] = []
+        self._type_ids: Dict[str, int] = {}
+
+        self._slots = slots
+        self._free_slots = list(range(slots - 1, -1, -1))
+        # slot -> position in the batch being stepped (-1: not in the batch)
+        self._batch_pos = np.full(slots, -1, dtype=np.int64)
+
+        # Rows grouped by slot, rebuilt lazily after any change
+        self._order: Optional[np.ndarray] = None
+        self._starts: Optional[np.ndarray] = None
+        self._ends: Optional[np.ndarray] = None
+
+    _COLUMNS = ("x", "speed", "y", "width", "height", "type_id", "obstacle_id", "slot")
+
+    # ----- slots -----
+
+    def attach(self) -> int:
+        if not self._free_slots:
+            grown = self._slots * 2
+            self._free_slots = list(range(grown - 1, self._slots - 1, -1))
+            self._batch_pos = np.concatenate(
+                [self._batch_pos, np.full(grown - self._slots, -1, dtype=np.int64)]
+            )
+            self._slots = grown
+            self._order = None  # the per-slot row index is sized for the old count
+        return self._free_slots.pop()
+
+    def detach(self, slot: int):
+        self.clear(slot)
+        self._free_slots.append(slot)
+
+    def clear(self, slot: int):
+        """Drop every obstacle of one game"""
+        self._compact(self.slot[:self.count] != slot)
+
+    # ----- rows -----
+
+    def spawn(self, slot: int, x: float, y: int, width: int, height: int,
+              speed: float, type_name: str, obstacle_id: int = 0):
+        if self.count == len(self.x):
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
+        type_id = self._type_ids.get(type_name)
+        if type_id is None:
+            type_id = self._type_ids[type_name] = len(self.type_names)
+            self.type_names.append(type_name)
+
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.width[i] = width
+        self.height[i] = height
+        self.speed[i] = speed
+        self.type_id[i] = type_id
+        self.obstacle_id[i] = obstacle_id
+        self.slot[i] = slot
+        self.count += 1
+        self._order = None
+
+    def _compact(self, keep: np.ndarray):
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:self.count][keep]
+        self.count = kept
+        self._order = None
+
+    def rows(self, slot: int) -> np.ndarray:
+        """Row indices of one game's obstacles, in spawn order"""
+        if self._order is None:
+            slots = self.slot[:self.count]
+            self._order = np.argsort(slots, kind="stable")
+            ordered = slots[self._order]
+            every = np.arange(self._slots)
+            self._starts = np.searchsorted(ordered, every, side="left")
+            self._ends = np.searchsorted(ordered, every, side="right")
+        return self._order[self._starts[slot]:self._ends[slot]]
+
+    def obstacle_dicts(self, slot: int, type_key: str, id_key: Optional[str]) -> List[dict]:
+        """One game's obstacles in the same shape as asdict(Obstacle)"""
+        rows = self.rows(slot)
+        if not len(rows):
+            return []
+        names = self.type_names
+        columns = [
+            self.x[rows].tolist(),
+            self.y[rows].tolist(),
+            self.width[rows].tolist(),
+            self.height[rows].tolist(),
+            self.speed[rows].tolist(),
+            [names[t] for t in self.type_id[rows].tolist()],
+        ]
+        keys = ["x", "y", "width", "height", "speed", type_key]
+        if id_key is not None:
+            columns.append(self.obstacle_id[rows].tolist())
+            keys.append(id_key)
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+
+    def obstacle_rows(self, slot: int) -> List[tuple]:
+        """One game's obstacles as (id, x, y, width, height, speed, type) tuples"""
+        rows = self.rows(slot)
+        if not len(rows):
+            return []
+        names = self.type_names
+        return list(zip(
+            self.obstacle_id[rows].tolist(),
+            self.x[rows].tolist(),
+            self.y[rows].tolist(),
+            self.width[rows].tolist(),
+            self.height[rows].tolist(),
+            self.speed[rows].tolist(),
+            [names[t] for t in self.type_id[rows].tolist()]
+        ))
+
+    # ----- stepping -----
+
+    def step_games(self, games: Sequence["VectorizedObstacles"]):
+        """Advance a batch of running (started, not over) games by one frame"""
+        if not games:
+            return
+        now = time.time()
+        for game in games:
+            game._spawn_due(now)
+
+        n = self.count
+        batch = len(games)
+        slots = np.fromiter((g.slot for g in games), dtype=np.int64, count=batch)
+        planes = np.array([g._collision_bounds() for g in games] + [_NO_PLANE], dtype=np.float64)
+
+        pos = self._batch_pos
+        pos[slots] = np.arange(batch)
+        row_pos = pos[self.slot[:n]]
+        pos[slots] = -1
+        in_batch = row_pos >= 0
+
+        # Movement
+        x = self.x[:n]
+        moved = x - self.speed[:n]
+
+        # AABB against the owning game's (padded) airplane; rows of other
+        # games look up the sentinel plane and never hit
+        plane = planes[row_pos]
+        x2 = moved + self.width[:n]
+        y = self.y[:n]
+        y2 = y + self.height[:n]
+        hit = ~((plane[:, 2] < moved) | (x2 < plane[:, 0]) | (plane[:, 3] < y) | (y2 < plane[:, 1]))
+        hit &= in_batch
+
+        collided = np.zeros(batch + 1, dtype=bool)
+        collided[row_pos[hit]] = True
+        crashed = np.flatnonzero(collided[:batch]).tolist()
+
+        update = in_batch
+        if crashed:
+            # The object engines stop at the first obstacle that hits: the
+            # ones after it neither move nor score on the final frame
+            update = in_batch.copy()
+            for k, i in enumerate(crashed):
+                rows = np.flatnonzero(row_pos == i)
+                first = rows[np.argmax(hit[rows])]
+                update[rows[rows > first]] = False
+                crashed[k] = (i, self.type_names[self.type_id[first]])
+        np.copyto(x, moved, where=update)
+
+        # Culling
+        off = (x2 < 0) & update
+        cleared = np.bincount(row_pos[off], minlength=batch)
+        if off.any():
+            self._compact(~off)
+
+        for i in np.flatnonzero(cleared).tolist():
+            game = games[i]
+            for _ in range(int(cleared[i])):
+                game._obstacle_cleared()
+        for i, type_name in crashed:
+            games[i]._crashed(type_name)
+
+    def stats(self) -> dict:
+        return {
+            "obstacles": self.count,
+            "capacity": len(self.x),
+            "games": self._slots - len(self._free_slots)
+        }
+
+
+obstacle_field = ObstacleField()
+
+
+class VectorizedObstacles:
+    """
+    Engine mixin: obstacles live in an ObstacleField instead of a list
+
+    Combined with an engine class, which keeps its spawn rules, scoring
+    and state shape; self.obstacles is only a staging list for spawns.
+    """
+
+    collision_padding = 0
+    type_key = "type"
+    id_key: Optional[str] = "id"
+
+    def __init__(self, *args, field: Optional[ObstacleField] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field = field or obstacle_field
+        self.slot = self.field.attach()
+
+    def release(self):
+        """Give the slot back; call when the session ends"""
+        self.field.detach(self.slot)
+
+    def start_game(self):
+        super().start_game()
+        self.field.clear(self.slot)
+
+    def spawn_obstacle(self):
+        super().spawn_obstacle()
+        for obstacle in self.obstacles:
+            self.field.spawn(
+                self.slot,
+                obstacle.x,
+                obstacle.y,
+                obstacle.width,
+                obstacle.height,
+                obstacle.speed,
+                getattr(obstacle, self.type_key),
+                getattr(obstacle, self.id_key) if self.id_key else 0
+            )
+        self.obstacles.clear()
+
+    def _spawn_due(self, now: float):
+        if now - self.last_obstacle_time >= self.obstacle_spawn_interval:
+            self.spawn_obstacle()
+            self.last_obstacle_time = now
+
+    def _collision_bounds(self):
+        pad = self.collision_padding
+        x1, y1, x2, y2 = self.airplane.get_bounds()
+        return (x1 + pad, y1 + pad, x2 - pad, y2 - pad)
+
+    def _crashed(self, type_name: str):
+        self.game_over = True
+        game_metrics.game_over(self, type_name)
+
+    def update(self):
+        """Single-game step; the tick scheduler batches these instead"""
+        if not self.game_started or self.game_over:
+            return
+        self.field.step_games([self])
+
+    def obstacle_count(self) -> int:
+        return len(self.field.rows(self.slot))
+
+    def obstacle_rows(self) -> List[tuple]:
+        return self.field.obstacle_rows(self.slot)
+
+    def get_game_state(self) -> dict:
+        state = super().get_game_state()
+        state["obstacles"] = self.field.obstacle_dicts(self.slot, self.type_key, self.id_key)
+        return state
+
+
+def step_games(games: Sequence):
+    """update() every game, batching the vectorized ones per field"""
+    batches: Dict[int, tuple] = {}
+    for game in games:
+        if isinstance(game, VectorizedObstacles):
+            batches.setdefault(id(game.field), (game.field, []))[1].append(game)
+        else:
+            game.update()
+    for field, batch in batches.values():
+        field.step_games(batch)
@@ -0,0 +1,114 @@
+"""
+Delta-encoded gesture game frames
+
+A full game_state frame repeats every obstacle's width, height, speed,
+type and id 30 times a second although none of them change after the
+spawn. With delta frames (opt-in: {"type": "start", "delta": true}) a
+session instead receives:
+
+    {"type": "game_state", "seq": 0, "keyframe": true, "state": {...}, "gesture": ...}
+        a full frame, same shape as before; sent first, every
+        GAME_KEYFRAME_INTERVAL frames, and after {"type": "resync"}
+
+    {"type": "game_delta", "seq": 1,
+     "spawn":   [{"x", "y", "width", "height", "speed", "type", "id"}, ...],
+     "despawn": [id, ...],
+     "moves":   [[id, x], ...]           ([id, x, y] if y changed too)
+     "airplane": {"x", "y"}, "score", "gameOver", "gameSpeed", "gesture"}
+        relative to the previous frame; every key except type/seq is
+        omitted when nothing changed
+
+Positions in moves are rounded to 0.01 px; keyframes carry exact values.
+Deltas are always relative to the last frame actually sent, so frames
+the scheduler coalesced for a slow client don't break the chain.
+"""
+
+import os
+from typing import Dict, Tuple
+
+GAME_KEYFRAME_INTERVAL = int(os.getenv("GAME_KEYFRAME_INTERVAL", "30"))
+
+OBSTACLE_KEYS = ("id", "x", "y", "width", "height", "speed", "type")
+
+
+class DeltaEncoder:
+    """Per-session state of what the client has already been sent"""
+
+    __slots__ = ("keyframe_interval", "seq", "_since_keyframe", "_obstacles",
+                 "_airplane", "_score", "_game_over", "_game_speed", "_gesture")
+
+    def __init__(self, keyframe_interval: int = GAME_KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.seq = 0
+        self.reset()
+
+    def reset(self):
+        """Make the next frame a keyframe"""
+        self._since_keyframe = None
+        self._obstacles: Dict[int, Tuple[float, float]] = {}
+
+    def encode(self, game, gesture: str) -> dict:
+        if self._since_keyframe is None or self._since_keyframe >= self.keyframe_interval:
+            return self._keyframe(game, gesture)
+
+        self._since_keyframe += 1
+        frame = {"type": "game_delta", "seq": self._next_seq()}
+
+        sent = self._obstacles
+        current = {}
+        spawn = []
+        moves = []
+        for row in game.obstacle_rows():
+            oid, x, y = row[0], row[1], row[2]
+            current[oid] = (x, y)
+            last = sent.get(oid)
+            if last is None:
+                spawn.append(dict(zip(OBSTACLE_KEYS, row)))
+            elif last[1] != y:
+                moves.append([oid, round(x, 2), y])
+            elif last[0] != x:
+                moves.append([oid, round(x, 2)])
+        if spawn:
+            frame["spawn"] = spawn
+        if len(current) - len(spawn) < len(sent):
+            frame["despawn"] = [oid for oid in sent if oid not in current]
+        if moves:
+            frame["moves"] = moves
+        self._obstacles = current
+
+        airplane = (game.airplane.x, game.airplane.y)
+        if airplane != self._airplane:
+            frame["airplane"] = {"x": airplane[0], "y": airplane[1]}
+            self._airplane = airplane
+        if game.score != self._score:
+            frame["score"] = self._score = game.score
+        if game.game_over != self._game_over:
+            frame["gameOver"] = self._game_over = game.game_over
+        game_speed = round(game.game_speed, 1)
+        if game_speed != self._game_speed:
+            frame["gameSpeed"] = self._game_speed = game_speed
+        if gesture != self._gesture:
+            frame["gesture"] = self._gesture = gesture
+        return frame
+
+    def _keyframe(self, game, gesture: str) -> dict:
+        state = game.get_game_state()
+        self._since_keyframe = 0
+        self._obstacles = {row[0]: (row[1], row[2]) for row in game.obstacle_rows()}
+        self._airplane = (game.airplane.x, game.airplane.y)
+        self._score = game.score
+        self._game_over = game.game_over
+        self._game_speed = state["gameSpeed"]
+        self._gesture = gesture
+        return {
+            "type": "game_state",
+            "seq": self._next_seq(),
+            "keyframe": True,
+            "state": state,
+            "gesture": gesture
+        }
+
+    def _next_seq(self) -> int:
+        seq = self.seq
+        self.seq += 1
+        return seq
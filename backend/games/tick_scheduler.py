@@ -0,0 +1,151 @@
+"""
+Fixed-timestep scheduler shared by every gesture game session
+
+Instead of one asyncio task and one sleep timer per WebSocket, a single
+loop ticks all registered sessions once per frame. The frame clock is
+anchored to time.monotonic(), so sleep overshoot and the time spent in
+the tick itself don't accumulate; when the loop falls more than a frame
+behind it skips the missed frames instead of bursting to catch up.
+
+State sends are fanned out as one delivery task per session and are
+coalesced: a slow client that is still receiving the previous frame
+gets the latest state when its send completes, never a backlog, and
+never stalls the tick for everyone else.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from games.instrumentation import GAME_METRICS_SAMPLE_TICKS, game_metrics
+from games.obstacle_field import step_games
+
+logger = logging.getLogger(__name__)
+
+GAME_TICK_RATE = float(os.getenv("GAME_TICK_RATE", "30"))
+
+
+class TickedSession:
+    """What the scheduler needs from a session: a game and a way to send its state"""
+
+    __slots__ = ("session_id", "game", "dirty", "delivery")
+
+    def __init__(self, session_id: str, game):
+        self.session_id = session_id
+        self.game = game
+        self.dirty = False
+        self.delivery: Optional[asyncio.Task] = None
+
+    async def send_state(self):
+        raise NotImplementedError
+
+
+class TickScheduler:
+    def __init__(self, rate: float = GAME_TICK_RATE):
+        self.interval = 1.0 / rate
+        self._sessions: Dict[str, TickedSession] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.coalesced_frames = 0
+        self.send_errors = 0
+        self.tick_seconds = 0.0
+        self.max_tick_seconds = 0.0
+
+    def add(self, session: TickedSession):
+        """Tick this session from the next frame on (replaces one with the same id)"""
+        self._sessions[session.session_id] = session
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def remove(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is not None and session.delivery is not None:
+            session.delivery.cancel()
+
+    async def stop(self):
+        for session_id in list(self._sessions):
+            self.remove(session_id)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # ----- frame loop -----
+
+    async def _run(self):
+        next_tick = time.monotonic()
+        while self._sessions:
+            started = time.monotonic()
+            self.tick()
+            elapsed = time.monotonic() - started
+            self.tick_seconds += elapsed
+            self.max_tick_seconds = max(self.max_tick_seconds, elapsed)
+            game_metrics.observe("tick_ms", elapsed * 1000)
+
+            next_tick += self.interval
+            now = time.monotonic()
+            if now > next_tick:
+                # Over budget: drop the frames we can't make instead of
+                # running them back to back
+                missed = int((now - next_tick) / self.interval) + 1
+                self.skipped_ticks += missed
+                next_tick += missed * self.interval
+            await asyncio.sleep(next_tick - now)
+
+    def tick(self):
+        """Advance every running game one step and schedule its state send"""
+        self.ticks += 1
+        playing = [
+            session for session in self._sessions.values()
+            if session.game.game_started and not session.game.game_over
+        ]
+        # Vectorized engines are stepped together, one pass per field
+        step_games([session.game for session in playing])
+        if self.ticks % GAME_METRICS_SAMPLE_TICKS == 0:
+            for session in playing:
+                game_metrics.observe("obstacles_on_screen", session.game.obstacle_count())
+        for session in playing:
+            if session.delivery is None:
+                session.delivery = asyncio.create_task(self._deliver(session))
+            else:
+                # Previous frame still in flight; it will pick up this state
+                self.coalesced_frames += 1
+            session.dirty = True
+
+    async def _deliver(self, session: TickedSession):
+        try:
+            while session.dirty:
+                session.dirty = False
+                await session.send_state()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.send_errors += 1
+            logger.error(f"❌ Game state send failed for {session.session_id}: {e}")
+            if self._sessions.get(session.session_id) is session:
+                del self._sessions[session.session_id]
+        finally:
+            session.delivery = None
+
+    def stats(self) -> dict:
+        playing = sum(
+            1 for s in self._sessions.values() if s.game.game_started and not s.game.game_over
+        )
+        return {
+            "tick_rate": round(1.0 / self.interval, 1),
+            "sessions": len(self._sessions),
+            "playing": playing,
+            "ticks": self.ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "coalesced_frames": self.coalesced_frames,
+            "send_errors": self.send_errors,
+            "avg_tick_ms": round(self.tick_seconds / self.ticks * 1000, 3) if self.ticks else 0.0,
+            "max_tick_ms": round(self.max_tick_seconds * 1000, 3)
+        }
+
+
+gesture_ticker = TickScheduler()
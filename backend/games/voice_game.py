@@ -11,6 +11,9 @@ from dataclasses import dataclass, asdict
 from datetime import datetime
 import logging
 
+from games.instrumentation import game_metrics
+from games.obstacle_field import GAME_ENGINE, VectorizedObstacles
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +80,7 @@ class VoiceGameEngine:
         self.last_obstacle_time = time.time()
         self.obstacle_spawn_interval = 1.5  # Seconds between obstacles
         self.game_speed = 1.0  # Speed multiplier (increases with score)
+        self.trace = None  # GameTrace while this session is traced
         
     def start_game(self):
         """Initialize/restart the game"""
@@ -87,7 +91,9 @@ class VoiceGameEngine:
         self.game_started = True
         self.last_obstacle_time = time.time()
         self.game_speed = 1.0
-        logger.info("🎮 Game started!")
+        game_metrics.count("games_started")
+        if self.trace:
+            self.trace.event("start")
     
     def process_voice_command(self, command: str):
         """Process voice command and move airplane"""
@@ -98,22 +104,25 @@ class VoiceGameEngine:
         
         if command in ["up", "move up", "go up"]:
             self.airplane.move_up(self.canvas_height)
-            logger.info(f"✈️ Airplane moved UP to y={self.airplane.y}")
         
         elif command in ["down", "move down", "go down"]:
             self.airplane.move_down(self.canvas_height)
-            logger.info(f"✈️ Airplane moved DOWN to y={self.airplane.y}")
         
         elif command in ["left", "move left", "go left"]:
             self.airplane.move_left(self.canvas_width)
-            logger.info(f"✈️ Airplane moved LEFT to x={self.airplane.x}")
         
         elif command in ["right", "move right", "go right"]:
             self.airplane.move_right(self.canvas_width)
-            logger.info(f"✈️ Airplane moved RIGHT to x={self.airplane.x}")
         
         else:
-            logger.warning(f"❌ Unknown command: {command}")
+            game_metrics.count("unknown_commands")
+            if self.trace:
+                self.trace.event("unknown_command", command)
+            return
+        
+        game_metrics.count("voice_commands")
+        if self.trace:
+            self.trace.event("move", command, self.airplane.x, self.airplane.y)
     
     def spawn_obstacle(self):
         """Spawn a new obstacle from the right side"""
@@ -131,7 +140,9 @@ class VoiceGameEngine:
         )
         
         self.obstacles.append(obstacle)
-        logger.info(f"🌩️ Spawned {obstacle_type} at y={y}")
+        game_metrics.count("obstacles_spawned")
+        if self.trace:
+            self.trace.event("spawn", obstacle_type, obstacle.x, y)
     
     def check_collision(self, obj1_bounds: Tuple, obj2_bounds: Tuple) -> bool:
         """Check if two rectangular objects collide"""
@@ -160,19 +171,26 @@ class VoiceGameEngine:
             # Check collision
             if self.check_collision(airplane_bounds, obstacle.get_bounds()):
                 self.game_over = True
-                logger.warning(f"💥 COLLISION! Game Over. Final Score: {self.score}")
+                game_metrics.game_over(self, obstacle.obstacle_type)
                 return
             
             # Remove off-screen obstacles and increment score
             if obstacle.is_off_screen():
                 self.obstacles.remove(obstacle)
-                self.score += 10
-                
-                # Increase difficulty every 100 points
-                if self.score % 100 == 0:
-                    self.game_speed += 0.1
-                    self.obstacle_spawn_interval = max(0.8, self.obstacle_spawn_interval - 0.1)
-                    logger.info(f"🚀 Difficulty increased! Speed: {self.game_speed:.1f}x")
+                self._obstacle_cleared()
+    
+    def _obstacle_cleared(self):
+        """Award points for an obstacle that left the screen"""
+        self.score += 10
+        game_metrics.count("obstacles_cleared")
+        
+        # Increase difficulty every 100 points
+        if self.score % 100 == 0:
+            self.game_speed += 0.1
+            self.obstacle_spawn_interval = max(0.8, self.obstacle_spawn_interval - 0.1)
+            game_metrics.count("difficulty_increases")
+            if self.trace:
+                self.trace.event("difficulty", self.score, self.game_speed)
     
     def get_game_state(self) -> Dict:
         """Return current game state for frontend"""
@@ -186,6 +204,15 @@ class VoiceGameEngine:
             "canvas_height": self.canvas_height,
             "game_speed": round(self.game_speed, 1)
         }
+    
+    def obstacle_count(self) -> int:
+        return len(self.obstacles)
+
+
+class VectorizedVoiceEngine(VectorizedObstacles, VoiceGameEngine):
+    """Voice game with obstacles in the shared ObstacleField"""
+    type_key = "obstacle_type"
+    id_key = None
 
 
 # Game session manager (in-memory, can be replaced with Redis for production)
@@ -195,12 +222,17 @@ active_games: Dict[str, VoiceGameEngine] = {}
 def get_game(session_id: str) -> VoiceGameEngine:
     """Get or create a game session"""
     if session_id not in active_games:
-        active_games[session_id] = VoiceGameEngine()
+        engine = VectorizedVoiceEngine if GAME_ENGINE == "vector" else VoiceGameEngine
+        game = active_games[session_id] = engine()
+        game.trace = game_metrics.traces.get(session_id)
     return active_games[session_id]
 
 
 def delete_game(session_id: str):
     """Remove a game session"""
     if session_id in active_games:
-        del active_games[session_id]
-        logger.info(f"🗑️ Game session {session_id} deleted")
\ No newline at end of file
+        game = active_games.pop(session_id)
+        if isinstance(game, VectorizedObstacles):
+            game.release()
+        logger.info(f"🗑️ Game session {session_id} deleted")
+    game_metrics.stop_trace(session_id)
\ No newline at end of file
@@ -2,8 +2,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from src.models import TokenData, User
+from src.models import CurrentUser, TokenData, User
 from src.database import Database
+from src.cache import TTLCache
+from src.password_hasher import password_hasher
+import time
 import os
 from dotenv import load_dotenv
 
@@ -15,41 +18,34 @@ except ImportError:
     JWTError = Exception
     jwt = None
 
-try:
-    from passlib.context import CryptContext
-except ImportError:
-    CryptContext = None
-
-try:
-    from google.auth.transport import requests
-    from google.oauth2 import id_token
-except ImportError:
-    requests = None
-    id_token = None
+from src.google_tokens import google_token_verifier, GoogleTokenError
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") if CryptContext else None
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password"""
-    if pwd_context is None:
-        raise RuntimeError("passlib is not installed")
-    return pwd_context.verify(plain_password, hashed_password)
+# Fields an authenticated request needs; the password hash never leaves login
+CURRENT_USER_PROJECTION = {
+    "email": 1,
+    "full_name": 1,
+    "google_id": 1,
+    "profile_picture": 1,
+    "is_active": 1,
+    "created_at": 1
+}
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    if pwd_context is None:
-        raise RuntimeError("passlib is not installed")
-    return pwd_context.hash(password)
+# Authenticated-request caches: email -> User, verified JWT -> email (sub)
+user_cache = TTLCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS, name="users")
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_TTL_SECONDS, name="tokens")
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -75,6 +71,35 @@ async def get_user_by_email(email: str) -> Optional[User]:
         return User(**user_dict)
     return None
 
+async def user_exists(email: str) -> bool:
+    users_collection = Database.get_collection("users")
+    return await users_collection.find_one({"email": email}, {"_id": 1}) is not None
+
+async def get_current_user_by_email(email: str) -> Optional[CurrentUser]:
+    """Projected user lookup for authenticated requests"""
+    users_collection = Database.get_collection("users")
+    user_dict = await users_collection.find_one({"email": email}, CURRENT_USER_PROJECTION)
+    
+    if user_dict:
+        return CurrentUser(**user_dict)
+    return None
+
+async def get_cached_user(email: str) -> Optional[CurrentUser]:
+    """get_current_user_by_email through the user cache (misses are not cached)"""
+    user = user_cache.get(email)
+    if user is None:
+        user = await get_current_user_by_email(email)
+        if user is not None:
+            user_cache.set(email, user)
+    return user
+
+def invalidate_user(email: str):
+    """Drop a cached user after its record changed"""
+    user_cache.invalidate(email)
+
+def auth_cache_stats() -> dict:
+    return {"users": user_cache.stats(), "tokens": token_cache.stats()}
+
 async def authenticate_user(email: str, password: str):
     """Authenticate user with email and password"""
     user = await get_user_by_email(email)
@@ -82,7 +107,8 @@ async def authenticate_user(email: str, password: str):
         return False
     if not user.hashed_password:  # Google users don't have passwords
         return False
-    if not verify_password(password, user.hashed_password):
+    # bcrypt runs on the hasher's executor, not the event loop
+    if not await password_hasher.verify(password, user.hashed_password):
         return False
     return user
 
@@ -90,23 +116,16 @@ async def authenticate_user(email: str, password: str):
 
 async def verify_google_token(token: str) -> dict:
     """Verify Google OAuth token and return user info"""
-    if id_token is None or requests is None:
+    if jwt is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Google auth dependencies are not installed"
         )
 
     try:
-        # Verify the token with Google
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            requests.Request(), 
-            GOOGLE_CLIENT_ID
-        )
-        
-        # Verify the issuer
-        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-            raise ValueError('Wrong issuer.')
+        # Signature, audience, issuer and expiry are checked against the
+        # locally cached Google signing keys; no network on this path
+        idinfo = await google_token_verifier.verify(token)
         
         # Return user info
         return {
@@ -115,7 +134,7 @@ async def verify_google_token(token: str) -> dict:
             'picture': idinfo.get('picture', ''),
             'google_id': idinfo['sub']
         }
-    except ValueError as e:
+    except (GoogleTokenError, KeyError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid Google token: {str(e)}"
@@ -145,6 +164,7 @@ async def get_or_create_google_user(google_user_info: dict) -> User:
             )
             user_dict['google_id'] = google_user_info['google_id']
             user_dict['profile_picture'] = google_user_info.get('picture')
+            invalidate_user(google_user_info['email'])
         
         return User(**user_dict)
     
@@ -161,12 +181,13 @@ async def get_or_create_google_user(google_user_info: dict) -> User:
     
     result = await users_collection.insert_one(new_user)
     new_user['_id'] = result.inserted_id
+    invalidate_user(new_user['email'])
     
     return User(**new_user)
 
 # ==================== END GOOGLE OAUTH ====================
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> CurrentUser:
     """Get current authenticated user from JWT token"""
     if jwt is None:
         raise HTTPException(
@@ -180,22 +201,30 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    # A token seen recently was already verified; its cache entry never
+    # outlives the token's own exp claim
+    email = token_cache.get(token)
+    if email is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+            email = TokenData(email=email).email
+        except JWTError:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
+        
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            token_cache.set(token, email, ttl=min(TOKEN_CACHE_TTL_SECONDS, expires_in))
     
-    user = await get_user_by_email(email=token_data.email)
+    user = await get_cached_user(email)
     if user is None:
         raise credentials_exception
     
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     """Get current active user"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -0,0 +1,115 @@
+"""
+In-memory TTL + LRU cache shared by the backend services
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a TTL.
+
+    Capacity is a weight budget: by default every entry weighs 1 (so the
+    budget is an entry count), but a `weigher` can charge entries by size,
+    e.g. number of flights in a cached result list.
+    """
+
+    def __init__(
+        self,
+        max_weight: int,
+        ttl: float,
+        weigher: Optional[Callable[[Any], int]] = None,
+        name: str = "cache"
+    ):
+        self.max_weight = max(1, max_weight)
+        self.ttl = ttl
+        self.weigher = weigher or (lambda value: 1)
+        self.name = name
+
+        # key -> (value, expires_at, weight)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value or `default`, refreshing LRU position on hit"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, weight = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._weight -= weight
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least-recently-used entries over budget"""
+        weight = max(1, self.weigher(value))
+        if weight > self.max_weight:
+            return  # never fits, don't flush the whole cache for it
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._weight -= old[2]
+
+            self._data[key] = (value, expires_at, weight)
+            self._weight += weight
+
+            while self._weight > self.max_weight:
+                _, (_, _, evicted_weight) = self._data.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop a single key; returns True if it was cached"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return False
+            self._weight -= entry[2]
+            return True
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+            self._weight = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters for the metrics endpoint"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "weight": self._weight,
+            "max_weight": self.max_weight,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
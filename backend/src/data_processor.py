@@ -3,61 +3,337 @@ Process and analyze flight data
 """
 
 import logging
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.flight_record import Flight
 
 logger = logging.getLogger(__name__)
 
+NAN = float('nan')
+
+
+def parse_price(value) -> float:
+    """Parse "$1,234", "150" or a number into a float (NaN if unparseable)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value.replace('$', '').replace(',', ''))
+    except (AttributeError, ValueError):
+        return NAN
+
+
+def extract_price_columns(flights):
+    """
+    Parse every price exactly once into typed columns.
+
+    Returns (prices, airline_codes, airline_names): prices is an array('d')
+    with NaN for unparseable entries, airline_codes an array('l') indexing
+    into airline_names.
+    """
+    prices = array('d')
+    codes = array('l')
+    airline_index = {}
+    append_price = prices.append
+    append_code = codes.append
+
+    for flight in flights:
+        if flight.__class__ is Flight:
+            # Already numeric: no string round trip
+            append_price(flight.price_cents / 100)
+            airline = flight.airline
+        else:
+            price = flight.get('price', '$0')
+            try:
+                append_price(float(price.replace('$', '').replace(',', '')))
+            except AttributeError:
+                append_price(parse_price(price))
+            except ValueError:
+                append_price(NAN)
+            airline = flight.get('airline', 'Unknown')
+
+        code = airline_index.get(airline)
+        if code is None:
+            code = airline_index[airline] = len(airline_index)
+        append_code(code)
+
+    return prices, codes, list(airline_index)
+
+
+def _empty_stats(total_flights):
+    return {
+        "min_price": 0,
+        "max_price": 0,
+        "avg_price": 0,
+        "median_price": 0,
+        "p10_price": 0,
+        "p90_price": 0,
+        "std_price": 0,
+        "airline_min_prices": {},
+        "total_flights": total_flights
+    }
+
+
+def _percentile(sorted_values, q):
+    """Linear-interpolated percentile, same definition as numpy's default"""
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+
+def _stats_numpy(prices, codes, names):
+    """Returns (stats or None, number of unparseable prices)"""
+    values = np.frombuffer(prices, dtype=np.float64)
+    airline_codes = np.frombuffer(codes, dtype=np.dtype('l'))
+    valid = ~np.isnan(values)
+    unparsed = int(values.size - np.count_nonzero(valid))
+    if unparsed:
+        values = values[valid]
+        airline_codes = airline_codes[valid]
+    if values.size == 0:
+        return None, unparsed
+
+    ordered = np.sort(values)
+
+    airline_min = np.full(len(names), np.inf)
+    np.minimum.at(airline_min, airline_codes, values)
+
+    return {
+        "min_price": float(ordered[0]),
+        "max_price": float(ordered[-1]),
+        "avg_price": float(values.mean()),
+        "median_price": _percentile(ordered, 50),
+        "p10_price": _percentile(ordered, 10),
+        "p90_price": _percentile(ordered, 90),
+        "std_price": float(values.std()),
+        "airline_min_prices": {
+            name: low for name, low in zip(names, airline_min.tolist()) if low != math.inf
+        }
+    }, unparsed
+
+
+def _stats_python(prices, codes, names):
+    """array('d') fallback when numpy isn't installed; same return shape"""
+    airline_min = [math.inf] * len(names)
+    values = []
+    for price, code in zip(prices, codes):
+        if price != price:  # NaN
+            continue
+        values.append(price)
+        if price < airline_min[code]:
+            airline_min[code] = price
+    unparsed = len(prices) - len(values)
+    if not values:
+        return None, unparsed
+
+    values.sort()
+    mean = math.fsum(values) / len(values)
+    variance = math.fsum((v - mean) ** 2 for v in values) / len(values)
+    return {
+        "min_price": values[0],
+        "max_price": values[-1],
+        "avg_price": mean,
+        "median_price": _percentile(values, 50),
+        "p10_price": _percentile(values, 10),
+        "p90_price": _percentile(values, 90),
+        "std_price": math.sqrt(variance),
+        "airline_min_prices": {
+            name: low for name, low in zip(names, airline_min) if low != math.inf
+        }
+    }, unparsed
+
 
 def process_flights(flights):
     """
     Analyze flight data and return statistics
-    
+
     Args:
-        flights: List of flight dictionaries
-    
+        flights: List of Flight records or flight dictionaries
+
     Returns:
-        Dictionary with min, max, avg prices and flight count
+        Dictionary with min/max/avg/median/p10/p90/std prices, the cheapest
+        price per airline and flight count
     """
     try:
         if not flights:
-            return {
-                "min_price": 0,
-                "max_price": 0,
-                "avg_price": 0,
-                "total_flights": 0
-            }
-        
-        # Extract prices (handle both "$150" and "150" formats)
-        prices = []
-        for flight in flights:
-            price_str = flight.get('price', '$0')
-            try:
-                # Remove $ and convert to float
-                price = float(price_str.replace('$', '').replace(',', ''))
-                prices.append(price)
-            except:
-                logger.warning(f"Could not parse price: {price_str}")
-                continue
-        
-        if not prices:
-            return {
-                "min_price": 0,
-                "max_price": 0,
-                "avg_price": 0,
-                "total_flights": len(flights)
-            }
-        
-        return {
-            "min_price": min(prices),
-            "max_price": max(prices),
-            "avg_price": sum(prices) / len(prices),
-            "total_flights": len(flights)
-        }
-        
+            return _empty_stats(0)
+
+        prices, codes, names = extract_price_columns(flights)
+
+        compute = _stats_numpy if np is not None else _stats_python
+        stats, unparsed = compute(prices, codes, names)
+
+        if unparsed:
+            logger.warning(f"Could not parse {unparsed} of {len(prices)} prices")
+
+        if stats is None:
+            return _empty_stats(len(flights))
+
+        stats["total_flights"] = len(flights)
+        return stats
+
     except Exception as e:
         logger.error(f"Error processing flights: {e}")
-        return {
-            "min_price": 0,
-            "max_price": 0,
-            "avg_price": 0,
-            "total_flights": len(flights) if flights else 0
-        }
\ No newline at end of file
+        return _empty_stats(len(flights) if flights else 0)
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate in O(1) memory (Jain & Chlamtac P² algorithm).
+
+    Keeps five markers whose heights converge on the requested quantile;
+    exact until five observations have been seen.
+    """
+
+    def __init__(self, q: float):
+        self.q = q
+        self._heights = []
+        self._positions = None
+        self._desired = None
+        self._increments = (0.0, q / 2, q, (1 + q) / 2, 1.0)
+
+    def add(self, x: float):
+        heights = self._heights
+
+        if self._positions is None:
+            heights.append(x)
+            if len(heights) == 5:
+                heights.sort()
+                q = self.q
+                self._positions = [1, 2, 3, 4, 5]
+                self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+            return
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self._positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i, d):
+        h = self._heights
+        n = self._positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> float:
+        if self._positions is None:
+            if not self._heights:
+                return 0.0
+            return _percentile(sorted(self._heights), self.q * 100)
+        return self._heights[2]
+
+
+class FlightStatsAggregator:
+    """
+    Incremental counterpart of process_flights for streamed results.
+
+    Flights can be fed one at a time or a day's batch at a time; memory stays
+    constant in the number of flights (one entry per airline plus three P²
+    sketches). Median and p10/p90 are approximations, the rest are exact.
+    """
+
+    def __init__(self):
+        self.total_flights = 0
+        self.count = 0
+        self.unparsed = 0
+        self.min_price = math.inf
+        self.max_price = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.airline_min_prices = {}
+        self._quantiles = {
+            "p10_price": P2Quantile(0.10),
+            "median_price": P2Quantile(0.50),
+            "p90_price": P2Quantile(0.90)
+        }
+
+    def add(self, flight):
+        self.total_flights += 1
+        if flight.__class__ is Flight:
+            price = flight.price_cents / 100
+        else:
+            price = parse_price(flight.get('price', '$0'))
+        if price != price:  # NaN
+            self.unparsed += 1
+            return
+
+        # Welford's running mean/variance
+        self.count += 1
+        delta = price - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (price - self._mean)
+
+        if price < self.min_price:
+            self.min_price = price
+        if price > self.max_price:
+            self.max_price = price
+
+        airline = flight.get('airline', 'Unknown')
+        if price < self.airline_min_prices.get(airline, math.inf):
+            self.airline_min_prices[airline] = price
+
+        for sketch in self._quantiles.values():
+            sketch.add(price)
+
+    def update(self, flights):
+        """Consume an iterable of flights (e.g. one day of search results)"""
+        for flight in flights:
+            self.add(flight)
+        return self
+
+    def result(self) -> dict:
+        """Statistics in the same shape process_flights returns"""
+        if not self.count:
+            return _empty_stats(self.total_flights)
+
+        stats = {
+            "min_price": self.min_price,
+            "max_price": self.max_price,
+            "avg_price": self._mean,
+            "std_price": math.sqrt(self._m2 / self.count),
+            "airline_min_prices": dict(self.airline_min_prices),
+            "total_flights": self.total_flights
+        }
+        for name, sketch in self._quantiles.items():
+            stats[name] = sketch.value()
+        return stats
+
+
+def process_flights_stream(flights):
+    """
+    Analyze flights from any iterable (generator, per-day chunks flattened)
+    without materializing them; median and percentiles are approximate
+    """
+    return FlightStatsAggregator().update(flights).result()
@@ -1,16 +1,134 @@
 import os
-from typing import Any
+import threading
+from typing import Any, Dict
 from dotenv import load_dotenv
 import logging
 
+try:
+    from pymongo import monitoring
+except ImportError:
+    monitoring = None
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Connection pool tuning (defaults match the driver's, except compression)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "30000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "0")) or None
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+
+# Pool checkout wait histogram bucket bounds, in milliseconds
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
 # Global db variable for compatibility
 db = None
 
+
+def available_compressors(requested: str) -> list:
+    """Requested wire compressors whose Python packages are installed"""
+    modules = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    available = []
+    for name in (c.strip() for c in requested.split(",")):
+        if name not in modules:
+            continue
+        try:
+            __import__(modules[name])
+            available.append(name)
+        except ImportError:
+            logger.info(f"ℹ️ MongoDB compressor {name} unavailable ({modules[name]} not installed)")
+    return available
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener if monitoring else object):
+    """Connection pool checkout waits, fed by the driver from its threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.checked_out = 0
+            self.connections = 0
+
+    def _record_wait(self, seconds: float):
+        ms = seconds * 1000
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self._record_wait(event.duration or 0.0)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            if event.reason == "timeout":
+                self.timeouts += 1
+            self._record_wait(event.duration or 0.0)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections -= 1
+
+    # Unused pool events
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = self.checkouts + self.checkout_failures
+            histogram = {f"<={bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self.buckets)}
+            histogram[f">{WAIT_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+            return {
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "connections": self.connections,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / waits * 1000, 3) if waits else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram": histogram
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
 class Database:
     client: Any = None
+    database: Any = None
+    _collections: Dict[str, Any] = {}
     
     @classmethod
     async def connect_db(cls):
@@ -31,16 +149,34 @@ class Database:
             
             logger.info("🔄 Connecting to MongoDB...")
             
-            # Simple connection
-            cls.client = AsyncIOMotorClient(mongodb_uri)
+            options = {
+                "maxPoolSize": MONGO_MAX_POOL_SIZE,
+                "minPoolSize": MONGO_MIN_POOL_SIZE,
+                "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                "readPreference": MONGO_READ_PREFERENCE,
+                "event_listeners": [pool_metrics] if monitoring else []
+            }
+            if MONGO_MAX_IDLE_TIME_MS:
+                options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+            if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+                options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+            compressors = available_compressors(MONGO_COMPRESSORS)
+            if compressors:
+                options["compressors"] = ",".join(compressors)
+            
+            cls.client = AsyncIOMotorClient(mongodb_uri, **options)
+            cls._collections = {}
             
             # Test connection
             await cls.client.admin.command('ping')
             logger.info("✅ Successfully connected to MongoDB Atlas!")
             
             # Set global db variable for compatibility
-            database_name = os.getenv("DATABASE_NAME", "skyracer")
-            db = cls.client[database_name]
+            db = cls.get_database()
+            logger.info(
+                f"🔌 MongoDB pool: max {MONGO_MAX_POOL_SIZE}, min {MONGO_MIN_POOL_SIZE}, "
+                f"compressors {options.get('compressors', 'none')}, read preference {MONGO_READ_PREFERENCE}"
+            )
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to MongoDB: {e}")
@@ -51,16 +187,30 @@ class Database:
         """Close MongoDB connection"""
         if cls.client:
             cls.client.close()
+            cls.database = None
+            cls._collections = {}
             logger.info("👋 MongoDB connection closed")
     
     @classmethod
-    def get_collection(cls, collection_name: str):
-        """Get a collection from the database"""
+    def get_database(cls):
+        """Database handle, resolved once per client"""
         if cls.client is None:
             raise RuntimeError("Database not connected. Call connect_db() first.")
         
-        database_name = os.getenv("DATABASE_NAME", "skyracer")
-        return cls.client[database_name][collection_name]
+        # Compare clients so a swapped-in client (tests, reconnect) is picked up
+        if cls.database is None or cls.database.client is not cls.client:
+            cls.database = cls.client[os.getenv("DATABASE_NAME", "skyracer")]
+            cls._collections = {}
+        return cls.database
+    
+    @classmethod
+    def get_collection(cls, collection_name: str):
+        """Get a collection from the database (handles are cached)"""
+        database = cls.get_database()
+        collection = cls._collections.get(collection_name)
+        if collection is None:
+            collection = cls._collections[collection_name] = database[collection_name]
+        return collection
 
 
 # Compatibility functions for api.py
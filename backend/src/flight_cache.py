@@ -0,0 +1,232 @@
+"""
+Response cache for Aviationstack lookups keyed by (origin, destination, date)
+
+Tier 1 is an in-process TTL + LRU cache. Tier 2 (optional, async only) is a
+MongoDB collection with a TTL index so warm results survive restarts.
+Concurrent identical misses are collapsed into a single upstream call.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.cache import TTLCache
+from src.flight_record import Flight
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_CACHE_TTL_SECONDS = int(os.getenv("FLIGHT_CACHE_TTL_SECONDS", "900"))
+FLIGHT_CACHE_MAX_FLIGHTS = int(os.getenv("FLIGHT_CACHE_MAX_FLIGHTS", "20000"))
+FLIGHT_CACHE_PERSIST = os.getenv("FLIGHT_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+FLIGHT_CACHE_COLLECTION = "flight_cache"
+
+RouteKey = Tuple[str, str, str]
+
+
+class MongoFlightCacheTier:
+    """Second cache tier stored in MongoDB, expired by a TTL index on expires_at"""
+
+    def __init__(self, ttl: float, collection_name: str = FLIGHT_CACHE_COLLECTION):
+        self.ttl = ttl
+        self.collection_name = collection_name
+
+    def _collection(self):
+        from src.database import Database
+
+        if Database.client is None:
+            return None
+        return Database.get_collection(self.collection_name)
+
+    @staticmethod
+    def _doc_id(key: RouteKey) -> str:
+        return ":".join(key)
+
+    async def get(self, key: RouteKey) -> Optional[List[Flight]]:
+        collection = self._collection()
+        if collection is None:
+            return None
+
+        # The TTL monitor only runs once a minute, so filter on expiry too
+        doc = await collection.find_one(
+            {"_id": self._doc_id(key), "expires_at": {"$gt": datetime.utcnow()}},
+            {"flights": 1}
+        )
+        return [Flight.from_record(record) for record in doc["flights"]] if doc else None
+
+    async def set(self, key: RouteKey, flights: List[Flight]):
+        collection = self._collection()
+        if collection is None:
+            return
+
+        await collection.replace_one(
+            {"_id": self._doc_id(key)},
+            {
+                "_id": self._doc_id(key),
+                "flights": [flight.to_record() for flight in flights],
+                "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl)
+            },
+            upsert=True
+        )
+
+
+class FlightResponseCache:
+    """
+    Route/date cache with single-flight de-duplication.
+
+    `get_or_fetch` is for the blocking scraper, `aget_or_fetch` for the async
+    one; both share the same in-memory tier. Only successful upstream
+    responses are stored: the fetch callable is expected to raise on failure,
+    so fallback data is never cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float = FLIGHT_CACHE_TTL_SECONDS,
+        max_flights: int = FLIGHT_CACHE_MAX_FLIGHTS,
+        persistent_tier: Optional[MongoFlightCacheTier] = None
+    ):
+        self.memory = TTLCache(
+            max_weight=max_flights,
+            ttl=ttl,
+            weigher=len,
+            name="flights"
+        )
+        self.persistent_tier = persistent_tier
+
+        self._sync_lock = threading.Lock()
+        self._sync_inflight: Dict[RouteKey, threading.Event] = {}
+        self._async_inflight: Dict[RouteKey, asyncio.Future] = {}
+
+        self.coalesced = 0
+        self.persistent_hits = 0
+
+    @staticmethod
+    def make_key(origin: str, destination: str, date: str) -> RouteKey:
+        return (origin.upper(), destination.upper(), date)
+
+    def get_or_fetch(
+        self,
+        origin: str,
+        destination: str,
+        date: str,
+        fetch: Callable[[], List[Flight]]
+    ) -> List[Flight]:
+        """Blocking lookup; concurrent misses for the same key wait on one fetch"""
+        key = self.make_key(origin, destination, date)
+
+        while True:
+            flights = self.memory.get(key)
+            if flights is not None:
+                return list(flights)
+
+            with self._sync_lock:
+                event = self._sync_inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._sync_inflight[key] = event
+
+            if leader:
+                break
+
+            self.coalesced += 1
+            event.wait()
+            # Loop: on success the leader populated the cache; on failure
+            # this caller becomes (or waits for) the next leader.
+
+        try:
+            flights = fetch()
+            self.memory.set(key, flights)
+            return list(flights)
+        finally:
+            with self._sync_lock:
+                self._sync_inflight.pop(key, None)
+            event.set()
+
+    async def aget_or_fetch(
+        self,
+        origin: str,
+        destination: str,
+        date: str,
+        fetch: Callable[[], Awaitable[List[Flight]]]
+    ) -> List[Flight]:
+        """Async lookup through memory, then MongoDB, then upstream"""
+        key = self.make_key(origin, destination, date)
+
+        flights = self.memory.get(key)
+        if flights is not None:
+            return list(flights)
+
+        inflight = self._async_inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            try:
+                # shield: one waiter being cancelled must not cancel the fetch
+                return list(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leader was cancelled, not us: fetch on our own behalf
+                return await self.aget_or_fetch(origin, destination, date, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        try:
+            flights = await self._load_persistent(key)
+            if flights is None:
+                flights = await fetch()
+                await self._store_persistent(key, flights)
+            self.memory.set(key, flights)
+            future.set_result(flights)
+            return list(flights)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't warn on GC
+            future.exception()
+            raise
+        finally:
+            self._async_inflight.pop(key, None)
+
+    async def _load_persistent(self, key: RouteKey) -> Optional[List[Flight]]:
+        if self.persistent_tier is None:
+            return None
+        try:
+            flights = await self.persistent_tier.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Flight cache read failed: {e}")
+            return None
+        if flights is not None:
+            self.persistent_hits += 1
+        return flights
+
+    async def _store_persistent(self, key: RouteKey, flights: List[Flight]):
+        if self.persistent_tier is None:
+            return
+        try:
+            await self.persistent_tier.set(key, flights)
+        except Exception as e:
+            logger.warning(f"⚠️ Flight cache write failed: {e}")
+
+    def invalidate(self, origin: str, destination: str, date: str):
+        self.memory.invalidate(self.make_key(origin, destination, date))
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats.update({
+            "coalesced": self.coalesced,
+            "persistent_enabled": self.persistent_tier is not None,
+            "persistent_hits": self.persistent_hits
+        })
+        return stats
+
+
+# Shared by every scraper instance in the process
+flight_cache = FlightResponseCache(
+    persistent_tier=MongoFlightCacheTier(FLIGHT_CACHE_TTL_SECONDS) if FLIGHT_CACHE_PERSIST else None
+)
@@ -0,0 +1,207 @@
+"""
+Compact flight record used internally by the scraper
+
+Stores numbers as numbers (price in integer cents, times as epoch minutes,
+duration in minutes) in a __slots__ class instead of an eight-key dict of
+formatted strings. The display strings ("$175", "14:05", "2h 30m") are only
+produced on demand, at the API edge via to_dict() / to_flight_data().
+
+For backwards compatibility a Flight also answers flight['price'] and
+flight.get('airline'), so code written against the old dicts keeps working.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+SIMULATED_NOTE = '⚠️ Simulated data (API unavailable)'
+
+_DICT_KEYS = ('airline', 'flight_number', 'departure', 'arrival', 'price', 'duration', 'status', 'date')
+
+
+def epoch_minutes(dt: datetime) -> int:
+    """Whole minutes since the Unix epoch (naive datetimes are taken as UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) // 60
+
+
+def utc_offset_minutes(dt: datetime) -> int:
+    offset = dt.utcoffset()
+    return int(offset.total_seconds()) // 60 if offset else 0
+
+
+def _format_clock(minutes: Optional[int], offset: int) -> str:
+    if minutes is None:
+        return 'N/A'
+    local = (minutes + offset) % 1440
+    return f'{local // 60:02d}:{local % 60:02d}'
+
+
+class Flight:
+    """One scheduled flight; immutable by convention"""
+
+    __slots__ = (
+        'airline',
+        'flight_number',
+        'price_cents',
+        'departure_min',
+        'arrival_min',
+        'departure_offset',
+        'arrival_offset',
+        'duration_min',
+        'status',
+        'date',
+        'simulated'
+    )
+
+    def __init__(
+        self,
+        airline: str,
+        flight_number: str,
+        price_cents: int,
+        departure_min: Optional[int],
+        arrival_min: Optional[int],
+        duration_min: Optional[int],
+        date: str,
+        status: str = 'scheduled',
+        departure_offset: int = 0,
+        arrival_offset: int = 0,
+        simulated: bool = False
+    ):
+        self.airline = airline
+        self.flight_number = flight_number
+        self.price_cents = price_cents
+        self.departure_min = departure_min
+        self.arrival_min = arrival_min
+        self.departure_offset = departure_offset
+        self.arrival_offset = arrival_offset
+        self.duration_min = duration_min
+        self.status = status
+        self.date = date
+        self.simulated = simulated
+
+    # ----- display fields, computed lazily -----
+
+    @property
+    def price(self) -> str:
+        dollars, cents = divmod(self.price_cents, 100)
+        return f'${dollars}' if not cents else f'${dollars}.{cents:02d}'
+
+    @property
+    def departure(self) -> str:
+        return _format_clock(self.departure_min, self.departure_offset)
+
+    @property
+    def arrival(self) -> str:
+        return _format_clock(self.arrival_min, self.arrival_offset)
+
+    @property
+    def duration(self) -> str:
+        if self.duration_min is None:
+            return 'N/A'
+        return f'{self.duration_min // 60}h {self.duration_min % 60}m'
+
+    # ----- dict compatibility -----
+
+    def keys(self):
+        return _DICT_KEYS + ('note',) if self.simulated else _DICT_KEYS
+
+    def __getitem__(self, key):
+        if key == 'note':
+            if self.simulated:
+                return SIMULATED_NOTE
+            raise KeyError(key)
+        if key not in _DICT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def to_dict(self) -> dict:
+        """The legacy flight dict shape"""
+        return {key: self[key] for key in self.keys()}
+
+    def to_flight_data(self):
+        """Serialize to the pydantic FlightData response model"""
+        from src.models import FlightData
+
+        return FlightData(
+            airline=self.airline,
+            departure=self.departure,
+            arrival=self.arrival,
+            price=self.price,
+            duration=self.duration,
+            date=self.date
+        )
+
+    # ----- storage (e.g. the MongoDB cache tier) -----
+
+    def to_record(self) -> dict:
+        """Raw numeric fields, suitable for BSON"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'Flight':
+        return cls(**{name: record[name] for name in cls.__slots__ if name in record})
+
+    def _astuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, Flight):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        return (
+            f'Flight({self.airline!r}, {self.flight_number!r}, {self.price}, '
+            f'{self.date} {self.departure}→{self.arrival})'
+        )
+
+
+def from_aviationstack(flight: dict, price_cents: int, date: str) -> Flight:
+    """Build a Flight from one entry of an Aviationstack /flights response"""
+    departure_info = flight.get('departure') or {}
+    arrival_info = flight.get('arrival') or {}
+    airline_info = flight.get('airline') or {}
+    flight_info = flight.get('flight') or {}
+
+    dep_dt = _parse_timestamp(departure_info.get('scheduled'))
+    arr_dt = _parse_timestamp(arrival_info.get('scheduled'))
+
+    duration_min = None
+    if dep_dt and arr_dt:
+        # Same wrap-around as the original timedelta.seconds arithmetic
+        duration_min = (arr_dt - dep_dt).seconds // 60
+
+    return Flight(
+        airline=airline_info.get('name', 'Unknown'),
+        flight_number=flight_info.get('iata', 'N/A'),
+        price_cents=price_cents,
+        departure_min=epoch_minutes(dep_dt) if dep_dt else None,
+        arrival_min=epoch_minutes(arr_dt) if arr_dt else None,
+        duration_min=duration_min,
+        date=date,
+        status=flight.get('flight_status', 'scheduled'),
+        departure_offset=utc_offset_minutes(dep_dt) if dep_dt else 0,
+        arrival_offset=utc_offset_minutes(arr_dt) if arr_dt else 0
+    )
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
@@ -2,20 +2,51 @@
 Real Flight Data using Aviationstack API
 """
 
+import asyncio
+from collections import deque
 import requests
+import httpx
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import logging
 
+from src.data_processor import FlightStatsAggregator
+from src.flight_cache import flight_cache
+from src.flight_record import Flight, epoch_minutes, from_aviationstack
+from src.http_client import get_sync_session, get_async_client, REQUESTS_TIMEOUT
+from src.price_history import record_observations
+from src.rate_limiter import (
+    aviationstack_limiter,
+    aviationstack_quota,
+    QuotaExhaustedError,
+    RateLimitExceeded
+)
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+AVIATIONSTACK_BASE_URL = os.getenv("AVIATIONSTACK_BASE_URL", "http://api.aviationstack.com/v1/flights")
+SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "8"))
+RATE_LIMIT_RETRIES = int(os.getenv("AVIATIONSTACK_RATE_LIMIT_RETRIES", "2"))
+RATE_LIMIT_PENALTY_SECONDS = 1.0
+
+
+class AviationstackError(Exception):
+    """Aviationstack answered with an error payload instead of flight data"""
+    
+    def __init__(self, error):
+        self.code = error.get('code') if isinstance(error, dict) else None
+        super().__init__(error)
+
 
 class FlightScraper:
-    def __init__(self):
+    def __init__(self, cache=None, limiter=None, quota=None):
         self.api_key = os.getenv("AVIATIONSTACK_API_KEY")
-        self.base_url = "http://api.aviationstack.com/v1/flights"
+        self.base_url = AVIATIONSTACK_BASE_URL
+        self.cache = cache or flight_cache
+        self.limiter = limiter or aviationstack_limiter
+        self.quota = quota or aviationstack_quota
         
         if not self.api_key:
             logger.error("❌ AVIATIONSTACK_API_KEY not found in .env!")
@@ -25,108 +56,63 @@ class FlightScraper:
         try:
             logger.info(f"🔍 Searching: {origin} → {destination} on {date}")
             
-            params = {
-                'access_key': self.api_key,
-                'dep_iata': origin,
-                'arr_iata': destination,
-                'flight_date': date,
-                'limit': 50
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'error' in data:
-                logger.error(f"❌ API Error: {data['error']}")
-                return self._get_fallback_data(origin, destination, date)
-            
-            flights = []
-            for flight in data.get('data', []):
-                # Extract flight info
-                departure_info = flight.get('departure', {})
-                arrival_info = flight.get('arrival', {})
-                airline_info = flight.get('airline', {})
-                flight_info = flight.get('flight', {})
-                
-                # Get times
-                dep_time = departure_info.get('scheduled', '')
-                arr_time = arrival_info.get('scheduled', '')
-                
-                # Format times
-                if dep_time:
-                    try:
-                        dep_dt = datetime.fromisoformat(dep_time.replace('Z', '+00:00'))
-                        dep_formatted = dep_dt.strftime('%H:%M')
-                    except:
-                        dep_formatted = 'N/A'
-                else:
-                    dep_formatted = 'N/A'
-                
-                if arr_time:
-                    try:
-                        arr_dt = datetime.fromisoformat(arr_time.replace('Z', '+00:00'))
-                        arr_formatted = arr_dt.strftime('%H:%M')
-                        
-                        # Calculate duration
-                        if dep_time:
-                            duration = arr_dt - dep_dt
-                            hours = duration.seconds // 3600
-                            minutes = (duration.seconds % 3600) // 60
-                            duration_str = f"{hours}h {minutes}m"
-                        else:
-                            duration_str = 'N/A'
-                    except:
-                        arr_formatted = 'N/A'
-                        duration_str = 'N/A'
-                else:
-                    arr_formatted = 'N/A'
-                    duration_str = 'N/A'
-                
-                # Aviationstack doesn't provide prices, so use estimated range
-                # In production, you'd need a different API for pricing
-                estimated_price = f"${150 + (len(flights) * 25)}"
-                
-                flights.append({
-                    'airline': airline_info.get('name', 'Unknown'),
-                    'flight_number': flight_info.get('iata', 'N/A'),
-                    'departure': dep_formatted,
-                    'arrival': arr_formatted,
-                    'price': estimated_price,
-                    'duration': duration_str,
-                    'status': flight.get('flight_status', 'scheduled'),
-                    'date': date
-                })
-            
-            logger.info(f"✅ Found {len(flights)} flights")
-            
-            if not flights:
-                logger.warning("⚠️ No flights found, using fallback data")
-                return self._get_fallback_data(origin, destination, date)
-            
-            return flights
+            flights = self.cache.get_or_fetch(
+                origin, destination, date,
+                lambda: self._fetch_flights(origin, destination, date)
+            )
+            return self._with_fallback(flights, origin, destination, date)
             
         except requests.exceptions.Timeout:
             logger.error("⏱️ Request timeout")
             return self._get_fallback_data(origin, destination, date)
+        except (QuotaExhaustedError, RateLimitExceeded) as e:
+            logger.error(f"🚦 Upstream budget: {e}")
+            return self._get_fallback_data(origin, destination, date)
+        except AviationstackError as e:
+            logger.error(f"❌ API Error: {e}")
+            return self._get_fallback_data(origin, destination, date)
         except Exception as e:
             logger.error(f"❌ Error: {e}")
             return self._get_fallback_data(origin, destination, date)
     
+    def _fetch_flights(self, origin, destination, date):
+        """Single upstream call; raises on any failure so errors are never cached"""
+        params = self._build_params(origin, destination, date)
+        
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if not self.quota.try_consume_local():
+                raise QuotaExhaustedError("Aviationstack monthly quota used up")
+            self.limiter.acquire()
+            
+            response = get_sync_session().get(self.base_url, params=params, timeout=REQUESTS_TIMEOUT)
+            response.raise_for_status()
+            
+            try:
+                return self._handle_response(response.json(), date)
+            except AviationstackError as e:
+                if not self._should_retry(e, attempt):
+                    raise
+    
+    def _should_retry(self, error, attempt):
+        """Back off and retry on per-second throttling; record exhausted quota"""
+        if error.code == 'usage_limit_reached':
+            self.quota.mark_exhausted()
+            return False
+        if error.code == 'rate_limit_reached' and attempt < RATE_LIMIT_RETRIES:
+            logger.warning("🚦 Aviationstack rate limit hit, backing off")
+            self.limiter.penalize(RATE_LIMIT_PENALTY_SECONDS)
+            return True
+        return False
+    
     def find_best_deals(self, origin, destination, start_date, end_date):
         """Search flights across date range"""
         try:
-            current = datetime.strptime(start_date, '%Y-%m-%d')
-            end = datetime.strptime(end_date, '%Y-%m-%d')
             all_flights = []
             
             logger.info(f"📅 Searching from {start_date} to {end_date}")
             
-            while current <= end:
-                date_str = current.strftime('%Y-%m-%d')
-                flights = self.search_flights(origin, destination, date_str)
+            for _, flights in self.iter_best_deals(origin, destination, start_date, end_date):
                 all_flights.extend(flights)
-                current += timedelta(days=1)
             
             logger.info(f"🎯 Total: {len(all_flights)} flights")
             return all_flights
@@ -135,6 +121,66 @@ class FlightScraper:
             logger.error(f"❌ Error in find_best_deals: {e}")
             return self._get_fallback_data(origin, destination, start_date)
     
+    def iter_best_deals(self, origin, destination, start_date, end_date):
+        """Yield (date, flights) one day at a time so callers can stream results"""
+        for date_str in self._date_range(start_date, end_date):
+            yield date_str, self.search_flights(origin, destination, date_str)
+    
+    def summarize_best_deals(self, origin, destination, start_date, end_date, aggregator=None):
+        """Price statistics for a date range without holding every flight in memory"""
+        aggregator = aggregator or FlightStatsAggregator()
+        for _, flights in self.iter_best_deals(origin, destination, start_date, end_date):
+            aggregator.update(flights)
+        return aggregator.result()
+    
+    def _build_params(self, origin, destination, date):
+        """Query parameters for a single-day Aviationstack lookup"""
+        return {
+            'access_key': self.api_key,
+            'dep_iata': origin,
+            'arr_iata': destination,
+            'flight_date': date,
+            'limit': 50
+        }
+    
+    def _date_range(self, start_date, end_date):
+        """All dates from start_date to end_date (inclusive) as YYYY-MM-DD"""
+        current = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        dates = []
+        while current <= end:
+            dates.append(current.strftime('%Y-%m-%d'))
+            current += timedelta(days=1)
+        return dates
+    
+    def _handle_response(self, data, date):
+        """Turn a decoded API payload into flights"""
+        if 'error' in data:
+            raise AviationstackError(data['error'])
+        
+        flights = self._parse_flights(data, date)
+        
+        logger.info(f"✅ Found {len(flights)} flights")
+        return flights
+    
+    def _with_fallback(self, flights, origin, destination, date):
+        """Substitute simulated data when the route has no scheduled flights"""
+        if not flights:
+            logger.warning("⚠️ No flights found, using fallback data")
+            return self._get_fallback_data(origin, destination, date)
+        return flights
+    
+    def _parse_flights(self, data, date):
+        """Convert an Aviationstack response into Flight records"""
+        flights = []
+        for flight in data.get('data', []):
+            # Aviationstack doesn't provide prices, so use estimated range
+            # In production, you'd need a different API for pricing
+            estimated_cents = (150 + (len(flights) * 25)) * 100
+            flights.append(from_aviationstack(flight, estimated_cents, date))
+        
+        return flights
+    
     def _get_fallback_data(self, origin, destination, date):
         """Fallback data when API fails"""
         logger.warning("⚠️ Using fallback data")
@@ -143,24 +189,163 @@ class FlightScraper:
         airlines = ['IndiGo', 'Air India', 'SpiceJet', 'Vistara', 'Go First']
         base_price = 150
         
+        try:
+            day_start = epoch_minutes(datetime.strptime(date, '%Y-%m-%d'))
+        except (TypeError, ValueError):
+            day_start = 0
+        
         flights = []
         for i in range(5):
             dep_hour = 6 + (i * 3)
             arr_hour = dep_hour + 2
             
-            flights.append({
-                'airline': airlines[i % len(airlines)],
-                'flight_number': f'{airlines[i % len(airlines)][:2].upper()}{100 + i}',
-                'departure': f'{dep_hour:02d}:00',
-                'arrival': f'{arr_hour:02d}:30',
-                'price': f'${base_price + (i * 30)}',
-                'duration': '2h 30m',
-                'status': 'scheduled',
-                'date': date,
-                'note': '⚠️ Simulated data (API unavailable)'
-            })
+            flights.append(Flight(
+                airline=airlines[i % len(airlines)],
+                flight_number=f'{airlines[i % len(airlines)][:2].upper()}{100 + i}',
+                price_cents=(base_price + (i * 30)) * 100,
+                departure_min=day_start + dep_hour * 60,
+                arrival_min=day_start + arr_hour * 60 + 30,
+                duration_min=150,
+                date=date,
+                simulated=True
+            ))
+        
+        return flights
+
+
+class AsyncFlightScraper(FlightScraper):
+    """
+    Non-blocking scraper that fans a date range out concurrently.
+    
+    All instances share the pooled httpx client from src.http_client so
+    connections are reused across days and across searches. Parsing and
+    fallback behaviour are inherited from FlightScraper.
+    
+    With record_prices, every fresh upstream answer (a cache miss, never a
+    cached or simulated result) is appended to the price history.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+        cache=None,
+        limiter=None,
+        quota=None,
+        record_prices: bool = False
+    ):
+        super().__init__(cache=cache, limiter=limiter, quota=quota)
+        self.max_concurrency = max(1, max_concurrency)
+        self.record_prices = record_prices
+    
+    async def search_flights(self, origin, destination, date):
+        """Search real flights for one day without blocking the event loop"""
+        try:
+            logger.info(f"🔍 Searching: {origin} → {destination} on {date}")
+            
+            flights = await self.cache.aget_or_fetch(
+                origin, destination, date,
+                lambda: self._fetch_and_record(origin, destination, date)
+            )
+            return self._with_fallback(flights, origin, destination, date)
+            
+        except httpx.TimeoutException:
+            logger.error("⏱️ Request timeout")
+            return self._get_fallback_data(origin, destination, date)
+        except (QuotaExhaustedError, RateLimitExceeded) as e:
+            logger.error(f"🚦 Upstream budget: {e}")
+            return self._get_fallback_data(origin, destination, date)
+        except AviationstackError as e:
+            logger.error(f"❌ API Error: {e}")
+            return self._get_fallback_data(origin, destination, date)
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            return self._get_fallback_data(origin, destination, date)
+    
+    async def _fetch_flights(self, origin, destination, date):
+        """Single upstream call; raises on any failure so errors are never cached"""
+        params = self._build_params(origin, destination, date)
         
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            if not await self.quota.consume():
+                raise QuotaExhaustedError("Aviationstack monthly quota used up")
+            await self.limiter.acquire_async()
+            
+            response = await get_async_client().get(self.base_url, params=params)
+            response.raise_for_status()
+            
+            try:
+                return self._handle_response(response.json(), date)
+            except AviationstackError as e:
+                if not self._should_retry(e, attempt):
+                    raise
+    
+    async def _fetch_and_record(self, origin, destination, date):
+        """Cache miss: fetch upstream, then record the fresh prices (best effort)"""
+        flights = await self._fetch_flights(origin, destination, date)
+        if self.record_prices:
+            try:
+                await record_observations(origin, destination, flights)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not record price history: {e}")
         return flights
+    
+    async def find_best_deals(self, origin, destination, start_date, end_date):
+        """Search flights across date range, fetching days concurrently"""
+        try:
+            all_flights = []
+            
+            logger.info(
+                f"📅 Searching from {start_date} to {end_date} "
+                f"(concurrency={self.max_concurrency})"
+            )
+            
+            async for _, flights in self.iter_best_deals(origin, destination, start_date, end_date):
+                all_flights.extend(flights)
+            
+            logger.info(f"🎯 Total: {len(all_flights)} flights")
+            return all_flights
+            
+        except Exception as e:
+            logger.error(f"❌ Error in find_best_deals: {e}")
+            return self._get_fallback_data(origin, destination, start_date)
+    
+    async def iter_best_deals(self, origin, destination, start_date, end_date):
+        """
+        Yield (date, flights) in date order while fetching ahead concurrently.
+        
+        At most max_concurrency requests are in flight and at most twice that
+        many days are buffered, so memory is bounded by the window rather
+        than by the length of the range.
+        """
+        dates = self._date_range(start_date, end_date)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        window = 2 * self.max_concurrency
+        pending = deque()
+        next_index = 0
+        
+        async def fetch_day(date_str):
+            async with semaphore:
+                return await self.search_flights(origin, destination, date_str)
+        
+        try:
+            while next_index < len(dates) or pending:
+                while next_index < len(dates) and len(pending) < window:
+                    date_str = dates[next_index]
+                    pending.append((date_str, asyncio.ensure_future(fetch_day(date_str))))
+                    next_index += 1
+                
+                date_str, task = pending.popleft()
+                yield date_str, await task
+        finally:
+            for _, task in pending:
+                task.cancel()
+    
+    async def summarize_best_deals(self, origin, destination, start_date, end_date, aggregator=None):
+        """Price statistics for a date range without holding every flight in memory"""
+        aggregator = aggregator or FlightStatsAggregator()
+        async for _, flights in self.iter_best_deals(origin, destination, start_date, end_date):
+            aggregator.update(flights)
+        return aggregator.result()
 
 
 # Test
@@ -0,0 +1,108 @@
+"""
+Game statistics persistence
+
+Score submissions are applied as a single atomic update-with-pipeline on
+the user's game_stats document: counters, high score and average are all
+computed server-side, so concurrent submissions for the same user can't
+overwrite each other and each submission is one round trip.
+"""
+
+import os
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+GAME_TYPES = ("voice", "gesture")
+
+# Scores are client-reported; anything above this is rejected
+MAX_GAME_SCORE = int(os.getenv("MAX_GAME_SCORE", "1000000"))
+
+# What /games/stats shows; total_score and previous_high_score stay internal
+PUBLIC_STATS_FIELDS = ("high_score", "total_games", "average_score", "last_played")
+
+
+def empty_game_stats() -> dict:
+    return {
+        "high_score": 0,
+        "total_games": 0,
+        "total_score": 0,
+        "average_score": 0,
+        "last_played": None
+    }
+
+
+_PUBLIC_DEFAULTS = {field: empty_game_stats()[field] for field in PUBLIC_STATS_FIELDS}
+
+
+def stats_projection(fields=PUBLIC_STATS_FIELDS, game_types=GAME_TYPES) -> dict:
+    """Inclusion projection for just these per-game fields"""
+    projection = {"_id": 0}
+    for game_type in game_types:
+        for field in fields:
+            projection[f"{game_type}.{field}"] = 1
+    return projection
+
+
+def public_game_stats(stats: Optional[dict]) -> dict:
+    """One game type's stats reduced to PUBLIC_STATS_FIELDS"""
+    if not stats:
+        return dict(_PUBLIC_DEFAULTS)
+    return {field: stats.get(field, default) for field, default in _PUBLIC_DEFAULTS.items()}
+
+
+def score_update_pipeline(
+    game_type: str,
+    games: int,
+    total_score: int,
+    high_score: int,
+    now: Optional[datetime] = None
+) -> list:
+    """
+    Update pipeline that folds `games` results (summing to `total_score`,
+    best `high_score`) into one game type's stats.
+
+    Pipeline stages read the document as it was before the stage, so the
+    first stage can record previous_high_score alongside the new maximum;
+    the second derives average_score from the updated totals.
+    """
+    now = now or datetime.utcnow()
+
+    def current(field):
+        return {"$ifNull": [f"${game_type}.{field}", 0]}
+
+    first = {
+        f"{game_type}.previous_high_score": current("high_score"),
+        f"{game_type}.high_score": {"$max": [current("high_score"), high_score]},
+        f"{game_type}.total_games": {"$add": [current("total_games"), games]},
+        f"{game_type}.total_score": {"$add": [current("total_score"), total_score]},
+        f"{game_type}.last_played": now,
+        "created_at": {"$ifNull": ["$created_at", now]},
+        "updated_at": now
+    }
+    # Upserted documents get every game type, like the old read-modify-write did
+    for other in GAME_TYPES:
+        if other != game_type:
+            first[other] = {"$ifNull": [f"${other}", {"$literal": empty_game_stats()}]}
+
+    second = {
+        f"{game_type}.average_score": {
+            "$round": [{"$divide": [f"${game_type}.total_score", f"${game_type}.total_games"]}, 2]
+        }
+    }
+    return [{"$set": first}, {"$set": second}]
+
+
+async def apply_score(collection, email: str, game_type: str, score: int) -> dict:
+    """
+    Atomically record one finished game and return that game type's
+    post-update stats (including previous_high_score).
+    """
+    doc = await collection.find_one_and_update(
+        {"email": email},
+        score_update_pipeline(game_type, 1, score, score),
+        projection={"_id": 0, game_type: 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return doc[game_type]
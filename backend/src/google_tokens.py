@@ -0,0 +1,219 @@
+"""
+Google ID-token verification against a locally cached JWKS
+
+google.oauth2.id_token.verify_oauth2_token is synchronous and downloads
+Google's certificates on every call. Here the signing keys are fetched
+asynchronously, kept for as long as Google's Cache-Control allows and
+refreshed in the background before they expire, so verifying a token is
+a pure CPU check (RS256 via python-jose) with no network I/O.
+
+GOOGLE_JWKS_FILE points the verifier at a local JWKS file instead of
+Google (tests, offline development).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional
+
+try:
+    from jose import JWTError, jwk, jwt
+except ImportError:
+    JWTError = Exception
+    jwk = None
+    jwt = None
+
+from src.http_client import get_async_client
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_JWKS_FILE = os.getenv("GOOGLE_JWKS_FILE")
+GOOGLE_JWKS_DEFAULT_TTL = float(os.getenv("GOOGLE_JWKS_DEFAULT_TTL", "3600"))
+GOOGLE_JWKS_REFRESH_MARGIN = float(os.getenv("GOOGLE_JWKS_REFRESH_MARGIN", "300"))
+GOOGLE_JWKS_MIN_REFETCH_SECONDS = float(os.getenv("GOOGLE_JWKS_MIN_REFETCH_SECONDS", "30"))
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenError(ValueError):
+    """The ID token is malformed, expired, or not signed by Google"""
+
+
+def cache_ttl(headers) -> float:
+    """Seconds a JWKS response may be reused, from Cache-Control and Age"""
+    cache_control = headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if not match:
+        return GOOGLE_JWKS_DEFAULT_TTL
+    try:
+        age = float(headers.get("age", 0))
+    except ValueError:
+        age = 0.0
+    return max(0.0, int(match.group(1)) - age)
+
+
+class GoogleKeySet:
+    """kid -> constructed RS256 key, refreshed per the HTTP cache headers"""
+
+    def __init__(self, url: str = GOOGLE_JWKS_URL, path: Optional[str] = GOOGLE_JWKS_FILE):
+        self.url = url
+        self.path = path
+        self._keys: Dict[str, object] = {}
+        self.expires_at = 0.0
+        self._last_fetch = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+        self._background: Optional[asyncio.Task] = None
+
+        self.fetches = 0
+        self.fetch_failures = 0
+        self.lookups = 0
+        self.misses = 0
+
+    @property
+    def fresh(self) -> bool:
+        return bool(self._keys) and time.monotonic() < self.expires_at
+
+    async def _load(self):
+        try:
+            await self._fetch()
+        except Exception:
+            self.fetch_failures += 1
+            raise
+
+    async def _fetch(self):
+        if self.path:
+            with open(self.path) as f:
+                document = json.load(f)
+            ttl = GOOGLE_JWKS_DEFAULT_TTL
+        else:
+            response = await get_async_client().get(self.url)
+            response.raise_for_status()
+            document = response.json()
+            ttl = cache_ttl(response.headers)
+
+        keys = {}
+        for key in document.get("keys", []):
+            if key.get("kty") == "RSA" and key.get("kid"):
+                keys[key["kid"]] = jwk.construct(key, "RS256")
+        if not keys:
+            raise GoogleTokenError("JWKS contains no RSA keys")
+
+        self._keys = keys
+        self.expires_at = time.monotonic() + ttl
+        self.fetches += 1
+        logger.info(f"🔑 Google signing keys loaded: {len(keys)} keys, cached {int(ttl)}s")
+
+    async def refresh(self):
+        """Reload the key set; concurrent callers share one fetch"""
+        if self._refreshing is None or self._refreshing.done():
+            self._last_fetch = time.monotonic()
+            self._refreshing = asyncio.create_task(self._load())
+        try:
+            await asyncio.shield(self._refreshing)
+        except Exception as e:
+            if not self._keys:
+                raise
+            logger.warning(f"⚠️ Google JWKS refresh failed, keeping cached keys: {e}")
+
+    async def get_key(self, kid: str):
+        self.lookups += 1
+        key = self._keys.get(kid)
+        if key is not None and self.fresh:
+            return key
+
+        if key is not None:
+            # Expired but known: answer now, refresh behind the request
+            self._schedule_refresh()
+            return key
+
+        # Unknown kid: Google may have rotated keys; refetch, but not in a
+        # tight loop for tokens carrying garbage kids
+        self.misses += 1
+        if not self._keys or time.monotonic() - self._last_fetch >= GOOGLE_JWKS_MIN_REFETCH_SECONDS:
+            await self.refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            raise GoogleTokenError("Token signed with an unknown key")
+        return key
+
+    def _schedule_refresh(self):
+        if time.monotonic() - self._last_fetch < GOOGLE_JWKS_MIN_REFETCH_SECONDS:
+            return
+        if self._refreshing is None or self._refreshing.done():
+            asyncio.create_task(self.refresh())
+
+    # ----- background refresh -----
+
+    def start(self):
+        """Keep the keys warm: refresh shortly before they expire"""
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._background is not None:
+            self._background.cancel()
+            await asyncio.gather(self._background, return_exceptions=True)
+            self._background = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not load Google signing keys: {e}")
+            delay = self.expires_at - time.monotonic() - GOOGLE_JWKS_REFRESH_MARGIN
+            await asyncio.sleep(max(GOOGLE_JWKS_MIN_REFETCH_SECONDS, delay))
+
+    def stats(self) -> dict:
+        return {
+            "source": self.path or self.url,
+            "keys": len(self._keys),
+            "fresh": self.fresh,
+            "expires_in": max(0, round(self.expires_at - time.monotonic())) if self._keys else 0,
+            "fetches": self.fetches,
+            "fetch_failures": self.fetch_failures,
+            "lookups": self.lookups,
+            "unknown_kid": self.misses
+        }
+
+
+class GoogleTokenVerifier:
+    def __init__(self, keys: GoogleKeySet, client_id: Optional[str]):
+        self.keys = keys
+        self.client_id = client_id
+
+    async def verify(self, token: str) -> dict:
+        """Verified claims of a Google ID token; raises GoogleTokenError"""
+        if jwt is None:
+            raise RuntimeError("python-jose is not installed")
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise GoogleTokenError(str(e))
+        if header.get("alg") != "RS256":
+            raise GoogleTokenError("Unexpected signing algorithm")
+
+        key = await self.keys.get_key(header.get("kid"))
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_aud": self.client_id is not None, "verify_at_hash": False}
+            )
+        except JWTError as e:
+            raise GoogleTokenError(str(e))
+
+
+google_keys = GoogleKeySet()
+google_token_verifier = GoogleTokenVerifier(google_keys, os.getenv("GOOGLE_CLIENT_ID"))
@@ -0,0 +1,79 @@
+"""
+Shared, pooled HTTP clients for outbound API calls
+
+One keep-alive connection pool per process instead of a fresh TCP/TLS
+handshake per request. Both the blocking (requests) and async (httpx)
+clients are created lazily and closed from the app shutdown hook.
+"""
+
+import os
+import threading
+import logging
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# requests takes (connect, read); httpx takes a Timeout object
+REQUESTS_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_session = None
+_session_lock = threading.Lock()
+_async_client = None
+
+
+def get_sync_session() -> requests.Session:
+    """Get (or create) the process-wide pooled requests session"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get (or create) the process-wide pooled httpx client"""
+    global _async_client
+
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_SIZE,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        )
+    return _async_client
+
+
+async def close_http_clients():
+    """Close pooled connections (called on app shutdown)"""
+    global _session, _async_client
+
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+    logger.info("👋 HTTP connection pools closed")
@@ -0,0 +1,198 @@
+"""
+MongoDB index manifest and query-plan check
+
+Every index the backend relies on is declared once in INDEX_MANIFEST and
+created idempotently at startup (create_index is a no-op when an identical
+index exists). HOT_QUERIES lists the queries on request paths; with
+MONGO_VERIFY_QUERY_PLANS=true startup runs explain() on each of them and
+refuses to start if any would scan a whole collection.
+
+Run the check by hand against the configured database with:
+    python -m src.indexes --explain
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+from src.database import Database
+from src.flight_cache import FLIGHT_CACHE_COLLECTION
+from src.price_history import DAILY_COLLECTION, OBSERVATIONS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+MONGO_VERIFY_QUERY_PLANS = os.getenv("MONGO_VERIFY_QUERY_PLANS", "false").lower() in ("1", "true", "yes")
+
+
+class IndexSpec(NamedTuple):
+    collection: str
+    keys: List[Tuple[str, int]]
+    options: Dict = {}
+
+    @property
+    def name(self) -> str:
+        """pymongo's default name, so indexes created before the manifest match"""
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+
+INDEX_MANIFEST: List[IndexSpec] = [
+    # Auth: every authenticated request resolves the user by email
+    IndexSpec("users", [("email", ASCENDING)], {"unique": True}),
+
+    # Games: per-user stats and the leaderboards
+    IndexSpec("game_stats", [("email", ASCENDING)], {"unique": True}),
+    IndexSpec("game_stats", [("voice.high_score", DESCENDING)]),
+    IndexSpec("game_stats", [("gesture.high_score", DESCENDING)]),
+
+    # Search history expires on its own; /search/history and /saved listings
+    IndexSpec("search_history", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    IndexSpec("search_history", [("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    IndexSpec(
+        "search_results",
+        [("user_id", ASCENDING), ("is_saved", ASCENDING), ("created_at", DESCENDING)]
+    ),
+
+    # Price history
+    IndexSpec(
+        OBSERVATIONS_COLLECTION,
+        [("route", ASCENDING), ("flight_date", ASCENDING), ("observed_at", DESCENDING)]
+    ),
+    IndexSpec(DAILY_COLLECTION, [("route", ASCENDING), ("flight_date", ASCENDING)]),
+
+    # Persistent flight cache tier
+    IndexSpec(FLIGHT_CACHE_COLLECTION, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+
+class HotQuery(NamedTuple):
+    name: str
+    collection: str
+    filter: Dict
+    sort: Optional[Dict] = None
+    count: bool = False
+
+
+# Representative shapes of the queries on request paths; values don't matter
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("auth user by email", "users", {"email": "player@example.com"}),
+    HotQuery("game stats by email", "game_stats", {"email": "player@example.com"}),
+    HotQuery(
+        "voice leaderboard top",
+        "game_stats",
+        {"voice.total_games": {"$gt": 0}},
+        {"voice.high_score": -1}
+    ),
+    HotQuery(
+        "gesture rank count",
+        "game_stats",
+        {"gesture.total_games": {"$gt": 0}, "gesture.high_score": {"$gt": 100}},
+        count=True
+    ),
+    HotQuery("search history", "search_history", {"user_id": "player@example.com"}, {"created_at": -1}),
+    HotQuery(
+        "saved searches",
+        "search_results",
+        {"user_id": "player@example.com", "is_saved": True},
+        {"created_at": -1}
+    ),
+    HotQuery(
+        "daily prices",
+        DAILY_COLLECTION,
+        {"route": "DEL-BOM", "flight_date": {"$gte": "2025-01-01", "$lte": "2025-01-31"}},
+        {"flight_date": 1}
+    ),
+    HotQuery(
+        "price trend",
+        OBSERVATIONS_COLLECTION,
+        {"route": "DEL-BOM", "flight_date": "2025-01-15"}
+    ),
+]
+
+
+class QueryPlanError(RuntimeError):
+    """A hot query would run as a collection scan"""
+
+
+async def apply_index_manifest() -> Dict[str, int]:
+    """Create every manifest index; returns counts of created/failed"""
+    created = failed = 0
+    for spec in INDEX_MANIFEST:
+        collection = Database.get_collection(spec.collection)
+        try:
+            await collection.create_index(spec.keys, **spec.options)
+            created += 1
+        except OperationFailure as e:
+            # e.g. duplicate emails blocking a unique index, or an existing
+            # index with the same keys but different options
+            failed += 1
+            logger.error(f"❌ Index {spec.collection}.{spec.name} not created: {e}")
+    logger.info(f"🗂️ Index manifest applied: {created} ok, {failed} failed")
+    return {"ok": created, "failed": failed}
+
+
+def _stages(plan) -> List[str]:
+    """Every 'stage' name in an explain plan tree"""
+    found = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.append(plan["stage"])
+        for value in plan.values():
+            found.extend(_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(_stages(item))
+    return found
+
+
+async def explain_query(query: HotQuery) -> List[str]:
+    """Stages of the winning plan for one hot query"""
+    db = Database.get_collection(query.collection).database
+    if query.count:
+        command = {"count": query.collection, "query": query.filter}
+    else:
+        command = {"find": query.collection, "filter": query.filter, "limit": 50}
+        if query.sort:
+            command["sort"] = query.sort
+    result = await db.command({"explain": command, "verbosity": "queryPlanner"})
+    return _stages(result.get("queryPlanner", {}).get("winningPlan", {}))
+
+
+async def verify_query_plans() -> Dict[str, List[str]]:
+    """explain() every hot query; raise QueryPlanError on any COLLSCAN"""
+    plans = {}
+    scans = []
+    for query in HOT_QUERIES:
+        stages = await explain_query(query)
+        plans[query.name] = stages
+        if "COLLSCAN" in stages:
+            scans.append(f"{query.name} ({query.collection})")
+            logger.error(f"❌ COLLSCAN: {query.name} on {query.collection} {query.filter}")
+        else:
+            logger.info(f"✅ {query.name}: {' <- '.join(stages)}")
+    if scans:
+        raise QueryPlanError(f"Collection scans in hot queries: {', '.join(scans)}")
+    return plans
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Apply the index manifest and check hot query plans")
+    parser.add_argument("--explain", action="store_true", help="fail if a hot query uses COLLSCAN")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    await Database.connect_db()
+    try:
+        await apply_index_manifest()
+        if args.explain:
+            await verify_query_plans()
+    finally:
+        await Database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
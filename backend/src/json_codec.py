@@ -0,0 +1,30 @@
+"""
+Fast JSON encoding for WebSocket frames
+
+Starlette's send_json goes through the stdlib json module. Game loops
+send ~30 frames per second per session, so frames are encoded with
+orjson when it is installed (stdlib json otherwise) and sent as text
+frames, which is what the frontend's JSON.parse expects.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(payload: Any) -> str:
+        return orjson.dumps(payload, default=str, option=_OPTIONS).decode()
+else:
+    def dumps(payload: Any) -> str:
+        return json.dumps(payload, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+async def send_json(websocket, payload: Any):
+    """websocket.send_json, with the fast encoder"""
+    await websocket.send_text(dumps(payload))
@@ -0,0 +1,278 @@
+"""
+Per-game leaderboards with precomputed ranks
+
+Each game type keeps a Fenwick tree of player counts indexed by (integer)
+high score, so "how many players beat X" is a prefix sum in O(log S),
+plus a small sorted top-K list for the podium. The tree only grows up to
+LEADERBOARD_DENSE_MAX_SCORE; the (few) players above it are kept in a
+sorted list, so memory follows the number of players, not the scores.
+High scores only ever go up, so both structures are kept exact by
+feeding them every improvement from /games/score; no per-user state is
+held in memory.
+
+The structures are built once at startup from game_stats using the
+high-score indexes (see src/indexes.py). Until then (or if MongoDB was
+unavailable) lookups fall back to indexed queries.
+"""
+
+import bisect
+import logging
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import DESCENDING
+
+from src.database import Database
+from src.game_stats import GAME_TYPES
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_TOP_SIZE = int(os.getenv("LEADERBOARD_TOP_SIZE", "100"))
+LEADERBOARD_INITIAL_MAX_SCORE = int(os.getenv("LEADERBOARD_INITIAL_MAX_SCORE", "1024"))
+LEADERBOARD_DENSE_MAX_SCORE = int(os.getenv("LEADERBOARD_DENSE_MAX_SCORE", "65535"))
+
+
+def _score_index(score) -> int:
+    """Integer tree index for a high score; NaN/inf would corrupt the counts"""
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not math.isfinite(score):
+        raise ValueError(f"Invalid high score: {score!r}")
+    return int(score)
+
+
+class ScoreCounts:
+    """
+    Fenwick tree of player counts per integer score, grown on demand up
+    to dense_max; higher scores go to a sorted list (one entry per player)
+    """
+
+    def __init__(self, max_score: int = LEADERBOARD_INITIAL_MAX_SCORE,
+                 dense_max: int = LEADERBOARD_DENSE_MAX_SCORE):
+        self.dense_max = dense_max
+        max_score = min(max_score, dense_max)
+        self._counts: List[int] = [0] * (max_score + 1)
+        self._tree: List[int] = [0] * (max_score + 2)
+        self._sparse: List[int] = []
+        self.total = 0
+
+    @property
+    def max_score(self) -> int:
+        return len(self._counts) - 1
+
+    def _grow(self, score: int):
+        size = len(self._counts)
+        while size <= score:
+            size *= 2
+        size = min(size, self.dense_max + 1)
+        self._counts.extend([0] * (size - len(self._counts)))
+        self._rebuild()
+
+    def _rebuild(self):
+        """O(S) construction from the raw counts"""
+        tree = [0] * (len(self._counts) + 1)
+        for i, count in enumerate(self._counts, start=1):
+            tree[i] += count
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def add(self, score: int, delta: int = 1):
+        if score > self.dense_max:
+            if delta > 0:
+                for _ in range(delta):
+                    bisect.insort(self._sparse, score)
+            else:
+                for _ in range(-delta):
+                    del self._sparse[bisect.bisect_left(self._sparse, score)]
+            self.total += delta
+            return
+        if score > self.max_score:
+            self._grow(score)
+        self._counts[score] += delta
+        self.total += delta
+        i = score + 1
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def load(self, counts: Dict[int, int]):
+        """Replace the contents with {score: players}"""
+        dense = {score: count for score, count in counts.items() if score <= self.dense_max}
+        top = max(dense, default=0)
+        size = max(min(LEADERBOARD_INITIAL_MAX_SCORE, self.dense_max) + 1, len(self._counts))
+        while size <= top:
+            size *= 2
+        self._counts = [0] * min(size, self.dense_max + 1)
+        for score, count in dense.items():
+            self._counts[score] += count
+        self._sparse = sorted(
+            score for score, count in counts.items() if score > self.dense_max for _ in range(count)
+        )
+        self.total = sum(counts.values())
+        self._rebuild()
+
+    def at_most(self, score: int) -> int:
+        """Players whose score is <= `score`"""
+        if score > self.dense_max:
+            return self.total - len(self._sparse) + bisect.bisect_right(self._sparse, score)
+        i = min(score, self.max_score) + 1
+        tree = self._tree
+        result = 0
+        while i > 0:
+            result += tree[i]
+            i -= i & -i
+        return result
+
+    def above(self, score: int) -> int:
+        """Players whose score is > `score`"""
+        return self.total - self.at_most(score)
+
+
+class GameLeaderboard:
+    """Rank structure for one game type"""
+
+    def __init__(self, game_type: str, top_size: int = LEADERBOARD_TOP_SIZE):
+        self.game_type = game_type
+        self.top_size = top_size
+        self.counts = ScoreCounts()
+        # Sorted (-score, email): best first, ties by email
+        self._top: List[Tuple[int, str]] = []
+        self._top_scores: Dict[str, int] = {}
+        self.loaded = False
+
+    @property
+    def field(self) -> str:
+        return f"{self.game_type}.high_score"
+
+    def record(self, email: str, previous_high: Optional[int], new_high: int):
+        """
+        Apply one submission. `previous_high` is None for a player's first
+        game of this type; nothing changes unless the high score went up.
+        Raises ValueError for a score that isn't a finite number.
+        """
+        new_high = _score_index(new_high)
+        if previous_high is None:
+            self.counts.add(new_high)
+        else:
+            previous_high = _score_index(previous_high)
+            if new_high <= previous_high:
+                return
+            self.counts.add(previous_high, -1)
+            self.counts.add(new_high)
+        self._update_top(email, new_high)
+
+    def _update_top(self, email: str, score: int):
+        old = self._top_scores.get(email)
+        if old is not None:
+            del self._top[bisect.bisect_left(self._top, (-old, email))]
+        elif self._top and len(self._top) >= self.top_size and (-score, email) >= self._top[-1]:
+            return  # doesn't make the podium
+
+        bisect.insort(self._top, (-score, email))
+        self._top_scores[email] = score
+        if len(self._top) > self.top_size:
+            _, dropped = self._top.pop()
+            del self._top_scores[dropped]
+
+    def rank_of(self, score: int) -> int:
+        """1-based rank a player with this high score holds (ties share a rank)"""
+        return self.counts.above(int(score)) + 1
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        return [(email, -neg) for neg, email in self._top[:limit]]
+
+    async def load(self):
+        """Build counts and podium from game_stats (players with >= 1 game)"""
+        collection = Database.get_collection("game_stats")
+        played = {f"{self.game_type}.total_games": {"$gt": 0}}
+
+        counts: Dict[int, int] = {}
+        pipeline = [
+            {"$match": played},
+            {"$group": {"_id": {"$floor": f"${self.field}"}, "players": {"$sum": 1}}}
+        ]
+        async for doc in collection.aggregate(pipeline):
+            score = int(doc["_id"] or 0)
+            counts[score] = counts.get(score, 0) + doc["players"]
+        self.counts.load(counts)
+
+        self._top = []
+        self._top_scores = {}
+        cursor = collection.find(played, {"_id": 0, "email": 1, self.field: 1})
+        cursor = cursor.sort(self.field, DESCENDING).limit(self.top_size)
+        async for doc in cursor:
+            score = int(doc[self.game_type]["high_score"])
+            self._top.append((-score, doc["email"]))
+            self._top_scores[doc["email"]] = score
+        self._top.sort()
+        self.loaded = True
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "players": self.counts.total,
+            "max_score_slots": self.counts.max_score + 1,
+            "sparse_players": len(self.counts._sparse),
+            "podium": len(self._top)
+        }
+
+
+class Leaderboards:
+    """All game types, plus the database fallbacks used before load()"""
+
+    def __init__(self):
+        self.boards = {game_type: GameLeaderboard(game_type) for game_type in GAME_TYPES}
+
+    def __getitem__(self, game_type: str) -> GameLeaderboard:
+        return self.boards[game_type]
+
+    async def load(self):
+        for board in self.boards.values():
+            await board.load()
+        logger.info(
+            "🏅 Leaderboards loaded: "
+            + ", ".join(f"{b.game_type}={b.counts.total}" for b in self.boards.values())
+        )
+
+    def record(self, game_type: str, email: str, previous_high: Optional[int], new_high: int):
+        board = self.boards[game_type]
+        if board.loaded:
+            board.record(email, previous_high, new_high)
+
+    async def top(self, game_type: str, limit: int) -> List[Tuple[str, int]]:
+        board = self.boards[game_type]
+        if board.loaded and limit <= board.top_size:
+            return board.top(limit)
+
+        cursor = Database.get_collection("game_stats").find(
+            {f"{game_type}.total_games": {"$gt": 0}},
+            {"_id": 0, "email": 1, board.field: 1}
+        ).sort(board.field, DESCENDING).limit(limit)
+        return [(doc["email"], doc[game_type]["high_score"]) async for doc in cursor]
+
+    async def players(self, game_type: str) -> int:
+        board = self.boards[game_type]
+        if board.loaded:
+            return board.counts.total
+        return await Database.get_collection("game_stats").count_documents(
+            {f"{game_type}.total_games": {"$gt": 0}}
+        )
+
+    async def rank_of(self, game_type: str, score: int) -> Tuple[int, int]:
+        """(rank, total players) for a high score"""
+        board = self.boards[game_type]
+        if board.loaded:
+            return board.rank_of(score), board.counts.total
+
+        above = await Database.get_collection("game_stats").count_documents(
+            {f"{game_type}.total_games": {"$gt": 0}, board.field: {"$gt": score}}
+        )
+        return above + 1, await self.players(game_type)
+
+    def stats(self) -> dict:
+        return {game_type: board.stats() for game_type, board in self.boards.items()}
+
+
+leaderboards = Leaderboards()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
 try:
@@ -58,6 +58,21 @@ class User(BaseModel):
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
 
+class CurrentUser(BaseModel):
+    """Read model for authenticated requests: no password hash, plain str email"""
+    id: Optional[PyObjectId] = Field(alias="_id", default=None)
+    email: str
+    full_name: str = ""
+    google_id: Optional[str] = None
+    profile_picture: Optional[str] = None
+    is_active: bool = True
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
 class UserResponse(BaseModel):
     id: str
     email: str
@@ -120,4 +135,50 @@ class SearchHistory(BaseModel):
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+        json_encoders = {ObjectId: str}
+
+
+# Response Models (serialized straight to JSON bytes by pydantic-core)
+Score = Union[int, float]
+
+class MeResponse(BaseModel):
+    email: str
+    full_name: str
+    profile_picture: Optional[str] = None
+    google_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class GameTypeStats(BaseModel):
+    high_score: Score = 0
+    total_games: int = 0
+    average_score: Score = 0
+    last_played: Optional[datetime] = None
+
+class GameStatsResponse(BaseModel):
+    stats: Dict[str, GameTypeStats]
+
+class ScoreSubmissionResponse(BaseModel):
+    success: bool
+    is_high_score: bool
+    high_score: Score
+    total_games: int
+    average_score: Score
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    name: str
+    profile_picture: Optional[str] = None
+    high_score: Score
+    is_you: bool
+
+class LeaderboardResponse(BaseModel):
+    game_type: str
+    players: int
+    leaders: List[LeaderboardEntry]
+
+class RankResponse(BaseModel):
+    game_type: str
+    rank: Optional[int] = None
+    players: Optional[int] = None
+    high_score: Score = 0
+    top_percent: Optional[float] = None
@@ -0,0 +1,122 @@
+"""
+bcrypt hashing off the event loop
+
+A bcrypt hash or verify costs 100-300 ms of CPU. Run inline in an async
+handler it freezes every WebSocket game loop on the worker, so the auth
+endpoints hand it to a small bounded executor instead. The bcrypt
+extension releases the GIL, so threads are the default; a process pool
+can be selected with PASSWORD_HASH_EXECUTOR=process.
+
+Jobs beyond PASSWORD_HASH_MAX_PENDING (running + queued) are refused
+with PasswordHasherBusy, which the API turns into a 503, instead of
+piling up an unbounded backlog of logins.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+try:
+    from passlib.context import CryptContext
+except ImportError:
+    CryptContext = None
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread").lower()
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") if CryptContext else None
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hash/verify jobs are already waiting"""
+
+
+def _hash(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        kind: str = PASSWORD_HASH_EXECUTOR,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING
+    ):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[Executor] = None
+        self.pending = 0
+
+        self.completed = 0
+        self.rejected = 0
+        self.max_seen_pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+            logger.info(f"🔐 Password hasher: {self.workers} {self.kind} workers")
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        if _pwd_context is None:
+            raise RuntimeError("passlib is not installed")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy(f"{self.pending} password jobs pending")
+
+        loop = asyncio.get_running_loop()
+        future = self._get_executor().submit(fn, *args)
+        self.pending += 1
+        self.max_seen_pending = max(self.max_seen_pending, self.pending)
+        # Release the slot when the worker is really done, even if the
+        # request awaiting it was cancelled in the meantime
+        future.add_done_callback(lambda _: self._on_done(loop))
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, loop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # loop already closed at shutdown
+
+    def _release(self):
+        self.pending -= 1
+        self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(_verify, password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "max_seen_pending": self.max_seen_pending,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,154 @@
+"""
+Price history: append-only price observations plus per-route daily aggregates
+
+Every fresh upstream answer (not simulated, not served from the flight
+cache) is appended to `price_observations` keyed by route, flight date and
+observation time. `route_daily_prices` keeps one document per
+(route, flight_date) with running min/max/sum/count that is updated
+incrementally on insert, so "cheapest day this month" and price
+trends are index lookups instead of fresh upstream fan-outs.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from pymongo import ASCENDING, UpdateOne
+
+from src.database import Database
+
+logger = logging.getLogger(__name__)
+
+OBSERVATIONS_COLLECTION = "price_observations"
+DAILY_COLLECTION = "route_daily_prices"
+
+
+def route_key(origin: str, destination: str) -> str:
+    return f"{origin.upper()}-{destination.upper()}"
+
+
+async def record_observations(
+    origin: str,
+    destination: str,
+    flights: Iterable,
+    observed_at: Optional[datetime] = None
+) -> int:
+    """
+    Append observations for real flights and fold them into the daily
+    aggregates. Simulated fallback flights are skipped. Returns the number
+    of observations stored.
+    """
+    observed_at = observed_at or datetime.utcnow()
+    route = route_key(origin, destination)
+
+    docs = []
+    per_day = {}
+    for flight in flights:
+        if flight.simulated:
+            continue
+        price = flight.price_cents
+        docs.append({
+            "route": route,
+            "flight_date": flight.date,
+            "observed_at": observed_at,
+            "airline": flight.airline,
+            "flight_number": flight.flight_number,
+            "price_cents": price
+        })
+
+        day = per_day.get(flight.date)
+        if day is None:
+            per_day[flight.date] = [price, price, price, 1]
+        else:
+            day[0] = min(day[0], price)
+            day[1] = max(day[1], price)
+            day[2] += price
+            day[3] += 1
+
+    if not docs:
+        return 0
+
+    await Database.get_collection(OBSERVATIONS_COLLECTION).insert_many(docs, ordered=False)
+
+    updates = [
+        UpdateOne(
+            {"_id": f"{route}:{flight_date}"},
+            {
+                "$min": {"min_price_cents": low},
+                "$max": {"max_price_cents": high},
+                "$inc": {"sum_price_cents": total, "observations": count},
+                "$set": {"last_observed_at": observed_at},
+                "$setOnInsert": {"route": route, "flight_date": flight_date}
+            },
+            upsert=True
+        )
+        for flight_date, (low, high, total, count) in per_day.items()
+    ]
+    await Database.get_collection(DAILY_COLLECTION).bulk_write(updates, ordered=False)
+    return len(docs)
+
+
+def _daily_summary(doc: dict) -> dict:
+    observations = doc.get("observations", 0)
+    return {
+        "flight_date": doc["flight_date"],
+        "min_price": doc["min_price_cents"] / 100,
+        "max_price": doc["max_price_cents"] / 100,
+        "avg_price": round(doc["sum_price_cents"] / observations / 100, 2) if observations else 0,
+        "observations": observations,
+        "last_observed_at": doc.get("last_observed_at")
+    }
+
+
+async def cheapest_days(
+    origin: str,
+    destination: str,
+    start_date: str,
+    end_date: str,
+    limit: int = 5
+) -> List[dict]:
+    """Cheapest known flight dates for a route within [start_date, end_date]"""
+    cursor = Database.get_collection(DAILY_COLLECTION).find(
+        {
+            "route": route_key(origin, destination),
+            "flight_date": {"$gte": start_date, "$lte": end_date}
+        },
+        {"_id": 0}
+    ).sort("min_price_cents", ASCENDING).limit(limit)
+    return [_daily_summary(doc) async for doc in cursor]
+
+
+async def daily_prices(origin: str, destination: str, start_date: str, end_date: str) -> List[dict]:
+    """Per-day aggregates for a route in date order"""
+    cursor = Database.get_collection(DAILY_COLLECTION).find(
+        {
+            "route": route_key(origin, destination),
+            "flight_date": {"$gte": start_date, "$lte": end_date}
+        },
+        {"_id": 0}
+    ).sort("flight_date", ASCENDING)
+    return [_daily_summary(doc) async for doc in cursor]
+
+
+async def price_trend(origin: str, destination: str, flight_date: str) -> List[dict]:
+    """How the cheapest fare for one flight date moved across observation days"""
+    pipeline = [
+        {"$match": {"route": route_key(origin, destination), "flight_date": flight_date}},
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$observed_at"}},
+            "min_price_cents": {"$min": "$price_cents"},
+            "avg_price_cents": {"$avg": "$price_cents"},
+            "observations": {"$sum": 1}
+        }},
+        {"$sort": {"_id": 1}}
+    ]
+    cursor = Database.get_collection(OBSERVATIONS_COLLECTION).aggregate(pipeline)
+    return [
+        {
+            "observed_on": doc["_id"],
+            "min_price": doc["min_price_cents"] / 100,
+            "avg_price": round(doc["avg_price_cents"] / 100, 2),
+            "observations": doc["observations"]
+        }
+        async for doc in cursor
+    ]
@@ -0,0 +1,304 @@
+"""
+Client-side rate limiting and quota accounting for upstream APIs
+
+TokenBucket smooths bursts to the provider's per-second limit by queueing
+callers in arrival order instead of failing them. QuotaLedger tracks the
+monthly request budget in MongoDB so every worker sees the same count.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+AVIATIONSTACK_RATE_PER_SECOND = float(os.getenv("AVIATIONSTACK_RATE_PER_SECOND", "5"))
+AVIATIONSTACK_BURST = int(os.getenv("AVIATIONSTACK_BURST", "5"))
+AVIATIONSTACK_MAX_QUEUE_WAIT = float(os.getenv("AVIATIONSTACK_MAX_QUEUE_WAIT", "30"))
+AVIATIONSTACK_MONTHLY_QUOTA = int(os.getenv("AVIATIONSTACK_MONTHLY_QUOTA", "100"))
+QUOTA_EXHAUSTED_RECHECK_SECONDS = float(os.getenv("QUOTA_EXHAUSTED_RECHECK_SECONDS", "60"))
+QUOTA_COLLECTION = "api_quota"
+
+
+class RateLimitExceeded(Exception):
+    """The wait for a token would exceed the configured queue limit"""
+
+
+class QuotaExhaustedError(Exception):
+    """The monthly request budget for the provider is used up"""
+
+
+class TokenBucket:
+    """
+    Token bucket where callers reserve future tokens.
+
+    Each acquire takes a token immediately, letting the balance go negative;
+    the deficit tells the caller how long to sleep. Because reservations are
+    handed out under a lock, waiters are served strictly in arrival order and
+    the same bucket works for threads and coroutines alike.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        max_wait: float = AVIATIONSTACK_MAX_QUEUE_WAIT,
+        name: str = "bucket"
+    ):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, capacity)
+        self.max_wait = max_wait
+        self.name = name
+
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.granted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > self.max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(f"{self.name}: queue wait {wait:.1f}s exceeds {self.max_wait:.1f}s")
+
+            self._tokens -= 1
+            self.granted += 1
+            if wait > 0:
+                self.queued += 1
+                self.total_wait += wait
+            return wait
+
+    def _refund(self):
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self):
+        """Blocking acquire for the synchronous scraper"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Non-blocking acquire; a cancelled waiter hands its slot back"""
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund()
+                raise
+
+    def penalize(self, seconds: float):
+        """Drain the bucket after the provider reports we went too fast"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            tokens = self._tokens
+        return {
+            "name": self.name,
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "available_tokens": round(tokens, 2),
+            "granted": self.granted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.total_wait / self.queued * 1000, 2) if self.queued else 0.0
+        }
+
+
+class QuotaLedger:
+    """
+    Monthly request budget persisted in MongoDB (one document per month).
+
+    The async path increments the shared counter atomically. The blocking
+    scraper can't await Motor, so it counts locally and the pending total
+    is folded into the next async increment (or flushed on shutdown).
+    Once the budget is used up, consume() answers from the local count and
+    only re-reads the ledger every recheck_seconds to notice a reset.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        monthly_limit: int,
+        collection_name: str = QUOTA_COLLECTION,
+        recheck_seconds: float = QUOTA_EXHAUSTED_RECHECK_SECONDS
+    ):
+        self.provider = provider
+        self.monthly_limit = monthly_limit
+        self.collection_name = collection_name
+        self.recheck_seconds = recheck_seconds
+        self._next_recheck = 0.0
+
+        self._lock = threading.Lock()
+        self._period = self._current_period()
+        self._used = 0
+        self._pending = 0
+
+    @staticmethod
+    def _current_period() -> str:
+        return datetime.utcnow().strftime("%Y-%m")
+
+    def _doc_id(self) -> str:
+        return f"{self.provider}:{self._period}"
+
+    def _collection(self):
+        from src.database import Database
+
+        if Database.client is None:
+            return None
+        return Database.get_collection(self.collection_name)
+
+    def _roll_period(self):
+        period = self._current_period()
+        if period != self._period:
+            self._period = period
+            self._used = 0
+            self._pending = 0
+
+    def remaining(self) -> int:
+        """Requests left this month, as last seen by this process"""
+        with self._lock:
+            self._roll_period()
+            return max(0, self.monthly_limit - self._used - self._pending)
+
+    def try_consume_local(self) -> bool:
+        """Count one request without touching the database"""
+        with self._lock:
+            self._roll_period()
+            if self._used + self._pending >= self.monthly_limit:
+                return False
+            self._pending += 1
+            return True
+
+    def mark_exhausted(self):
+        """Provider says the budget is gone; trust it over our own count"""
+        with self._lock:
+            self._used = max(self._used, self.monthly_limit)
+            self._pending = 0
+
+    async def consume(self) -> bool:
+        """Atomically take one request from the shared monthly budget"""
+        collection = self._collection()
+        if collection is None:
+            return self.try_consume_local()
+
+        with self._lock:
+            self._roll_period()
+            exhausted = self._used >= self.monthly_limit
+            recheck = exhausted and time.monotonic() >= self._next_recheck
+            if recheck:
+                self._next_recheck = time.monotonic() + self.recheck_seconds
+        if exhausted:
+            if not recheck:
+                return False
+            try:
+                if await self.refresh() <= 0:
+                    return False
+            except Exception as e:
+                logger.warning(f"⚠️ Quota ledger unavailable: {e}")
+                return False
+
+        with self._lock:
+            doc_id = self._doc_id()
+            increment = self._pending + 1
+            self._pending = 0
+
+        try:
+            from pymongo import ReturnDocument
+
+            doc = await collection.find_one_and_update(
+                {"_id": doc_id},
+                {
+                    "$inc": {"used": increment},
+                    "$set": {"limit": self.monthly_limit, "updated_at": datetime.utcnow()}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Quota ledger unavailable, counting locally: {e}")
+            with self._lock:
+                self._pending += increment - 1
+            return self.try_consume_local()
+
+        used = doc.get("used", increment)
+        if used > self.monthly_limit:
+            # Over budget: give back the request we didn't get to make
+            await collection.update_one({"_id": doc_id}, {"$inc": {"used": -1}})
+            used -= 1
+            allowed = False
+        else:
+            allowed = True
+
+        with self._lock:
+            self._used = used
+        return allowed
+
+    async def flush(self):
+        """Persist requests counted by the blocking scraper"""
+        collection = self._collection()
+        with self._lock:
+            increment = self._pending
+            if collection is None or not increment:
+                return
+            self._pending = 0
+            doc_id = self._doc_id()
+            self._used += increment
+
+        await collection.update_one(
+            {"_id": doc_id},
+            {
+                "$inc": {"used": increment},
+                "$set": {"limit": self.monthly_limit, "updated_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+
+    async def refresh(self) -> int:
+        """Reload the shared counter and return the remaining budget"""
+        collection = self._collection()
+        if collection is not None:
+            with self._lock:
+                self._roll_period()
+                doc_id = self._doc_id()
+            doc = await collection.find_one({"_id": doc_id}, {"used": 1})
+            with self._lock:
+                self._used = doc.get("used", 0) if doc else 0
+        return self.remaining()
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider,
+            "period": self._period,
+            "monthly_limit": self.monthly_limit,
+            "used": self._used + self._pending,
+            "remaining": self.remaining()
+        }
+
+
+# Shared by every scraper instance in the process
+aviationstack_limiter = TokenBucket(
+    rate=AVIATIONSTACK_RATE_PER_SECOND,
+    capacity=AVIATIONSTACK_BURST,
+    name="aviationstack"
+)
+aviationstack_quota = QuotaLedger("aviationstack", AVIATIONSTACK_MONTHLY_QUOTA)
@@ -0,0 +1,296 @@
+"""
+Write-behind buffer for game score submissions
+
+Finished games are folded into an in-memory view per (email, game_type)
+and coalesced into one pending update per key. A background task flushes
+the pending updates with a single bulk_write when the buffer reaches a
+size threshold or a time interval elapses, and the shutdown hook does a
+final flush. The response (high score flag, totals, average) is computed
+from the in-memory view, which is seeded from MongoDB on first use.
+
+Opt-in (SCORE_WRITE_BEHIND=true): a crash between flushes loses scores
+that were already acknowledged, up to SCORE_FLUSH_INTERVAL worth.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.cache import TTLCache
+from src.database import Database
+from src.game_stats import score_update_pipeline
+
+logger = logging.getLogger(__name__)
+
+SCORE_WRITE_BEHIND = os.getenv("SCORE_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+SCORE_FLUSH_INTERVAL = float(os.getenv("SCORE_FLUSH_INTERVAL", "1.0"))
+SCORE_FLUSH_MAX_PENDING = int(os.getenv("SCORE_FLUSH_MAX_PENDING", "500"))
+SCORE_VIEW_TTL = float(os.getenv("SCORE_VIEW_TTL", "300"))
+SCORE_VIEW_MAX_ENTRIES = int(os.getenv("SCORE_VIEW_MAX_ENTRIES", "50000"))
+
+ScoreKey = Tuple[str, str]
+
+
+class PendingScores:
+    """Coalesced, not yet persisted results for one (email, game_type)"""
+
+    __slots__ = ("games", "total_score", "high_score", "last_played")
+
+    def __init__(self):
+        self.games = 0
+        self.total_score = 0
+        self.high_score = 0
+        self.last_played: Optional[datetime] = None
+
+    def add(self, score, played_at: datetime):
+        self.games += 1
+        self.total_score += score
+        self.high_score = max(self.high_score, score)
+        self.last_played = played_at
+
+    def merge(self, other: "PendingScores"):
+        self.games += other.games
+        self.total_score += other.total_score
+        self.high_score = max(self.high_score, other.high_score)
+        if other.last_played and (self.last_played is None or other.last_played > self.last_played):
+            self.last_played = other.last_played
+
+
+class ScoreWriteBuffer:
+    def __init__(
+        self,
+        collection_name: str = "game_stats",
+        flush_interval: float = SCORE_FLUSH_INTERVAL,
+        max_pending: int = SCORE_FLUSH_MAX_PENDING
+    ):
+        self.collection_name = collection_name
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+
+        # Persisted stats as last read from / written to MongoDB
+        self._views = TTLCache(SCORE_VIEW_MAX_ENTRIES, SCORE_VIEW_TTL, name="score_views")
+        self._loading: Dict[ScoreKey, asyncio.Future] = {}
+        self._pending: Dict[ScoreKey, PendingScores] = {}
+        self._inflight: Dict[ScoreKey, PendingScores] = {}
+
+        self._flush_lock = asyncio.Lock()
+        self._flush_generation = 0
+        self._task: Optional[asyncio.Task] = None
+        # Size-triggered flushes; the loop only keeps weak references to tasks
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        self.submissions = 0
+        self.flushes = 0
+        self.flushed_keys = 0
+        self.flush_failures = 0
+
+    def _collection(self):
+        return Database.get_collection(self.collection_name)
+
+    # ----- lifecycle -----
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the timer and flush everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+        if self._pending:
+            logger.error(f"❌ {len(self._pending)} score updates could not be flushed on shutdown")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Score flush loop error: {e}")
+
+    # ----- reads -----
+
+    async def _persisted(self, key: ScoreKey) -> dict:
+        """Persisted stats for a key, loading once per TTL with a narrow projection"""
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        loading = self._loading.get(key)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            if key in self._inflight:
+                # Don't read a document that a running flush is about to change
+                async with self._flush_lock:
+                    pass
+            generation = self._flush_generation
+            view = await self._read(key)
+            if self._flush_generation != generation:
+                # A flush started during the read and may have written this
+                # key after it; read again with no flush running
+                async with self._flush_lock:
+                    view = await self._read(key)
+            self._views.set(key, view)
+            future.set_result(view)
+            return view
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(key, None)
+
+    async def _read(self, key: ScoreKey) -> dict:
+        email, game_type = key
+        doc = await self._collection().find_one(
+            {"email": email},
+            {"_id": 0, f"{game_type}.high_score": 1, f"{game_type}.total_games": 1, f"{game_type}.total_score": 1}
+        )
+        stats = (doc or {}).get(game_type) or {}
+        return {
+            "high_score": stats.get("high_score", 0),
+            "total_games": stats.get("total_games", 0),
+            "total_score": stats.get("total_score", 0)
+        }
+
+    def overlay(self, email: str, game_type: str, stats: dict) -> dict:
+        """Apply not-yet-flushed results on top of stats read from MongoDB"""
+        pending = self._pending.get((email, game_type))
+        if pending is None:
+            return stats
+        stats = dict(stats)
+        stats["total_games"] = stats.get("total_games", 0) + pending.games
+        stats["total_score"] = stats.get("total_score", 0) + pending.total_score
+        stats["high_score"] = max(stats.get("high_score", 0), pending.high_score)
+        stats["average_score"] = round(stats["total_score"] / stats["total_games"], 2)
+        stats["last_played"] = pending.last_played
+        return stats
+
+    # ----- writes -----
+
+    async def submit(self, email: str, game_type: str, score) -> dict:
+        """Buffer one finished game and return the up-to-date stats"""
+        key = (email, game_type)
+        view = await self._persisted(key)
+
+        # Persisted view + results being flushed right now + still buffered
+        unflushed = PendingScores()
+        for source in (self._inflight, self._pending):
+            if key in source:
+                unflushed.merge(source[key])
+        previous_high = max(view["high_score"], unflushed.high_score)
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingScores()
+        pending.add(score, datetime.utcnow())
+        unflushed.add(score, pending.last_played)
+        self.submissions += 1
+
+        total_games = view["total_games"] + unflushed.games
+        total_score = view["total_score"] + unflushed.total_score
+        result = {
+            "is_high_score": score > previous_high,
+            "previous_high_score": previous_high if view["total_games"] + unflushed.games > 1 else None,
+            "high_score": max(previous_high, score),
+            "total_games": total_games,
+            "average_score": round(total_score / total_games, 2)
+        }
+
+        if len(self._pending) >= self.max_pending and not self._flush_lock.locked():
+            task = asyncio.create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+        return result
+
+    async def flush(self) -> int:
+        """Write all pending updates in one bulk_write; returns keys flushed"""
+        async with self._flush_lock:
+            if not self._pending or Database.client is None:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            self._flush_generation += 1
+            try:
+                return await self._write(batch)
+            finally:
+                self._inflight = {}
+
+    async def _write(self, batch: Dict[ScoreKey, PendingScores]) -> int:
+        items = list(batch.items())
+        requests = [
+            UpdateOne(
+                {"email": email},
+                score_update_pipeline(game_type, p.games, p.total_score, p.high_score, p.last_played),
+                upsert=True
+            )
+            for (email, game_type), p in items
+        ]
+
+        try:
+            await self._collection().bulk_write(requests, ordered=False)
+            failed = set()
+        except BulkWriteError as e:
+            # Unordered: every request not listed in writeErrors was applied
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            self.flush_failures += 1
+            logger.error(f"❌ Score flush: {len(failed)} of {len(items)} updates failed, will retry them")
+        except Exception as e:
+            # Nothing is known to be applied: keep the whole batch
+            self.flush_failures += 1
+            logger.error(f"❌ Score flush failed, will retry: {e}")
+            self._requeue(items)
+            return 0
+
+        self._requeue([items[i] for i in sorted(failed)])
+        applied = [item for i, item in enumerate(items) if i not in failed]
+
+        # The persisted view now includes the flushed results
+        for key, pending in applied:
+            view = self._views.get(key)
+            if view is not None:
+                view["total_games"] += pending.games
+                view["total_score"] += pending.total_score
+                view["high_score"] = max(view["high_score"], pending.high_score)
+
+        self.flushes += 1
+        self.flushed_keys += len(applied)
+        return len(applied)
+
+    def _requeue(self, items):
+        """Put unwritten results back in front of anything buffered meanwhile"""
+        for key, pending in items:
+            newer = self._pending.get(key)
+            if newer is not None:
+                pending.merge(newer)
+            self._pending[key] = pending
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "pending_keys": len(self._pending),
+            "submissions": self.submissions,
+            "flushes": self.flushes,
+            "flushed_keys": self.flushed_keys,
+            "flush_failures": self.flush_failures,
+            "views": self._views.stats()
+        }
+
+
+score_buffer = ScoreWriteBuffer()
@@ -0,0 +1,287 @@
+"""
+Background search jobs for long date-range searches
+
+A multi-week search is submitted as a job and answered immediately with a
+job id. A fixed pool of asyncio workers runs the jobs; each finished day is
+published as an event so clients can stream results over a WebSocket as
+they arrive instead of waiting for the whole range.
+
+Identical searches share one job. Each job records the users subscribed
+to it; only they can see or stream it, and cancelling only detaches the
+caller until the last subscriber leaves.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from src.data_processor import FlightStatsAggregator
+from src.flight_scraper import AsyncFlightScraper
+
+logger = logging.getLogger(__name__)
+
+SEARCH_JOB_WORKERS = int(os.getenv("SEARCH_JOB_WORKERS", "4"))
+SEARCH_JOB_MAX_QUEUED = int(os.getenv("SEARCH_JOB_MAX_QUEUED", "100"))
+SEARCH_JOB_RETENTION_SECONDS = int(os.getenv("SEARCH_JOB_RETENTION_SECONDS", "600"))
+
+JobKey = Tuple[str, str, str, str]
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Too many searches are already waiting for a worker"""
+
+
+class SearchJob:
+    """State and event log of one date-range search"""
+
+    def __init__(self, key: JobKey, days_total: int, email: str):
+        self.id = str(uuid.uuid4())
+        self.key = key
+        self.subscribers: Set[str] = {email}
+        self.status = QUEUED
+        self.days_total = days_total
+        self.days_done = 0
+        self.error: Optional[str] = None
+        self.analysis: Optional[dict] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.first_result_at: Optional[float] = None
+
+        self.events: List[dict] = []
+        self._listeners: Set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def publish(self, event: dict):
+        self.events.append(event)
+        for queue in self._listeners:
+            queue.put_nowait(event)
+
+    def finish(self, status: str, **fields):
+        self.status = status
+        self.finished_at = time.time()
+        self.publish({"type": status, "job_id": self.id, **fields})
+
+    async def stream(self) -> AsyncIterator[dict]:
+        """Replay past events, then follow live ones until the job finishes"""
+        # Snapshot + subscribe without awaiting in between, so nothing is missed
+        backlog = list(self.events)
+        queue: Optional[asyncio.Queue] = None
+        if not self.finished:
+            queue = asyncio.Queue()
+            self._listeners.add(queue)
+
+        try:
+            for event in backlog:
+                yield event
+            if queue is None:
+                return
+            while True:
+                event = await queue.get()
+                yield event
+                if event["type"] in FINISHED_STATES:
+                    return
+        finally:
+            if queue is not None:
+                self._listeners.discard(queue)
+
+    def summary(self) -> dict:
+        origin, destination, start_date, end_date = self.key
+        summary = {
+            "job_id": self.id,
+            "status": self.status,
+            "origin": origin,
+            "destination": destination,
+            "start_date": start_date,
+            "end_date": end_date,
+            "days_total": self.days_total,
+            "days_done": self.days_done,
+            "error": self.error,
+            "analysis": self.analysis
+        }
+        if self.first_result_at is not None:
+            summary["time_to_first_result_ms"] = round((self.first_result_at - self.created_at) * 1000)
+        return summary
+
+
+class SearchJobManager:
+    """In-process job queue with a bounded pool of asyncio workers"""
+
+    def __init__(
+        self,
+        workers: int = SEARCH_JOB_WORKERS,
+        max_queued: int = SEARCH_JOB_MAX_QUEUED,
+        retention_seconds: int = SEARCH_JOB_RETENTION_SECONDS
+    ):
+        self.worker_count = max(1, workers)
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+
+        self.jobs: Dict[str, SearchJob] = {}
+        self._by_key: Dict[JobKey, SearchJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self.deduplicated = 0
+
+    def start(self):
+        """Spawn the worker tasks (idempotent; needs a running loop)"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        logger.info(f"🧵 Search job workers started: {self.worker_count}")
+
+    async def shutdown(self):
+        """Cancel running jobs and stop the workers"""
+        for job in self.jobs.values():
+            if not job.finished:
+                job.finish(CANCELLED, reason="server shutdown")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(
+        self, email: str, origin: str, destination: str, start_date: str, end_date: str, days_total: int
+    ) -> Tuple[SearchJob, bool]:
+        """Queue a search for a user; returns (job, deduplicated)"""
+        self.start()
+        self._expire_finished()
+
+        key = (origin.upper(), destination.upper(), start_date, end_date)
+        existing = self._by_key.get(key)
+        if existing is not None and existing.status not in (FAILED, CANCELLED):
+            self.deduplicated += 1
+            existing.subscribers.add(email)
+            return existing, True
+
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull(f"{self._queue.qsize()} searches already queued")
+
+        job = SearchJob(key, days_total, email)
+        self.jobs[job.id] = job
+        self._by_key[key] = job
+        self._queue.put_nowait(job)
+        job.publish({"type": QUEUED, "job_id": job.id, "days_total": days_total})
+        return job, False
+
+    def get(self, job_id: str, email: Optional[str] = None) -> Optional[SearchJob]:
+        """A job by id; with an email, only if that user is subscribed to it"""
+        job = self.jobs.get(job_id)
+        if job is not None and email is not None and email not in job.subscribers:
+            return None
+        return job
+
+    def unsubscribe(self, job_id: str, email: str) -> bool:
+        """Detach a user; the job is cancelled once nobody is subscribed. Returns False if not subscribed"""
+        job = self.get(job_id, email)
+        if job is None:
+            return False
+        job.subscribers.discard(email)
+        if not job.subscribers:
+            self.cancel(job_id)
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it already finished"""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        if job.task is not None:
+            job.task.cancel()  # the worker records the cancellation
+        else:
+            job.finish(CANCELLED)
+        return True
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.finished:  # cancelled while queued
+                    continue
+                # Run each job in its own task so cancelling a job never
+                # cancels the worker that is waiting on it
+                job.task = asyncio.create_task(self._run(job))
+                try:
+                    await asyncio.wait({job.task})
+                except asyncio.CancelledError:
+                    job.task.cancel()
+                    raise
+                if job.task.cancelled() and not job.finished:
+                    job.finish(CANCELLED)
+            finally:
+                job.task = None
+                self._queue.task_done()
+
+    async def _run(self, job: SearchJob):
+        origin, destination, start_date, end_date = job.key
+        job.status = RUNNING
+        job.publish({"type": RUNNING, "job_id": job.id})
+
+        scraper = AsyncFlightScraper(record_prices=True)
+        aggregator = FlightStatsAggregator()
+        try:
+            async for date_str, flights in scraper.iter_best_deals(origin, destination, start_date, end_date):
+                aggregator.update(flights)
+                job.days_done += 1
+                if job.first_result_at is None:
+                    job.first_result_at = time.time()
+                job.publish({
+                    "type": "day",
+                    "job_id": job.id,
+                    "date": date_str,
+                    "flights": [flight.to_dict() for flight in flights],
+                    "days_done": job.days_done,
+                    "days_total": job.days_total
+                })
+        except Exception as e:
+            logger.error(f"❌ Search job {job.id} failed: {e}")
+            job.error = str(e)
+            job.finish(FAILED, error=job.error)
+            return
+
+        job.analysis = aggregator.result()
+        job.finish(COMPLETED, analysis=job.analysis)
+
+    def _expire_finished(self):
+        """Forget finished jobs older than the retention window"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job for job in self.jobs.values()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job in expired:
+            del self.jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    def stats(self) -> dict:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": counts,
+            "deduplicated": self.deduplicated
+        }
+
+
+search_jobs = SearchJobManager()
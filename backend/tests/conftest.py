@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the app modules the way api.py does: from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import Database  # noqa: E402
+from src.models import CurrentUser  # noqa: E402
+
+
+def _patch_mongomock():
+    """Teach mongomock the two bits of MongoDB the app uses that it lacks"""
+    import mongomock.aggregate as aggregate
+    import mongomock.collection as collection
+
+    if "$round" not in aggregate.arithmetic_operators:
+        # {"$round": [value, places]} in update pipelines (score averages)
+        aggregate.binary_arithmetic_operators.add("$round")
+        aggregate.arithmetic_operators.add("$round")
+        handle = aggregate._Parser._handle_arithmetic_operator
+
+        def _handle_arithmetic_operator(self, operator, values):
+            if operator == "$round":
+                number, places = self.parse_many(values)
+                return None if number is None else round(number, places)
+            return handle(self, operator, values)
+
+        aggregate._Parser._handle_arithmetic_operator = _handle_arithmetic_operator
+
+    # pymongo >= 4.9 passes sort= to UpdateOne in bulk writes
+    add_update = collection.BulkOperationBuilder.add_update
+    if not getattr(add_update, "accepts_sort", False):
+        def _add_update(self, *args, sort=None, **kwargs):
+            return add_update(self, *args, **kwargs)
+        _add_update.accepts_sort = True
+        collection.BulkOperationBuilder.add_update = _add_update
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A fresh in-memory MongoDB behind src.database.Database"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    _patch_mongomock()
+    monkeypatch.setattr(Database, "client", mongomock_motor.AsyncMongoMockClient())
+    monkeypatch.setattr(Database, "database", None)
+    monkeypatch.setattr(Database, "_collections", {})
+    return Database
+
+
+@pytest.fixture
+def user():
+    """Signed-in user for API requests"""
+    import api
+    from src.auth import get_current_user
+
+    current = CurrentUser(email="player@skyracer.dev", full_name="Player", hashed_password="")
+    api.app.dependency_overrides[get_current_user] = lambda: current
+    yield current
+    api.app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,25 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+@pytest.fixture
+def client(db, user):
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize("raw_score", ["NaN", "Infinity", "-Infinity", "true", "false", "-1", '"10"', "null"])
+def test_rejects_invalid_scores(client, user, raw_score):
+    response = client.post(
+        "/games/score",
+        content=f'{{"game_type": "voice", "score": {raw_score}}}',
+        headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 400
+    assert (user.email, "voice") not in api.score_buffer._pending
+
+
+def test_rejects_scores_above_maximum(client):
+    response = client.post("/games/score", json={"game_type": "voice", "score": api.MAX_GAME_SCORE + 1})
+    assert response.status_code == 400
@@ -0,0 +1,29 @@
+import pytest
+
+from src.leaderboard import GameLeaderboard
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), float("-inf"), True, "12"])
+def test_record_rejects_non_finite_scores(bad):
+    board = GameLeaderboard("voice")
+    board.record("first@skyracer.dev", None, 10)
+
+    with pytest.raises(ValueError):
+        board.record("second@skyracer.dev", None, bad)
+    with pytest.raises(ValueError):
+        board.record("first@skyracer.dev", bad, 20)
+
+    assert board.counts.total == 1
+    assert board.top(10) == [("first@skyracer.dev", 10)]
+    assert board.rank_of(10) == 1
+
+
+def test_record_keeps_ranks_for_large_scores():
+    board = GameLeaderboard("voice")
+    board.record("first@skyracer.dev", None, 10)
+    board.record("second@skyracer.dev", None, 5)
+    board.record("second@skyracer.dev", 5, 10 ** 9)
+
+    assert board.counts.total == 2
+    assert board.rank_of(10 ** 9) == 1
+    assert board.rank_of(10) == 2
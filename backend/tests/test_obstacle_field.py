@@ -0,0 +1,24 @@
+from games.gesture_game import VectorizedGestureEngine
+from games.obstacle_field import ObstacleField
+
+
+def test_attach_beyond_initial_slots():
+    field = ObstacleField(slots=2)
+    games = [VectorizedGestureEngine(field=field) for _ in range(2)]
+    for game in games:
+        game.start_game()
+        game.get_game_state()  # builds the per-slot row index
+
+    extra = [VectorizedGestureEngine(field=field) for _ in range(3)]
+    for game in extra:
+        game.start_game()
+        assert game.obstacle_count() == 0
+    for game in extra:
+        field.spawn(game.slot, 100.0, 50, 40, 40, 2.0, "bird", obstacle_id=game.slot)
+
+    for game in games:
+        assert game.obstacle_count() == 0
+    for game in extra:
+        assert game.obstacle_count() == 1
+        assert [o["id"] for o in game.get_game_state()["obstacles"]] == [game.slot]
+    assert field.stats()["games"] == 5
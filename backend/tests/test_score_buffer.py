@@ -0,0 +1,75 @@
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+from src.score_buffer import ScoreWriteBuffer
+
+EMAIL = "player@skyracer.dev"
+
+
+async def stored(db, email=EMAIL):
+    doc = await db.get_collection("game_stats").find_one({"email": email})
+    return doc["voice"] if doc else None
+
+
+def test_stop_flushes_buffered_scores(db):
+    buffer = ScoreWriteBuffer(flush_interval=3600, max_pending=10_000)
+
+    async def scenario():
+        buffer.start()
+        for score in (5, 40, 15):
+            await buffer.submit(EMAIL, "voice", score)
+        before = await stored(db)
+        await buffer.stop()
+        return before, await stored(db)
+
+    before, after = asyncio.run(scenario())
+    assert before is None
+    assert (after["total_games"], after["total_score"], after["high_score"]) == (3, 60, 40)
+    assert buffer.stats()["pending_keys"] == 0
+
+
+def test_stop_waits_for_size_triggered_flushes(db):
+    buffer = ScoreWriteBuffer(flush_interval=3600, max_pending=1)
+
+    async def scenario():
+        await buffer.submit(EMAIL, "voice", 7)
+        tracked = len(buffer._flush_tasks)
+        await buffer.stop()
+        return tracked, await stored(db)
+
+    tracked, after = asyncio.run(scenario())
+    assert tracked == 1
+    assert not buffer._flush_tasks
+    assert after["total_games"] == 1
+    assert buffer.flushes == 1
+
+
+def test_partial_bulk_failure_requeues_only_failed_keys(db):
+    buffer = ScoreWriteBuffer(flush_interval=3600, max_pending=10_000)
+    collection = db.get_collection("game_stats")
+    bulk_write = collection.bulk_write
+    calls = []
+
+    async def failing_second(requests, ordered):
+        calls.append(len(requests))
+        if len(calls) == 1:
+            await bulk_write(requests[:1], ordered=ordered)
+            raise BulkWriteError({"writeErrors": [{"index": 1, "code": 1, "errmsg": "boom"}]})
+        return await bulk_write(requests, ordered=ordered)
+
+    collection.bulk_write = failing_second
+
+    async def scenario():
+        await buffer.submit("first@skyracer.dev", "voice", 10)
+        await buffer.submit("second@skyracer.dev", "voice", 20)
+        flushed = await buffer.flush()
+        pending = list(buffer._pending)
+        await buffer.flush()
+        return flushed, pending, await stored(db, "first@skyracer.dev"), await stored(db, "second@skyracer.dev")
+
+    flushed, pending, first, second = asyncio.run(scenario())
+    assert flushed == 1
+    assert pending == [("second@skyracer.dev", "voice")]
+    assert calls == [2, 1]
+    assert first["total_games"] == 1 and second["total_games"] == 1
@@ -0,0 +1,82 @@
+"""N simultaneous submissions for one user must all be recorded, on both write paths"""
+
+import asyncio
+
+import pytest
+
+import api
+from src.score_buffer import ScoreWriteBuffer
+
+N = 200
+SCORES = [10 + i % 50 for i in range(N)]
+
+
+class YieldingCollection:
+    """mongomock answers without suspending; yield first so submissions interleave"""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0)
+            return await method(*args, **kwargs)
+        return call
+
+
+@pytest.fixture(autouse=True)
+def yielding_game_stats(db):
+    db.get_database()
+    db._collections["game_stats"] = YieldingCollection(db.get_database()["game_stats"])
+
+
+async def submit_all(user):
+    return await asyncio.gather(*(
+        api.submit_game_score({"game_type": "gesture", "score": score}, user) for score in SCORES
+    ))
+
+
+async def stored_stats(db, user):
+    doc = await db.get_collection("game_stats").find_one({"email": user.email})
+    return doc["gesture"]
+
+
+def check(results, stats):
+    assert all(result["success"] for result in results)
+    # Every submission saw its own game counted exactly once
+    assert sorted(result["total_games"] for result in results) == list(range(1, N + 1))
+    assert stats["total_games"] == N
+    assert stats["total_score"] == sum(SCORES)
+    assert stats["high_score"] == max(SCORES)
+    assert stats["average_score"] == round(sum(SCORES) / N, 2)
+
+
+def test_atomic_path_records_every_submission(db, user, monkeypatch):
+    monkeypatch.setattr(api, "SCORE_WRITE_BEHIND", False)
+
+    async def scenario():
+        results = await submit_all(user)
+        return results, await stored_stats(db, user)
+
+    check(*asyncio.run(scenario()))
+
+
+@pytest.mark.parametrize("max_pending", [1, 10_000])
+def test_write_behind_path_records_every_submission(db, user, monkeypatch, max_pending):
+    """max_pending=1 flushes during the burst; 10_000 leaves everything for shutdown"""
+    buffer = ScoreWriteBuffer(flush_interval=3600, max_pending=max_pending)
+    monkeypatch.setattr(api, "SCORE_WRITE_BEHIND", True)
+    monkeypatch.setattr(api, "score_buffer", buffer)
+
+    async def scenario():
+        results = await submit_all(user)
+        await buffer.stop()
+        return results, await stored_stats(db, user)
+
+    check(*asyncio.run(scenario()))
+    assert buffer.stats()["pending_keys"] == 0
+    assert buffer.flush_failures == 0
+    if max_pending == 1:
+        assert buffer.flushes > 1